@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import User
+from .models import EmailOutbox, ReminderLog, User
 
 @admin.register(User)
 class UserAdmin(admin.ModelAdmin):
@@ -13,3 +13,20 @@ class UserAdmin(admin.ModelAdmin):
         ('Izin Akses', {'fields': ('is_active', 'is_staff', 'is_superuser', 'groups', 'user_permissions')}),
         ('Tanggal', {'fields': ('last_login', 'date_joined')}),
     )
+
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'recipients', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('subject', 'recipients')
+    readonly_fields = ('created_at', 'sent_at', 'last_error')
+
+
+@admin.register(ReminderLog)
+class ReminderLogAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'object_id', 'run_id', 'sent_at')
+    list_filter = ('kind',)
+    search_fields = ('object_id', 'run_id')
+    readonly_fields = ('sent_at',)
@@ -9,6 +9,8 @@ from django.conf import settings
 from django.utils.html import strip_tags
 from datetime import timedelta
 
+from .outbox import enqueue_email
+
 
 def send_appointment_confirmation_email(patient, doctor, appointment):
     """
@@ -65,9 +67,9 @@ def send_appointment_rejection_email(patient, doctor, appointment, reason):
     send_email(patient.phone or 'notification', subject, html_message)
 
 
-def send_appointment_reminder_email(patient, doctor, appointment):
+def build_appointment_reminder(patient, doctor, appointment):
     """
-    Kirim email reminder 1 hari sebelum appointment
+    Susun subject dan isi email reminder appointment
     """
     subject = f"Pengingat: Appointment Anda Besok dengan {doctor.name}"
     
@@ -86,7 +88,14 @@ def send_appointment_reminder_email(patient, doctor, appointment):
     
     <p>Silakan datang 10 menit lebih awal. Terima kasih!</p>
     """
-    
+    return subject, html_message
+
+
+def send_appointment_reminder_email(patient, doctor, appointment):
+    """
+    Kirim email reminder 1 hari sebelum appointment
+    """
+    subject, html_message = build_appointment_reminder(patient, doctor, appointment)
     send_email(patient.phone or 'notification', subject, html_message)
 
 
@@ -118,9 +127,9 @@ def send_payment_confirmation_email(patient, payment):
     send_email(patient.phone or 'notification', subject, html_message)
 
 
-def send_payment_reminder_email(patient, payment):
+def build_payment_reminder(patient, payment):
     """
-    Kirim email reminder untuk pembayaran yang jatuh tempo
+    Susun subject dan isi email reminder pembayaran
     """
     subject = f"Pengingat Pembayaran - {payment.invoice_number}"
     
@@ -141,21 +150,64 @@ def send_payment_reminder_email(patient, payment):
     
     <p>Silakan selesaikan pembayaran Anda sebelum batas tanggal di atas.</p>
     """
-    
+    return subject, html_message
+
+
+def send_payment_reminder_email(patient, payment):
+    """
+    Kirim email reminder untuk pembayaran yang jatuh tempo
+    """
+    subject, html_message = build_payment_reminder(patient, payment)
     send_email(patient.phone or 'notification', subject, html_message)
 
 
+def email_recipients(recipient):
+    """
+    Daftar alamat tujuan untuk sebuah penerima notifikasi
+    """
+    return ['test@example.com']  # Untuk console backend
+
+
+def build_email_message(recipient, subject, html_message, connection=None):
+    """
+    Buat EmailMultiAlternatives (teks + HTML) tanpa langsung mengirim.
+    Dipakai untuk pengiriman massal melalui satu koneksi
+    """
+    message = EmailMultiAlternatives(
+        subject=subject,
+        body=strip_tags(html_message),
+        from_email=settings.DEFAULT_FROM_EMAIL or 'noreply@rumahsakit.com',
+        to=email_recipients(recipient),
+        connection=connection,
+    )
+    message.attach_alternative(html_message, 'text/html')
+    return message
+
+
 def send_email(recipient, subject, html_message, fail_silently=True):
     """
     Fungsi utility untuk mengirim email
-    Menggunakan EMAIL_BACKEND dari settings (console untuk dev, SMTP untuk prod)
+    Menggunakan EMAIL_BACKEND dari settings (console untuk dev, SMTP untuk prod).
+    Jika EMAIL_USE_OUTBOX aktif, email hanya dimasukkan ke outbox dan dikirim
+    oleh worker (python manage.py send_outbox --loop)
     """
+    from_email = settings.DEFAULT_FROM_EMAIL or 'noreply@rumahsakit.com'
+    recipient_list = email_recipients(recipient)
     try:
+        if getattr(settings, 'EMAIL_USE_OUTBOX', False):
+            enqueue_email(
+                subject,
+                strip_tags(html_message),
+                recipient_list,
+                from_email=from_email,
+                html_body=html_message,
+            )
+            return
         send_mail(
             subject=subject,
             message=strip_tags(html_message),
-            from_email=settings.DEFAULT_FROM_EMAIL or 'noreply@rumahsakit.com',
-            recipient_list=['test@example.com'],  # Untuk console backend
+            from_email=from_email,
+            recipient_list=recipient_list,
             html_message=html_message,
             fail_silently=fail_silently,
         )
@@ -5,6 +5,8 @@ from django.utils import timezone
 from datetime import timedelta
 from .models import User
 from core.models import Patient, Doctor, MedicalRecord, Schedule, Payment, DoctorAvailability, DoctorLeave
+from core.services.roster import get_roster_doctor
+from core.services.slots import is_slot_free
 
 
 class LoginForm(forms.Form):
@@ -378,16 +380,33 @@ class DoctorRegistrationForm(UserCreationForm):
         return user
 
 
+class RosterDoctorField(forms.Field):
+    """Field dokter yang divalidasi terhadap roster cache, tanpa query ke tabel Doctor"""
+    widget = forms.HiddenInput
+    default_error_messages = {
+        'invalid_choice': 'Pilih dokter yang valid.',
+    }
+    
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        try:
+            entry = get_roster_doctor(int(value))
+        except (TypeError, ValueError):
+            entry = None
+        if entry is None:
+            raise forms.ValidationError(self.error_messages['invalid_choice'], code='invalid_choice')
+        return Doctor(
+            id=entry['id'], name=entry['name'], specialty=entry['specialty'],
+            unit=entry['unit'], is_available=entry['is_available'],
+        )
+
+
 class AppointmentBookingForm(forms.ModelForm):
     """Form untuk booking appointment"""
     
-    doctor = forms.ModelChoiceField(
-        label="Dokter",
-        queryset=Doctor.objects.all().order_by('name'),
-        widget=forms.Select(attrs={
-            'class': 'w-full px-4 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500 focus:border-transparent'
-        })
-    )
+    # Dipilih lewat autocomplete (accounts/autocomplete/doctors/), tidak merender seluruh daftar dokter
+    doctor = RosterDoctorField(label="Dokter")
     
     examination_date = forms.DateField(
         label="Tanggal Pemeriksaan",
@@ -417,7 +436,8 @@ class AppointmentBookingForm(forms.ModelForm):
     
     class Meta:
         model = MedicalRecord
-        fields = ('doctor', 'examination_date', 'examination_time', 'notes')
+        # doctor bukan field model di sini: validasinya lewat roster, bukan query FK
+        fields = ('examination_date', 'examination_time', 'notes')
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -443,16 +463,9 @@ class AppointmentBookingForm(forms.ModelForm):
         if examination_date and examination_date > max_date:
             self.add_error('examination_date', "Booking hanya bisa hingga 30 hari ke depan.")
         
-        # Validasi ketersediaan dokter
+        # Validasi ketersediaan dokter berdasarkan slot kosong (jadwal, cuti, booking)
         if examination_date and examination_time and doctor:
-            existing_appointment = MedicalRecord.objects.filter(
-                doctor=doctor,
-                examination_date=examination_date,
-                examination_time=examination_time,
-                status__in=['pending', 'confirmed']
-            ).exists()
-            
-            if existing_appointment:
+            if not is_slot_free(doctor.pk, examination_date, examination_time):
                 self.add_error(
                     None,
                     f"Dokter {doctor.name} tidak tersedia pada waktu tersebut. Silahkan pilih waktu lain."
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.outbox import OUTBOX_BATCH_SIZE, OUTBOX_MAX_ATTEMPTS, send_pending_batch
+
+
+class Command(BaseCommand):
+    help = 'Kirim email dari outbox secara batch (satu koneksi SMTP per batch, retry dengan backoff)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=OUTBOX_BATCH_SIZE)
+        parser.add_argument('--max-attempts', type=int, default=OUTBOX_MAX_ATTEMPTS)
+        parser.add_argument('--loop', action='store_true', help='Jalan terus sebagai worker')
+        parser.add_argument('--interval', type=float, default=5.0, help='Jeda (detik) saat outbox kosong')
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = send_pending_batch(options['batch_size'], options['max_attempts'])
+            total_sent += sent
+            total_failed += failed
+            if sent or failed:
+                self.stdout.write(f'Batch: {sent} terkirim, {failed} gagal')
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(f'Selesai: {total_sent} terkirim, {total_failed} gagal'))
@@ -0,0 +1,28 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.reminders import REMINDER_CHUNK_SIZE, send_due_reminders
+
+
+class Command(BaseCommand):
+    help = 'Kirim reminder appointment besok dan tagihan jatuh tempo secara batch (jalankan terjadwal, mis. cron harian)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help='Tanggal acuan (YYYY-MM-DD), default hari ini')
+        parser.add_argument('--chunk-size', type=int, default=REMINDER_CHUNK_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help='Hanya hitung reminder yang akan dikirim')
+
+    def handle(self, *args, **options):
+        today = None
+        if options['date']:
+            try:
+                today = date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError('Format --date harus YYYY-MM-DD')
+
+        counts = send_due_reminders(today, chunk_size=options['chunk_size'], dry_run=options['dry_run'])
+        label = 'Akan dikirim' if options['dry_run'] else 'Terkirim'
+        self.stdout.write(self.style.SUCCESS(
+            f"{label}: {counts['appointment']} reminder appointment, {counts['payment']} reminder pembayaran"
+        ))
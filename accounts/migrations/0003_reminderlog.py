@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_emailoutbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReminderLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('appointment', 'Reminder Appointment'), ('payment', 'Reminder Pembayaran')], max_length=20)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('run_id', models.CharField(db_index=True, max_length=32)),
+                ('sent_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-sent_at'],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='unique_reminder_per_object')],
+            },
+        ),
+    ]
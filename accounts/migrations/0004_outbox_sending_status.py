@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_reminderlog'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='emailoutbox',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Menunggu Dikirim'), ('sending', 'Sedang Dikirim'), ('sent', 'Terkirim'), ('failed', 'Gagal')], default='pending', max_length=10),
+        ),
+    ]
@@ -1,6 +1,7 @@
 # accounts/models.py
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 class User(AbstractUser):
     ROLE_CHOICES = [
@@ -40,3 +41,60 @@ class User(AbstractUser):
 
     def __str__(self):
         return f"{self.username} ({self.get_role_display()})"
+
+
+class EmailOutbox(models.Model):
+    """Antrian email yang dikirim oleh worker (python manage.py send_outbox)"""
+    STATUS_CHOICES = [
+        ('pending', 'Menunggu Dikirim'),
+        ('sending', 'Sedang Dikirim'),
+        ('sent', 'Terkirim'),
+        ('failed', 'Gagal'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=254)
+    recipients = models.TextField(help_text='Daftar penerima, dipisahkan koma.')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_status_next_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} ({self.get_status_display()})"
+
+    @property
+    def recipient_list(self):
+        return [email.strip() for email in self.recipients.split(',') if email.strip()]
+
+
+class ReminderLog(models.Model):
+    """Catatan reminder yang sudah dikirim, agar tidak terkirim dua kali"""
+    KIND_CHOICES = [
+        ('appointment', 'Reminder Appointment'),
+        ('payment', 'Reminder Pembayaran'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    run_id = models.CharField(max_length=32, db_index=True)
+    sent_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-sent_at']
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='unique_reminder_per_object'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} #{self.object_id}"
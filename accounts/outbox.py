@@ -0,0 +1,119 @@
+"""
+Outbox email persisten: view hanya menyimpan EmailOutbox, pengiriman oleh command send_outbox.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import EmailOutbox
+
+
+OUTBOX_BATCH_SIZE = getattr(settings, 'EMAIL_OUTBOX_BATCH_SIZE', 100)
+OUTBOX_MAX_ATTEMPTS = getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 5)
+OUTBOX_RETRY_BASE_SECONDS = getattr(settings, 'EMAIL_OUTBOX_RETRY_BASE_SECONDS', 60)
+OUTBOX_RETRY_MAX_SECONDS = 6 * 60 * 60
+OUTBOX_LEASE_SECONDS = getattr(settings, 'EMAIL_OUTBOX_LEASE_SECONDS', 10 * 60)
+
+
+def enqueue_email(subject, body, recipient_list, from_email=None, html_body=''):
+    """Simpan email ke outbox untuk dikirim worker"""
+    return EmailOutbox.objects.create(
+        subject=subject[:255],
+        body=body,
+        html_body=html_body or '',
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipients=','.join(recipient_list),
+    )
+
+
+def retry_delay(attempts):
+    """Backoff eksponensial: base, 2x base, 4x base, ... dibatasi 6 jam"""
+    return timedelta(seconds=min(OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1), OUTBOX_RETRY_MAX_SECONDS))
+
+
+def _build_message(item, mail_connection):
+    message = EmailMultiAlternatives(
+        subject=item.subject,
+        body=item.body,
+        from_email=item.from_email,
+        to=item.recipient_list,
+        connection=mail_connection,
+    )
+    if item.html_body:
+        message.attach_alternative(item.html_body, 'text/html')
+    return message
+
+
+def _mark_failed(item, error, now, max_attempts):
+    item.attempts += 1
+    item.last_error = str(error)[:2000]
+    if item.attempts >= max_attempts:
+        item.status = 'failed'
+    else:
+        item.status = 'pending'
+        item.next_attempt_at = now + retry_delay(item.attempts)
+
+
+def claim_batch(batch_size=OUTBOX_BATCH_SIZE, now=None):
+    """Klaim email yang jatuh tempo (atau lease-nya habis) sebagai 'sending' dalam transaksi singkat"""
+    now = now or timezone.now()
+    with transaction.atomic():
+        due = EmailOutbox.objects.filter(
+            status__in=('pending', 'sending'), next_attempt_at__lte=now
+        ).order_by('next_attempt_at', 'id')
+        if connection.features.has_select_for_update_skip_locked:
+            # Worker paralel mengambil baris yang berbeda
+            due = due.select_for_update(skip_locked=True)
+        batch = list(due[:batch_size])
+        if batch:
+            EmailOutbox.objects.filter(pk__in=[item.pk for item in batch]).update(
+                status='sending', next_attempt_at=now + timedelta(seconds=OUTBOX_LEASE_SECONDS),
+            )
+    return batch
+
+
+def send_pending_batch(batch_size=OUTBOX_BATCH_SIZE, max_attempts=OUTBOX_MAX_ATTEMPTS):
+    """
+    Kirim satu batch email yang sudah jatuh tempo
+
+    Returns:
+        Tuple (jumlah terkirim, jumlah gagal)
+    """
+    now = timezone.now()
+    batch = claim_batch(batch_size, now)
+    if not batch:
+        return 0, 0
+
+    # Dikirim di luar transaksi: tidak ada lock baris selama round trip SMTP
+    sent = failed = 0
+    mail_connection = get_connection(fail_silently=False)
+    try:
+        mail_connection.open()
+    except Exception as error:
+        for item in batch:
+            _mark_failed(item, error, now, max_attempts)
+        failed = len(batch)
+    else:
+        try:
+            for item in batch:
+                try:
+                    mail_connection.send_messages([_build_message(item, mail_connection)])
+                except Exception as error:
+                    _mark_failed(item, error, now, max_attempts)
+                    failed += 1
+                else:
+                    item.status = 'sent'
+                    item.sent_at = timezone.now()
+                    item.attempts += 1
+                    sent += 1
+        finally:
+            mail_connection.close()
+
+    EmailOutbox.objects.bulk_update(
+        batch, ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at']
+    )
+    return sent, failed
@@ -0,0 +1,136 @@
+"""
+Pengiriman reminder appointment besok dan tagihan terlambat per batch, tanpa kirim ganda.
+"""
+
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from core.models import MedicalRecord, Payment
+
+from .emails import build_appointment_reminder, build_email_message, build_payment_reminder
+from .models import ReminderLog
+
+
+REMINDER_CHUNK_SIZE = getattr(settings, 'REMINDER_CHUNK_SIZE', 500)
+OVERDUE_PAYMENT_STATUSES = ('pending', 'partial', 'overdue')
+
+
+def _not_reminded(kind):
+    return ~Exists(ReminderLog.objects.filter(kind=kind, object_id=OuterRef('pk')))
+
+
+def due_appointment_reminders(today=None):
+    """Appointment terkonfirmasi untuk besok yang belum diberi reminder"""
+    today = today or timezone.localdate()
+    return (
+        MedicalRecord.objects
+        .filter(
+            examination_date=today + timedelta(days=1),
+            status='confirmed',
+            examination_time__isnull=False,
+        )
+        .filter(_not_reminded('appointment'))
+        .select_related('patient', 'doctor')
+        .order_by('id')
+    )
+
+
+def due_payment_reminders(today=None):
+    """Tagihan yang lewat jatuh tempo dan belum diberi reminder"""
+    today = today or timezone.localdate()
+    return (
+        Payment.objects
+        .filter(
+            status__in=OVERDUE_PAYMENT_STATUSES,
+            due_date__lt=today,
+            patient__isnull=False,
+        )
+        .filter(_not_reminded('payment'))
+        .select_related('patient')
+        .order_by('id')
+    )
+
+
+def _claim(kind, objects, run_id):
+    """Tandai objek sebagai sudah diingatkan; kembalikan yang berhasil diklaim run ini"""
+    ReminderLog.objects.bulk_create(
+        [ReminderLog(kind=kind, object_id=obj.pk, run_id=run_id) for obj in objects],
+        ignore_conflicts=True,
+    )
+    claimed = set(
+        ReminderLog.objects.filter(kind=kind, run_id=run_id, object_id__in=[obj.pk for obj in objects])
+        .values_list('object_id', flat=True)
+    )
+    return [obj for obj in objects if obj.pk in claimed]
+
+
+def _send_chunk(kind, objects, build, mail_connection, run_id):
+    claimed = _claim(kind, objects, run_id)
+    if not claimed:
+        return 0
+    messages = [
+        build_email_message(obj.patient.phone or 'notification', *build(obj), connection=mail_connection)
+        for obj in claimed
+    ]
+    sent = 0
+    try:
+        for message in messages:
+            mail_connection.send_messages([message])
+            sent += 1
+    except Exception:
+        # Klaim pesan yang sudah terkirim tetap disimpan
+        unsent = [obj.pk for obj in claimed[sent:]]
+        ReminderLog.objects.filter(kind=kind, run_id=run_id, object_id__in=unsent).delete()
+        raise
+    return sent
+
+
+def _dispatch(kind, queryset, build, mail_connection, run_id, chunk_size):
+    sent = 0
+    chunk = []
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(obj)
+        if len(chunk) >= chunk_size:
+            sent += _send_chunk(kind, chunk, build, mail_connection, run_id)
+            chunk = []
+    if chunk:
+        sent += _send_chunk(kind, chunk, build, mail_connection, run_id)
+    return sent
+
+
+def send_due_reminders(today=None, chunk_size=REMINDER_CHUNK_SIZE, dry_run=False):
+    """
+    Kirim semua reminder appointment besok dan tagihan jatuh tempo
+
+    Returns:
+        Dict jumlah reminder per jenis ({'appointment': n, 'payment': n})
+    """
+    today = today or timezone.localdate()
+    appointments = due_appointment_reminders(today)
+    payments = due_payment_reminders(today)
+    if dry_run:
+        return {'appointment': appointments.count(), 'payment': payments.count()}
+
+    run_id = uuid.uuid4().hex
+    mail_connection = get_connection()
+    mail_connection.open()
+    try:
+        return {
+            'appointment': _dispatch(
+                'appointment', appointments,
+                lambda record: build_appointment_reminder(record.patient, record.doctor, record),
+                mail_connection, run_id, chunk_size,
+            ),
+            'payment': _dispatch(
+                'payment', payments,
+                lambda payment: build_payment_reminder(payment.patient, payment),
+                mail_connection, run_id, chunk_size,
+            ),
+        }
+    finally:
+        mail_connection.close()
@@ -1,3 +1,290 @@
-from django.test import TestCase
+from datetime import date, time, timedelta
+from smtplib import SMTPException
 
-# Create your tests here.
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import MedicalRecord, Medicine, Payment, Prescription, Schedule
+from core.services.autocomplete import autocomplete_doctors
+from core.services.doctor_summary import get_doctor_summary
+from core.tests.helpers import create_doctor, create_patient
+from .emails import send_email
+from .models import EmailOutbox, ReminderLog, User
+from .outbox import claim_batch, send_pending_batch
+from .reminders import send_due_reminders
+from .utils import paginate_queryset
+
+
+class DoctorDashboardQueryCountTests(TestCase):
+    def setUp(self):
+        self.doctor = create_doctor()
+        self.user = User.objects.create_user(
+            username='dokter', password='rahasia123', role='doctor', doctor_profile=self.doctor
+        )
+        self.medicine = Medicine.objects.create(
+            name='Paracetamol', medicine_class='Bebas', medicine_type='Tablet',
+            expiry_date=date.today() + timedelta(days=365), price=1000,
+        )
+        self.client.force_login(self.user)
+
+    def add_records(self, count):
+        start = MedicalRecord.objects.count()
+        for i in range(start, start + count):
+            record = MedicalRecord.objects.create(
+                patient=create_patient(name=f'Pasien {i}'),
+                doctor=self.doctor,
+                examination_date=date.today(),
+                diagnosis='Demam',
+            )
+            Prescription.objects.create(
+                medical_record=record, medicine=self.medicine,
+                prescription_date=date.today(), dosage='3x1',
+            )
+            Schedule.objects.create(
+                doctor=self.doctor, examination_date=date.today(),
+                examination_time=time(8 + i // 60, i % 60), status='booked',
+            )
+
+    def dashboard_queries(self):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('doctor_dashboard'))
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_records(self):
+        self.add_records(2)
+        small = self.dashboard_queries()
+
+        self.add_records(20)
+        large = self.dashboard_queries()
+
+        self.assertEqual(small, large)
+
+    def test_summary_uses_fixed_queries_and_is_cached(self):
+        self.add_records(3)
+        MedicalRecord.objects.filter(patient__name='Pasien 0').update(treatment='Istirahat')
+        cache.clear()
+
+        with self.assertNumQueries(5):
+            summary = get_doctor_summary(self.doctor)
+
+        self.assertEqual((summary['total_records'], summary['total_patients']), (3, 3))
+        self.assertEqual(len(summary['today_schedule']), 3)
+        self.assertEqual(len(summary['recent_prescriptions']), 3)
+        self.assertEqual(
+            sorted(record.patient.name for record in summary['pending_patients']), ['Pasien 1', 'Pasien 2']
+        )
+        with self.assertNumQueries(0):
+            cached = get_doctor_summary(self.doctor)
+        self.assertEqual(cached['total_records'], 3)
+
+
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        self.doctor = create_doctor()
+        patient = create_patient()
+        MedicalRecord.objects.bulk_create([
+            MedicalRecord(patient=patient, doctor=self.doctor, examination_date=date.today())
+            for _ in range(25)
+        ])
+        self.queryset = MedicalRecord.objects.all()
+        self.factory = RequestFactory()
+
+    def page(self, cursor=None):
+        request = self.factory.get('/', {'cursor': cursor} if cursor else {})
+        return paginate_queryset(
+            self.queryset, request, items_per_page=10,
+            mode='cursor', ordering=('-created_at', '-id'), estimate_total=True,
+        )
+
+    def test_walks_forward_and_back_without_gaps(self):
+        expected = list(self.queryset.order_by('-created_at', '-id'))
+
+        first = self.page()
+        second = self.page(first['next_cursor'])
+        third = self.page(second['next_cursor'])
+        back = self.page(third['previous_cursor'])
+
+        self.assertEqual(first['items'] + second['items'] + third['items'], expected)
+        self.assertEqual(back['items'], second['items'])
+        self.assertFalse(first['has_previous'])
+        self.assertFalse(third['has_next'])
+        self.assertEqual(first['estimated_total'], 25)
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        self.assertEqual(self.page('bukan-cursor')['items'], self.page()['items'])
+
+    def test_pending_badge_is_exact_and_ignores_search(self):
+        user = User.objects.create_user(
+            username='dokter', password='rahasia123', role='doctor', doctor_profile=self.doctor
+        )
+        self.client.force_login(user)
+
+        response = self.client.get(reverse('doctor_appointments'), {'search': 'tidak ada'})
+
+        self.assertEqual(list(response.context['pending_appointments']), [])
+        self.assertEqual(response.context['pending_count'], 25)
+        self.assertContains(response, 'Menunggu Konfirmasi (25)')
+
+
+class FailingEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise SMTPException('server tidak tersedia')
+
+
+class FlakyEmailBackend(BaseEmailBackend):
+    """Mengirim pesan pertama ke mail.outbox lalu gagal"""
+
+    def send_messages(self, email_messages):
+        if mail.outbox:
+            raise SMTPException('koneksi terputus')
+        mail.outbox.extend(email_messages)
+        return len(email_messages)
+
+
+@override_settings(EMAIL_USE_OUTBOX=True)
+class EmailOutboxTests(TestCase):
+    def test_send_email_only_enqueues(self):
+        send_email('081234567890', 'Tes', '<p>Halo</p>')
+
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(EmailOutbox.objects.get().status, 'pending')
+
+    def test_worker_sends_batch(self):
+        for i in range(3):
+            send_email('081234567890', f'Tes {i}', '<p>Halo</p>')
+
+        self.assertEqual(send_pending_batch(), (3, 0))
+
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(mail.outbox[0].alternatives[0][1], 'text/html')
+        self.assertFalse(EmailOutbox.objects.exclude(status='sent').exists())
+
+    @override_settings(EMAIL_BACKEND='accounts.tests.FailingEmailBackend')
+    def test_failed_send_is_retried_later_with_backoff(self):
+        send_email('081234567890', 'Tes', '<p>Halo</p>')
+
+        self.assertEqual(send_pending_batch(max_attempts=2), (0, 1))
+        item = EmailOutbox.objects.get()
+        self.assertEqual((item.status, item.attempts), ('pending', 1))
+        self.assertGreater(item.next_attempt_at, item.created_at)
+        self.assertEqual(send_pending_batch(max_attempts=2), (0, 0))
+
+        EmailOutbox.objects.update(next_attempt_at=item.created_at)
+        send_pending_batch(max_attempts=2)
+        self.assertEqual(EmailOutbox.objects.get().status, 'failed')
+
+    def test_claimed_batch_is_leased_until_sent_or_expired(self):
+        send_email('081234567890', 'Tes', '<p>Halo</p>')
+        claimed = claim_batch()
+        self.assertEqual(EmailOutbox.objects.get().status, 'sending')
+
+        # Worker lain tidak mengambil baris yang sedang dikirim
+        self.assertEqual(claim_batch(), [])
+        # Worker yang mati di tengah batch: baris diambil lagi setelah lease habis
+        EmailOutbox.objects.update(next_attempt_at=claimed[0].created_at)
+        self.assertEqual(send_pending_batch(), (1, 0))
+        self.assertEqual(EmailOutbox.objects.get().status, 'sent')
+
+
+class ReminderDispatchTests(TestCase):
+    def setUp(self):
+        self.today = date(2030, 1, 10)
+        doctor = create_doctor()
+        patient = create_patient()
+        for i, status in enumerate(['confirmed', 'confirmed', 'pending']):
+            MedicalRecord.objects.create(
+                patient=patient, doctor=doctor, status=status,
+                examination_date=self.today + timedelta(days=1), examination_time=time(9 + i),
+            )
+        MedicalRecord.objects.create(
+            patient=patient, doctor=doctor, status='confirmed',
+            examination_date=self.today + timedelta(days=2), examination_time=time(9),
+        )
+        Payment.objects.create(patient=patient, amount=1000, invoice_number='INV-R1', due_date=self.today - timedelta(days=1))
+        Payment.objects.create(patient=patient, amount=1000, invoice_number='INV-R2', due_date=self.today)
+        Payment.objects.create(
+            patient=patient, amount=1000, paid_amount=1000, status='paid',
+            invoice_number='INV-R3', due_date=self.today - timedelta(days=1),
+        )
+
+    def test_sends_each_reminder_once(self):
+        self.assertEqual(send_due_reminders(self.today, chunk_size=1), {'appointment': 2, 'payment': 1})
+        self.assertEqual(len(mail.outbox), 3)
+
+        self.assertEqual(send_due_reminders(self.today), {'appointment': 0, 'payment': 0})
+        self.assertEqual(len(mail.outbox), 3)
+
+    def test_dry_run_sends_nothing(self):
+        self.assertEqual(send_due_reminders(self.today, dry_run=True), {'appointment': 2, 'payment': 1})
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertFalse(ReminderLog.objects.exists())
+
+    @override_settings(EMAIL_BACKEND='accounts.tests.FailingEmailBackend')
+    def test_failed_chunk_is_released_for_next_run(self):
+        with self.assertRaises(SMTPException):
+            send_due_reminders(self.today)
+        self.assertFalse(ReminderLog.objects.exists())
+
+    def test_partial_failure_keeps_claims_of_delivered_reminders(self):
+        with override_settings(EMAIL_BACKEND='accounts.tests.FlakyEmailBackend'):
+            with self.assertRaises(SMTPException):
+                send_due_reminders(self.today)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(ReminderLog.objects.count(), 1)
+
+        self.assertEqual(send_due_reminders(self.today), {'appointment': 1, 'payment': 1})
+        self.assertEqual(len(mail.outbox), 3)
+
+
+class AutocompleteTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.anak = create_doctor(name='Andi Wijaya', specialty='Anak', unit='Poli Anak')
+        self.umum = create_doctor(name='Budi Anugrah', specialty='Umum', unit='Poliklinik Umum')
+        self.patient = create_patient(name='Siti Rahma')
+        self.user = User.objects.create_user(
+            username='pasien', password='rahasia123', role='patient', patient_profile=self.patient
+        )
+
+    def test_doctor_prefix_match_on_name_specialty_and_unit(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse('doctor_autocomplete'), {'q': 'an'})
+        self.assertEqual([row['id'] for row in response.json()['results']], [self.anak.pk, self.umum.pk])
+
+        response = self.client.get(reverse('doctor_autocomplete'), {'q': 'anak'})
+        self.assertEqual([row['id'] for row in response.json()['results']], [self.anak.pk])
+
+    def test_doctor_index_follows_changes_and_is_cached(self):
+        self.assertEqual(autocomplete_doctors('wijaya')[0]['id'], self.anak.pk)
+        with self.assertNumQueries(0):
+            autocomplete_doctors('wijaya')
+
+        self.anak.name = 'Andi Pratama'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.anak.save()
+        self.assertEqual(autocomplete_doctors('wijaya'), [])
+
+    def test_patient_autocomplete_is_for_doctors_and_admins(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(reverse('patient_autocomplete'), {'q': 'siti'}).status_code, 403)
+
+        admin = User.objects.create_user(username='admin', password='rahasia123', role='admin')
+        self.client.force_login(admin)
+        response = self.client.get(reverse('patient_autocomplete'), {'q': 'siti'})
+        self.assertEqual(response.json()['results'][0]['name'], 'Siti Rahma')
+
+    def test_booking_page_does_not_embed_doctor_roster(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse('book_appointment'))
+
+        self.assertNotContains(response, 'Budi Anugrah')
+        self.assertContains(response, reverse('doctor_autocomplete'))
@@ -28,6 +28,11 @@ urlpatterns = [
     
     # Appointment
     path('appointment/book/', views.book_appointment, name='book_appointment'),
+    path('appointment/slots/', views.appointment_slots, name='appointment_slots'),
+    
+    # Autocomplete
+    path('autocomplete/doctors/', views.doctor_autocomplete, name='doctor_autocomplete'),
+    path('autocomplete/patients/', views.patient_autocomplete, name='patient_autocomplete'),
     path('appointment/confirm/', views.doctor_appointments, name='doctor_appointments'),
     path('appointment/<int:appointment_id>/confirm/', views.confirm_appointment, name='confirm_appointment'),
     path('appointment/<int:appointment_id>/diagnosis/', views.add_diagnosis, name='add_diagnosis'),
@@ -48,6 +53,7 @@ urlpatterns = [
     # Dashboards
     path('dashboard/', views.dashboard_redirect, name='dashboard'),
     path('dashboard/admin/', views.admin_dashboard, name='admin_dashboard'),
+    path('dashboard/admin/query-stats/', views.query_stats_view, name='query_stats'),
     path('dashboard/doctor/', views.doctor_dashboard, name='doctor_dashboard'),
     path('dashboard/patient/', patient_dashboard, name='patient_dashboard'),
 ]
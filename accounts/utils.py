@@ -3,10 +3,22 @@ Utility functions for the hospital management system.
 Includes pagination, search, and other common utilities.
 """
 
+import base64
+import binascii
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.db.models import Q
+
+# Batas hitung untuk estimasi total pada mode cursor
+ESTIMATE_TOTAL_CAP = 1000
 
 
-def paginate_queryset(queryset, request, items_per_page=10):
+def paginate_queryset(queryset, request, items_per_page=10, mode='offset', ordering=None,
+                      estimate_total=False):
     """
     Paginate a queryset and return paginated data
     
@@ -14,10 +26,16 @@ def paginate_queryset(queryset, request, items_per_page=10):
         queryset: Django queryset to paginate
         request: HTTP request object
         items_per_page: Number of items per page (default: 10)
+        mode: 'offset' (Paginator, nomor halaman) atau 'cursor' (keyset, token next/prev)
+        ordering: Urutan kolom unik untuk mode cursor, mis. ('-created_at', '-id')
+        estimate_total: Mode cursor: hitung total dengan batas ESTIMATE_TOTAL_CAP
     
     Returns:
         Dictionary with paginated data and page object
     """
+    if mode == 'cursor':
+        return _paginate_cursor(queryset, request, items_per_page, ordering, estimate_total)
+    
     paginator = Paginator(queryset, items_per_page)
     page_number = request.GET.get('page')
     
@@ -42,6 +60,105 @@ def paginate_queryset(queryset, request, items_per_page=10):
     }
 
 
+def _encode_cursor(values, direction):
+    payload = json.dumps({'v': [_serialize_value(v) for v in values], 'd': direction})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def _serialize_value(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _decode_cursor(token, model, fields):
+    """Decode token cursor; token rusak/tidak valid dianggap halaman pertama"""
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        raw_values = payload['v']
+        direction = payload['d']
+        if direction not in ('next', 'prev') or len(raw_values) != len(fields):
+            return None
+        values = [
+            model._meta.get_field(field).to_python(value)
+            for field, value in zip(fields, raw_values)
+        ]
+    except (binascii.Error, ValueError, KeyError, TypeError, ValidationError, FieldDoesNotExist):
+        return None
+    return {'values': values, 'direction': direction}
+
+
+def _keyset_filter(fields, descending, values, backwards):
+    """Bangun filter (f1, f2, ...) > / < (v1, v2, ...) sesuai arah urutan"""
+    condition = Q()
+    for i, field in enumerate(fields):
+        after = descending[i] != backwards
+        lookup = f"{field}__{'lt' if after else 'gt'}"
+        step = Q(**{lookup: values[i]})
+        for prev_field, prev_value in zip(fields[:i], values[:i]):
+            step &= Q(**{prev_field: prev_value})
+        condition |= step
+    return condition
+
+
+def _paginate_cursor(queryset, request, items_per_page, ordering, estimate_total):
+    """
+    Keyset pagination: setiap halaman memakai WHERE pada kolom urutan,
+    sehingga halaman ke-N sama murahnya dengan halaman pertama
+    """
+    if not ordering:
+        raise ValueError("Mode cursor membutuhkan parameter ordering, mis. ('-created_at', '-id')")
+    
+    fields = [field.lstrip('-') for field in ordering]
+    descending = [field.startswith('-') for field in ordering]
+    cursor = _decode_cursor(request.GET.get('cursor'), queryset.model, fields)
+    backwards = cursor is not None and cursor['direction'] == 'prev'
+    
+    page_qs = queryset.order_by(*ordering)
+    if cursor:
+        page_qs = page_qs.filter(_keyset_filter(fields, descending, cursor['values'], backwards))
+    if backwards:
+        page_qs = page_qs.reverse()
+    
+    items = list(page_qs[:items_per_page + 1])
+    has_more = len(items) > items_per_page
+    items = items[:items_per_page]
+    if backwards:
+        items.reverse()
+    
+    has_next = True if backwards else has_more
+    has_previous = has_more if backwards else cursor is not None
+    
+    def row_values(obj):
+        return [getattr(obj, field) for field in fields]
+    
+    result = {
+        'page_obj': None,
+        'paginator': None,
+        'items': items,
+        'is_paginated': has_next or has_previous,
+        'has_previous': has_previous,
+        'has_next': has_next,
+        'next_cursor': _encode_cursor(row_values(items[-1]), 'next') if has_next and items else None,
+        'previous_cursor': _encode_cursor(row_values(items[0]), 'prev') if has_previous and items else None,
+        'estimated_total': None,
+        'total_capped': False,
+    }
+    
+    if estimate_total:
+        # COUNT dibatasi LIMIT agar biayanya tidak tumbuh dengan ukuran tabel
+        total = queryset.order_by()[:ESTIMATE_TOTAL_CAP + 1].count()
+        result['estimated_total'] = min(total, ESTIMATE_TOTAL_CAP)
+        result['total_capped'] = total > ESTIMATE_TOTAL_CAP
+    
+    return result
+
+
 def format_currency(amount):
     """Format currency as Indonesian Rupiah"""
     return f"Rp{amount:,.0f}".replace(",", ".")
@@ -1,4 +1,5 @@
 from django.shortcuts import render, redirect
+from django.http import JsonResponse
 from django.contrib.auth import authenticate, login, logout, update_session_auth_hash
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
@@ -22,6 +23,17 @@ from .emails import (
     send_payment_reminder_email
 )
 from .utils import paginate_queryset
+from core.cache import get_cache_stats
+from core.services.autocomplete import autocomplete_doctors, autocomplete_patients
+from core.services.balances import get_patient_balance
+from core.services.booking import SlotUnavailableError, reserve_appointment
+from core.services.counters import get_dashboard_counters
+from core.services.doctor_summary import get_doctor_summary
+from core.services.occupancy import free_beds_by_room_type
+from core.services.patient_search import matching_patients
+from core.services.query_stats import collect_stats
+from core.services.roster import get_roster_doctor
+from core.services.slots import get_free_slots
 
 
 # ==================== AUTHENTICATION VIEWS ====================
@@ -124,11 +136,12 @@ def admin_dashboard(request):
         messages.error(request, 'Anda tidak memiliki akses ke halaman ini.')
         return redirect('dashboard')
     
-    # Statistik
-    total_patients = Patient.objects.count()
-    total_doctors = Doctor.objects.count()
-    total_inpatients = Inpatient.objects.filter(discharge_date__isnull=True).count()
-    total_rooms = Room.objects.count()
+    # Statistik (counter materialized, dijaga oleh signal)
+    counters = get_dashboard_counters()
+    total_patients = counters['patients']
+    total_doctors = counters['doctors']
+    total_inpatients = counters['active_inpatients']
+    total_rooms = counters['rooms']
     
     # Data terbaru
     recent_records = MedicalRecord.objects.select_related('patient', 'doctor').order_by('-examination_date')[:5]
@@ -141,10 +154,21 @@ def admin_dashboard(request):
         'total_rooms': total_rooms,
         'recent_records': recent_records,
         'recent_inpatients': recent_inpatients,
+        'free_beds': free_beds_by_room_type(),
     }
     return render(request, 'dashboards/admin.html', context)
 
 
+@login_required(login_url='login')
+@require_http_methods(["GET"])
+def query_stats_view(request):
+    """Endpoint JSON statistik query per view (hanya admin/staff)"""
+    if request.user.role != 'admin' and not request.user.is_staff:
+        return JsonResponse({'error': 'Anda tidak memiliki akses ke halaman ini.'}, status=403)
+    
+    return JsonResponse({'views': collect_stats(), 'cache': get_cache_stats()})
+
+
 # ==================== DOCTOR DASHBOARD ====================
 
 @login_required(login_url='login')
@@ -165,50 +189,19 @@ def doctor_dashboard(request):
         messages.error(request, 'Profil dokter tidak ditemukan.')
         return redirect('home')
     
-    # Statistik
-    total_patients = MedicalRecord.objects.filter(doctor=doctor).values('patient').distinct().count()
-    total_records = MedicalRecord.objects.filter(doctor=doctor).count()
-    
-    # Jadwal hari ini
-    today = datetime.now().date()
-    today_schedule = Schedule.objects.filter(
-        doctor=doctor,
-        examination_date=today
-    ).order_by('examination_time')
-    
-    # Jadwal minggu ini
-    week_start = today
-    week_end = today + timedelta(days=7)
-    week_schedule = Schedule.objects.filter(
-        doctor=doctor,
-        examination_date__range=[week_start, week_end]
-    ).order_by('examination_date', 'examination_time')
-    
-    # Rekam medis terbaru
-    recent_records = MedicalRecord.objects.filter(doctor=doctor).select_related('patient').order_by('-examination_date')[:5]
-    
-    # Resep terbaru
-    recent_prescriptions = Prescription.objects.filter(
-        medical_record__doctor=doctor
-    ).select_related('medical_record', 'medicine').order_by('-prescription_date')[:5]
-    
-    # Pasien yang perlu follow-up
-    pending_patients = MedicalRecord.objects.filter(
-        doctor=doctor,
-        diagnosis__isnull=False,
-        treatment__isnull=True
-    ).select_related('patient').order_by('-examination_date')[:5]
+    # Statistik, jadwal, dan daftar terbaru (jumlah query tetap, ter-cache singkat)
+    summary = get_doctor_summary(doctor)
     
     context = {
         'doctor': doctor,
-        'total_patients': total_patients,
-        'total_records': total_records,
-        'today_schedule': today_schedule,
-        'week_schedule': week_schedule,
-        'recent_records': recent_records,
-        'recent_prescriptions': recent_prescriptions,
-        'pending_patients': pending_patients,
-        'today': today,
+        'total_patients': summary['total_patients'],
+        'total_records': summary['total_records'],
+        'today_schedule': summary['today_schedule'],
+        'week_schedule': summary['week_schedule'],
+        'recent_records': summary['recent_records'],
+        'recent_prescriptions': summary['recent_prescriptions'],
+        'pending_patients': summary['pending_patients'],
+        'today': summary['today'],
     }
     return render(request, 'dashboards/doctor.html', context)
 
@@ -232,19 +225,25 @@ def book_appointment(request):
     if request.method == 'POST':
         form = AppointmentBookingForm(request.POST)
         if form.is_valid():
-            # Buat appointment
-            appointment = form.save(commit=False)
-            appointment.patient = patient
-            appointment.status = 'pending'
-            appointment.save()
-            
-            messages.success(
-                request, 
-                f'Janji temu dengan {appointment.doctor.name} berhasil dibuat! '
-                f'Tanggal: {appointment.examination_date.strftime("%d-%m-%Y")}, '
-                f'Waktu: {appointment.examination_time.strftime("%H:%M")}'
-            )
-            return redirect('patient_dashboard')
+            # Buat appointment lewat reservasi slot agar tidak terjadi double booking
+            try:
+                appointment = reserve_appointment(
+                    patient,
+                    form.cleaned_data['doctor'],
+                    form.cleaned_data['examination_date'],
+                    form.cleaned_data['examination_time'],
+                    notes=form.cleaned_data.get('notes') or '',
+                )
+            except SlotUnavailableError as error:
+                messages.error(request, str(error))
+            else:
+                messages.success(
+                    request, 
+                    f'Janji temu dengan {appointment.doctor.name} berhasil dibuat! '
+                    f'Tanggal: {appointment.examination_date.strftime("%d-%m-%Y")}, '
+                    f'Waktu: {appointment.examination_time.strftime("%H:%M")}'
+                )
+                return redirect('patient_dashboard')
         else:
             for field, errors in form.errors.items():
                 if field == '__all__':
@@ -254,15 +253,80 @@ def book_appointment(request):
                     for error in errors:
                         messages.error(request, f'{field}: {error}')
     else:
-        form = AppointmentBookingForm()
+        form = AppointmentBookingForm(initial={
+            'doctor': request.GET.get('doctor'),
+            'examination_date': request.GET.get('date'),
+        })
+    
+    # Slot kosong untuk dokter & tanggal yang sedang dipilih
+    available_slots = []
+    doctor_id = form['doctor'].value()
+    examination_date = form['examination_date'].value()
+    if doctor_id and examination_date:
+        try:
+            selected_date = datetime.strptime(str(examination_date), '%Y-%m-%d').date()
+            available_slots = get_free_slots(int(doctor_id), selected_date, selected_date).get(selected_date, ())
+        except (TypeError, ValueError):
+            available_slots = []
+    
+    # Label dokter terpilih untuk kolom autocomplete
+    selected_doctor_label = ''
+    if doctor_id and str(doctor_id).isdigit():
+        selected_doctor = get_roster_doctor(int(doctor_id))
+        if selected_doctor:
+            selected_doctor_label = f"Dr. {selected_doctor['name']} ({selected_doctor['specialty']})"
     
     context = {
         'form': form,
+        'available_slots': available_slots,
+        'selected_doctor_label': selected_doctor_label,
         'page_title': 'Booking Janji Temu'
     }
     return render(request, 'accounts/book_appointment.html', context)
 
 
+@login_required(login_url='login')
+@require_http_methods(["GET"])
+def appointment_slots(request):
+    """Endpoint JSON slot kosong dokter untuk halaman booking"""
+    try:
+        doctor_id = int(request.GET.get('doctor', ''))
+        start_date = datetime.strptime(request.GET.get('start', ''), '%Y-%m-%d').date()
+        days = min(max(int(request.GET.get('days', 7)), 1), 31)
+    except ValueError:
+        return JsonResponse({'error': 'Parameter doctor dan start (YYYY-MM-DD) wajib diisi.'}, status=400)
+    
+    slots = get_free_slots(doctor_id, start_date, start_date + timedelta(days=days - 1))
+    return JsonResponse({
+        'doctor': doctor_id,
+        'slots': {
+            day.isoformat(): [time.strftime('%H:%M') for time in times]
+            for day, times in slots.items()
+        },
+    })
+
+
+# ==================== AUTOCOMPLETE ====================
+
+@login_required(login_url='login')
+@require_http_methods(["GET"])
+def doctor_autocomplete(request):
+    """Endpoint JSON autocomplete dokter (nama, spesialis, unit)"""
+    results = autocomplete_doctors(request.GET.get('q', ''), request.GET.get('limit'))
+    return JsonResponse({'results': results})
+
+
+@login_required(login_url='login')
+@require_http_methods(["GET"])
+def patient_autocomplete(request):
+    """Endpoint JSON autocomplete pasien (hanya dokter/admin)"""
+    if request.user.role not in ('doctor', 'admin'):
+        return JsonResponse({'error': 'Anda tidak memiliki akses ke halaman ini.'}, status=403)
+    
+    results = autocomplete_patients(request.GET.get('q', ''), request.GET.get('limit'))
+    return JsonResponse({'results': results})
+
+
 # ==================== PAYMENT & BILLING ====================
 
 @login_required(login_url='login')
@@ -278,24 +342,31 @@ def patient_bills(request):
         messages.error(request, 'Profil pasien tidak ditemukan.')
         return redirect('home')
     
-    # Ambil semua pembayaran pasien
-    all_payments = Payment.objects.filter(patient=patient).order_by('-created_at')
-    
-    # Statistik
-    total_amount = sum([p.amount for p in all_payments])
-    total_paid = sum([p.paid_amount for p in all_payments])
-    pending_amount = total_amount - total_paid
+    # Statistik dari snapshot saldo (satu baris, tidak tergantung jumlah invoice)
+    balance = get_patient_balance(patient)
     
     # Filter berdasarkan status
+    payments = Payment.objects.filter(patient=patient)
     status_filter = request.GET.get('status', 'all')
     if status_filter != 'all':
-        all_payments = all_payments.filter(status=status_filter)
+        payments = payments.filter(status=status_filter)
+    
+    payments_paginated = paginate_queryset(
+        payments, request, items_per_page=20,
+        mode='cursor', ordering=('-created_at', '-id')
+    )
     
     context = {
-        'payments': all_payments,
-        'total_amount': total_amount,
-        'total_paid': total_paid,
-        'pending_amount': pending_amount,
+        'payments': payments_paginated['items'],
+        'is_paginated': payments_paginated['is_paginated'],
+        'has_previous': payments_paginated['has_previous'],
+        'has_next': payments_paginated['has_next'],
+        'previous_cursor': payments_paginated['previous_cursor'],
+        'next_cursor': payments_paginated['next_cursor'],
+        'total_amount': balance.total_amount,
+        'total_paid': balance.total_paid,
+        'pending_amount': balance.outstanding_amount,
+        'overdue_amount': balance.overdue_amount,
         'status_filter': status_filter,
         'page_title': 'Tagihan Saya'
     }
@@ -382,11 +453,14 @@ def doctor_appointments(request):
     
     if search_query:
         pending_appointments = pending_appointments.filter(
-            patient__name__icontains=search_query
+            patient__in=matching_patients(search_query)
         )
     
-    # Paginate pending appointments
-    pending_paginated = paginate_queryset(pending_appointments, request, items_per_page=10)
+    # Paginate pending appointments (keyset, biaya halaman dalam sama dengan halaman pertama)
+    pending_paginated = paginate_queryset(
+        pending_appointments, request, items_per_page=10,
+        mode='cursor', ordering=('-created_at', '-id')
+    )
     
     # Appointment yang sudah dikonfirmasi
     confirmed_appointments = MedicalRecord.objects.filter(
@@ -403,11 +477,14 @@ def doctor_appointments(request):
     context = {
         'doctor': doctor,
         'pending_appointments': pending_paginated['items'],
-        'page_obj': pending_paginated['page_obj'],
-        'paginator': pending_paginated['paginator'],
         'is_paginated': pending_paginated['is_paginated'],
+        'has_previous': pending_paginated['has_previous'],
+        'has_next': pending_paginated['has_next'],
+        'previous_cursor': pending_paginated['previous_cursor'],
+        'next_cursor': pending_paginated['next_cursor'],
         'confirmed_appointments': confirmed_appointments,
         'rejected_appointments': rejected_appointments,
+        # Jumlah pasti semua appointment pending (COUNT di indeks dokter + status), tidak ikut pencarian
         'pending_count': MedicalRecord.objects.filter(
             doctor=doctor,
             confirmation_status='pending'
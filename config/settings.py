@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -45,6 +46,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.QueryInstrumentationMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -53,6 +56,10 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Statistik query per view (lihat: python manage.py query_stats)
+QUERY_INSTRUMENTATION = True
+QUERY_STATS_FLUSH_SECONDS = 60
+
 ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
@@ -76,21 +83,134 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+def env_bool(name, default=False):
+    return os.environ.get(name, str(default)).strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+# Koneksi database diatur lewat environment variable (default: MySQL lokal).
+#   DB_ENGINE              mysql | postgresql | sqlite
+#   DB_CONN_MAX_AGE        detik koneksi dipakai ulang antar request (0 = buka baru tiap request)
+#   DB_CONN_HEALTH_CHECKS  cek koneksi lama sebelum dipakai ulang
+#   DB_POOL                PostgreSQL saja: pakai connection pool bawaan Django 5 (butuh psycopg[pool]);
+#                          ukuran diatur DB_POOL_MIN_SIZE / DB_POOL_MAX_SIZE / DB_POOL_TIMEOUT;
+#                          jatuh ke koneksi persisten biasa jika psycopg 3 / psycopg_pool tidak terpasang
+DB_ENGINE = os.environ.get('DB_ENGINE', 'mysql')
+DB_POOL = DB_ENGINE == 'postgresql' and env_bool('DB_POOL')
+
+if DB_POOL:
+    try:
+        import psycopg  # noqa: F401
+        import psycopg_pool  # noqa: F401
+    except ImportError:
+        # psycopg2 tidak mendukung OPTIONS['pool']; gagal saat connect jika tetap diaktifkan
+        DB_POOL = False
+
+DB_ENGINES = {
+    'mysql': 'django.db.backends.mysql',
+    'postgresql': 'django.db.backends.postgresql',
+    'sqlite': 'django.db.backends.sqlite3',
+}
+
+DB_DEFAULT_PORTS = {'mysql': '3306', 'postgresql': '5432', 'sqlite': ''}
+
+if DB_ENGINE == 'mysql':
+    DB_OPTIONS = {
+        'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
+        'charset': 'utf8mb4',
+    }
+elif DB_POOL:
+    DB_OPTIONS = {
+        'pool': {
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+            'timeout': int(os.environ.get('DB_POOL_TIMEOUT', 10)),
+        },
+    }
+else:
+    DB_OPTIONS = {}
+
+
+def database_config(host=None, name=None):
+    """Konfigurasi satu alias database dari environment variable"""
+    return {
+        'ENGINE': DB_ENGINES[DB_ENGINE],
+        'NAME': name or os.environ.get(
+            'DB_NAME', str(BASE_DIR / 'db.sqlite3') if DB_ENGINE == 'sqlite' else 'rumah_sakit'
+        ),
+        'USER': os.environ.get('DB_USER', 'root'),
+        'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+        'HOST': host or os.environ.get('DB_HOST', 'localhost'),
+        'PORT': os.environ.get('DB_PORT', DB_DEFAULT_PORTS[DB_ENGINE]),
+        # Pool mengatur umur koneksinya sendiri; Django menolak pool + CONN_MAX_AGE > 0
+        'CONN_MAX_AGE': 0 if DB_POOL else int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': env_bool('DB_CONN_HEALTH_CHECKS', True),
+        'OPTIONS': dict(DB_OPTIONS),
+    }
+
+
 DATABASES = {
+    'default': database_config(),
+}
+
+# Read replica: DB_REPLICAS berisi host replica dipisah koma (untuk SQLite: path file).
+# View GET dan command laporan membaca dari replica (lihat core.routers)
+for index, replica in enumerate(filter(None, os.environ.get('DB_REPLICAS', '').split(',')), start=1):
+    DATABASES[f'replica_{index}'] = database_config(
+        **({'name': replica.strip()} if DB_ENGINE == 'sqlite' else {'host': replica.strip()})
+    )
+    if DB_ENGINE != 'sqlite':
+        # Saat test, replica menunjuk ke database test primary.
+        # Replica SQLite tetap database terpisah sehingga routing bisa diuji
+        DATABASES[f'replica_{index}']['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias.startswith('replica_')]
+DATABASE_ROUTERS = ['core.routers.PrimaryReplicaRouter']
+
+# Lama (detik) browser dibaca dari primary setelah POST, agar data yang baru ditulis terlihat
+REPLICA_PIN_SECONDS = 10
+
+# Cache
+# Backend dipilih lewat environment variable CACHE_BACKEND:
+#   locmem (default) - memori per proses, cocok untuk development
+#   file             - direktori bersama (CACHE_LOCATION, default .cache/)
+#   redis            - server Redis (CACHE_URL); jatuh ke file jika paket redis tidak terpasang
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem')
+
+if CACHE_BACKEND == 'redis':
+    try:
+        import redis  # noqa: F401
+    except ImportError:
+        CACHE_BACKEND = 'file'
+
+CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'hms',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('CACHE_LOCATION', str(BASE_DIR / '.cache')),
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('CACHE_URL', 'redis://127.0.0.1:6379/1'),
+    },
+}
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.mysql',
-        'NAME': 'rumah_sakit',
-        'USER': 'root',
-        'PASSWORD': '',
-        'HOST': 'localhost',
-        'PORT': '3306',
-        'OPTIONS': {
-            'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
-            'charset': 'utf8mb4',
-        }
+        **CACHE_BACKENDS[CACHE_BACKEND],
+        'TIMEOUT': 300,
+        'KEY_PREFIX': 'hms',
+        'OPTIONS': {'MAX_ENTRIES': 10000} if CACHE_BACKEND != 'redis' else {},
     }
 }
 
+# Counter hit/miss cache (core.cache) digabung ke cache bersama setiap N detik
+CACHE_STATS_FLUSH_SECONDS = 10
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -141,6 +261,14 @@ AUTH_USER_MODEL = 'accounts.User'
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 DEFAULT_FROM_EMAIL = 'noreply@rumahsakit.com'
 
+# Email Outbox
+# Views hanya menyimpan email ke tabel outbox; pengiriman dilakukan worker:
+#   python manage.py send_outbox --loop
+EMAIL_USE_OUTBOX = True
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_BASE_SECONDS = 60
+
 # For Production SMTP Configuration:
 # Uncomment and configure below for Gmail or other SMTP providers
 # EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
@@ -1,18 +1,98 @@
 # core/admin.py
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.db.models import F
+from django.http import HttpResponseRedirect
 from .models import *
+from .services.exports import csv_response
+from .services.patient_search import matching_patients
+from .services.roster import get_doctor_roster
+from .services.stock import (
+    InsufficientStockError, adjust_stock, dispense_prescriptions, expiring_lots, receive_stock,
+)
+
+@admin.action(description='Ekspor CSV baris terpilih')
+def export_csv(modeladmin, request, queryset):
+    # Streaming per halaman keyset: aman untuk "pilih semua" jutaan baris
+    return csv_response(queryset)
+
+# Filter dokter dari roster cache (tanpa query Doctor.objects.all())
+class RosterDoctorFilter(admin.RelatedFieldListFilter):
+    def field_choices(self, field, request, model_admin):
+        return [(doctor['id'], f"Dr. {doctor['name']}") for doctor in get_doctor_roster()]
+
+# Filter kedaluwarsa lewat indeks MedicineLot.expiry_date (bukan scan tabel obat)
+class ExpiringLotFilter(admin.SimpleListFilter):
+    title = 'kedaluwarsa'
+    parameter_name = 'expires_within'
+
+    def lookups(self, request, model_admin):
+        return (
+            ('expired', 'Sudah kedaluwarsa'),
+            ('30', 'Dalam 30 hari'),
+            ('90', 'Dalam 90 hari'),
+            ('180', 'Dalam 180 hari'),
+        )
+
+    def expiring_lots(self):
+        if self.value() == 'expired':
+            return expiring_lots(-1)
+        if self.value() in ('30', '90', '180'):
+            return expiring_lots(int(self.value()))
+        return None
+
+    def queryset(self, request, queryset):
+        lots = self.expiring_lots()
+        return queryset if lots is None else queryset.filter(pk__in=lots.values('pk'))
+
+class MedicineExpiryFilter(ExpiringLotFilter):
+    def queryset(self, request, queryset):
+        lots = self.expiring_lots()
+        return queryset if lots is None else queryset.filter(pk__in=lots.values('medicine_id'))
 
 # Inline untuk relasi
 class PrescriptionInline(admin.TabularInline):
     model = Prescription
     extra = 0
-    fields = ('medicine', 'prescription_date', 'dosage', 'notes')
+    fields = ('medicine', 'prescription_date', 'dosage', 'quantity', 'notes', 'dispensed_at')
+    readonly_fields = ('dispensed_at',)
 
 class MedicalRecordInline(admin.StackedInline):
     model = MedicalRecord
     extra = 0
     fields = ('doctor', 'examination_date', 'diagnosis', 'treatment')
 
+class InpatientStayInline(admin.TabularInline):
+    model = InpatientStay
+    extra = 0
+    can_delete = False
+    fields = ('room', 'start_date', 'end_date', 'daily_rate')
+    readonly_fields = fields
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+class MedicineLotInline(admin.TabularInline):
+    model = MedicineLot
+    extra = 0
+    can_delete = False
+    verbose_name_plural = 'Lot berstok (FEFO)'
+    fields = ('lot_number', 'expiry_date', 'quantity', 'received_at')
+    readonly_fields = fields
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).filter(quantity__gt=0)
+
+class PurchaseOrderLineInline(admin.TabularInline):
+    model = PurchaseOrderLine
+    extra = 0
+    fields = ('medicine', 'quantity', 'unit_price', 'daily_usage', 'reorder_point', 'stock_on_hand')
+    readonly_fields = ('daily_usage', 'reorder_point', 'stock_on_hand')
+    raw_id_fields = ('medicine',)
+
 class InpatientInline(admin.TabularInline):
     model = Inpatient
     extra = 0
@@ -24,7 +104,7 @@ class InpatientInline(admin.TabularInline):
 class PatientAdmin(admin.ModelAdmin):
     list_display = ('name', 'phone', 'date_of_birth', 'gender', 'blood_type', 'bpjs_status')
     list_filter = ('gender', 'blood_type', 'bpjs_status')
-    search_fields = ('name', 'phone')
+    search_fields = ('name', 'phone', 'bpjs_status')
     inlines = [MedicalRecordInline, InpatientInline]
     fieldsets = (
         (None, {'fields': ('name', 'phone', 'address')}),
@@ -32,6 +112,12 @@ class PatientAdmin(admin.ModelAdmin):
         ('Asuransi', {'fields': ('bpjs_status',)}),
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        """Pakai indeks pencarian pasien, bukan LIKE '%...%' pada setiap kolom"""
+        if not search_term:
+            return queryset, False
+        return queryset.filter(pk__in=matching_patients(search_term)), False
+
 @admin.register(Doctor)
 class DoctorAdmin(admin.ModelAdmin):
     list_display = ('name', 'specialty', 'unit', 'phone', 'email')
@@ -45,45 +131,201 @@ class DoctorAdmin(admin.ModelAdmin):
 
 @admin.register(Room)
 class RoomAdmin(admin.ModelAdmin):
-    list_display = ('name', 'room_type', 'capacity', 'daily_rate')
+    list_display = ('name', 'room_type', 'capacity', 'occupied_beds', 'free_beds', 'daily_rate')
     list_filter = ('room_type',)
     search_fields = ('name',)
 
 @admin.register(Supplier)
 class SupplierAdmin(admin.ModelAdmin):
-    list_display = ('name', 'phone', 'email')
+    list_display = ('name', 'phone', 'email', 'lead_time_days')
     search_fields = ('name',)
 
 @admin.register(Medicine)
 class MedicineAdmin(admin.ModelAdmin):
     list_display = ('name', 'medicine_class', 'stock', 'price', 'expiry_date', 'supplier')
-    list_filter = ('medicine_class', 'supplier', 'expiry_date')
+    list_filter = ('medicine_class', 'supplier', MedicineExpiryFilter)
     search_fields = ('name',)
+    inlines = [MedicineLotInline]
+    # Stok hanya berubah lewat buku stok (Mutasi Stok), agar edit bersamaan tidak saling menimpa
+    readonly_fields = ('stock',)
+
+@admin.register(MedicineLot)
+class MedicineLotAdmin(admin.ModelAdmin):
+    """Lot dibuat dan diubah lewat buku stok; di sini hanya untuk dilihat"""
+    list_display = ('medicine', 'lot_number', 'expiry_date', 'quantity', 'received_at')
+    list_filter = (ExpiringLotFilter,)
+    search_fields = ('medicine__name', 'lot_number')
+    list_select_related = ('medicine',)
+    ordering = ('expiry_date', 'id')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+class StockMovementAdminForm(forms.ModelForm):
+    kind = forms.ChoiceField(choices=[
+        choice for choice in StockMovement.KIND_CHOICES if choice[0] != 'dispense'
+    ])
+    lot_number = forms.CharField(max_length=50, required=False, help_text='Nomor lot (penerimaan)')
+    expiry_date = forms.DateField(
+        required=False, help_text='Kedaluwarsa lot yang diterima (default: kedaluwarsa obat)'
+    )
+
+    class Meta:
+        model = StockMovement
+        fields = ('medicine', 'kind', 'quantity', 'note')
+
+    def clean(self):
+        cleaned_data = super().clean()
+        medicine, kind, quantity = (cleaned_data.get(name) for name in ('medicine', 'kind', 'quantity'))
+        if quantity == 0:
+            self.add_error('quantity', "Jumlah mutasi stok tidak boleh 0")
+        elif kind == 'receipt' and quantity is not None and quantity < 0:
+            self.add_error('quantity', "Jumlah penerimaan harus lebih dari 0")
+        elif medicine and quantity is not None and medicine.stock + quantity < 0:
+            self.add_error('quantity', f"Stok {medicine.name} hanya {medicine.stock}")
+        return cleaned_data
+
+@admin.register(StockMovement)
+class StockMovementAdmin(admin.ModelAdmin):
+    """Buku stok hanya bisa ditambah (penerimaan/penyesuaian), tidak diubah atau dihapus"""
+    form = StockMovementAdminForm
+    list_display = ('created_at', 'medicine', 'lot', 'kind', 'quantity', 'prescription', 'note')
+    list_filter = ('kind', 'created_at')
+    search_fields = ('medicine__name', 'note')
+    list_select_related = ('medicine', 'lot')
+    raw_id_fields = ('medicine',)
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    def save_model(self, request, obj, form, change):
+        obj._stock_error = None
+        if obj.kind == 'receipt':
+            movement = receive_stock(
+                obj.medicine, obj.quantity, obj.note,
+                form.cleaned_data['lot_number'], form.cleaned_data['expiry_date'],
+            )
+        else:
+            # Lot dikunci lagi saat menyimpan, stok tetap ditolak jika berkurang sejak form divalidasi
+            try:
+                movement = adjust_stock(obj.medicine, obj.quantity, obj.note)[0]
+            except InsufficientStockError as exc:
+                obj._stock_error = exc
+                self.message_user(request, str(exc), messages.ERROR)
+                return
+        obj.pk, obj.lot, obj.created_at = movement.pk, movement.lot, movement.created_at
+
+    def log_addition(self, request, obj, message):
+        if obj._stock_error:
+            return None
+        return super().log_addition(request, obj, message)
+
+    def response_add(self, request, obj, post_url_continue=None):
+        # Mutasi ditolak: kembali ke form tambah tanpa pesan sukses
+        if obj._stock_error:
+            return HttpResponseRedirect(request.path)
+        return super().response_add(request, obj, post_url_continue)
+
+@admin.register(PurchaseOrder)
+class PurchaseOrderAdmin(admin.ModelAdmin):
+    """Draft dibuat oleh forecast_reorders setiap malam; ubah status ke Dikirim agar tidak diganti"""
+    list_display = ('id', 'supplier', 'status', 'forecast_date', 'created_at')
+    list_filter = ('status', 'supplier')
+    list_select_related = ('supplier',)
+    readonly_fields = ('forecast_date', 'created_at', 'updated_at')
+    inlines = [PurchaseOrderLineInline]
+
+class MedicalRecordAdminForm(forms.ModelForm):
+    class Meta:
+        model = MedicalRecord
+        fields = '__all__'
+
+    def clean(self):
+        cleaned_data = super().clean()
+        doctor, examination_date, examination_time = (
+            cleaned_data.get(name) for name in ('doctor', 'examination_date', 'examination_time')
+        )
+        moved = any(name in self.changed_data for name in ('doctor', 'examination_date', 'examination_time'))
+        # Pindah jadwal mengambil slot baru (lihat core.signals); tolak di form jika sudah dipesan
+        if self.instance.pk and moved and doctor and examination_date and examination_time:
+            taken = Schedule.objects.filter(
+                doctor=doctor, examination_date=examination_date, examination_time=examination_time,
+            ).exclude(status='available')
+            if taken.exists():
+                self.add_error('examination_time', f"Dokter {doctor.name} tidak tersedia pada waktu tersebut")
+        return cleaned_data
 
 @admin.register(MedicalRecord)
 class MedicalRecordAdmin(admin.ModelAdmin):
+    form = MedicalRecordAdminForm
     list_display = ('id', 'patient', 'doctor', 'examination_date', 'diagnosis')
-    list_filter = ('examination_date', 'doctor')
+    list_filter = ('examination_date', ('doctor', RosterDoctorFilter))
     search_fields = ('patient__name', 'doctor__name')
     inlines = [PrescriptionInline]
     date_hierarchy = 'examination_date'
+    actions = [export_csv]
+
+class InpatientAdminForm(forms.ModelForm):
+    class Meta:
+        model = Inpatient
+        fields = '__all__'
+
+    def clean(self):
+        """Tolak rawat inap baru/pindah ruangan jika ruangan tujuan sudah penuh"""
+        cleaned_data = super().clean()
+        room = cleaned_data.get('room')
+        moving_in = room and cleaned_data.get('discharge_date') is None and (
+            self.instance.pk is None
+            or self.instance.discharge_date is not None
+            or self.instance.room_id != room.pk
+        )
+        if moving_in and Room.objects.filter(pk=room.pk, occupied_beds__gte=F('capacity')).exists():
+            self.add_error('room', f"Ruangan {room.name} penuh. Silahkan pilih ruangan lain.")
+        return cleaned_data
 
 @admin.register(Inpatient)
 class InpatientAdmin(admin.ModelAdmin):
-    list_display = ('patient', 'room', 'admission_date', 'discharge_date', 'cost')
+    form = InpatientAdminForm
+    inlines = [InpatientStayInline]
+    # Biaya dihitung accrual malam hari dari segmen rawat inap x tarif ruangan
+    readonly_fields = ('cost', 'payment', 'accrued_through')
+    list_display = ('patient', 'room', 'admission_date', 'discharge_date', 'cost', 'accrued_through')
     list_filter = ('room', 'admission_date')
     search_fields = ('patient__name',)
+    actions = [export_csv]
 
 @admin.register(Prescription)
 class PrescriptionAdmin(admin.ModelAdmin):
-    list_display = ('medical_record', 'medicine', 'prescription_date', 'dosage')
+    list_display = ('medical_record', 'medicine', 'prescription_date', 'dosage', 'quantity', 'dispensed_at')
     list_filter = ('prescription_date', 'medicine')
     search_fields = ('medical_record__patient__name', 'medicine__name')
+    actions = ['dispense_selected', export_csv]
+
+    def get_readonly_fields(self, request, obj=None):
+        # Resep yang sudah diserahkan sudah tercatat di buku stok
+        if obj and obj.dispensed_at:
+            return ('medicine', 'quantity', 'dispensed_at')
+        return ('dispensed_at',)
+
+    @admin.action(description='Serahkan obat untuk resep terpilih')
+    def dispense_selected(self, request, queryset):
+        try:
+            dispensed = dispense_prescriptions(queryset)
+        except InsufficientStockError as exc:
+            self.message_user(request, str(exc), messages.ERROR)
+            return
+        self.message_user(request, f"{dispensed} resep diserahkan, stok obat diperbarui.", messages.SUCCESS)
 
 @admin.register(Schedule)
 class ScheduleAdmin(admin.ModelAdmin):
     list_display = ('doctor', 'examination_date', 'examination_time')
-    list_filter = ('examination_date', 'doctor')
+    list_filter = ('examination_date', ('doctor', RosterDoctorFilter))
     search_fields = ('doctor__name',)
 
 @admin.register(Payment)
@@ -92,6 +334,7 @@ class PaymentAdmin(admin.ModelAdmin):
     list_filter = ('status', 'method', 'created_at')
     search_fields = ('patient__name', 'invoice_number')
     readonly_fields = ('invoice_number', 'created_at', 'updated_at')
+    actions = [export_csv]
     fieldsets = (
         (None, {'fields': ('invoice_number', 'patient', 'medical_record')}),
         ('Pembayaran', {'fields': ('service_name', 'amount', 'paid_amount', 'status', 'method')}),
@@ -103,4 +346,9 @@ class PaymentAdmin(admin.ModelAdmin):
 @admin.register(MedicalTransaction)
 class MedicalTransactionAdmin(admin.ModelAdmin):
     list_display = ('id', 'medical_record', 'payment', 'total')
-    search_fields = ('medical_record__patient__name',)
\ No newline at end of file
+    search_fields = ('medical_record__patient__name',)
+
+@admin.register(DashboardCounter)
+class DashboardCounterAdmin(admin.ModelAdmin):
+    list_display = ('name', 'value', 'updated_at')
+    readonly_fields = ('name', 'value', 'updated_at')
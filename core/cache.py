@@ -0,0 +1,168 @@
+"""
+Helper cache-aside dengan invalidasi per tag dan counter hit/miss per namespace.
+"""
+
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, TypeVar
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.routers import use_primary
+
+
+T = TypeVar('T')
+
+CACHE_STATS_FLUSH_SECONDS = getattr(settings, 'CACHE_STATS_FLUSH_SECONDS', 10)
+_STATS_NAMESPACES_KEY = 'cachestats:namespaces'
+
+
+def _tag_key(tag: str) -> str:
+    return f'cachetag:{tag}'
+
+
+def _namespace(key: str) -> str:
+    return key.split(':', 1)[0]
+
+
+class _Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        self._last_flush = time.monotonic()
+
+    def record(self, namespace, hits, misses):
+        with self._lock:
+            if hits:
+                self._pending[(namespace, 'hits')] += hits
+            if misses:
+                self._pending[(namespace, 'misses')] += misses
+            due = time.monotonic() - self._last_flush >= CACHE_STATS_FLUSH_SECONDS
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+        namespaces = set(cache.get(_STATS_NAMESPACES_KEY) or ())
+        for (namespace, kind), count in pending.items():
+            key = f'cachestats:{namespace}:{kind}'
+            if not cache.add(key, count, None):
+                try:
+                    cache.incr(key, count)
+                except ValueError:
+                    cache.set(key, count, None)
+            namespaces.add(namespace)
+        cache.set(_STATS_NAMESPACES_KEY, sorted(namespaces), None)
+
+
+_stats = _Stats()
+
+
+def tag_versions(tags: Iterable[str]) -> Dict[str, str]:
+    """Versi terkini setiap tag (tag baru langsung diberi versi)"""
+    keys = {_tag_key(tag): tag for tag in tags}
+    found = cache.get_many(list(keys))
+    return _fill_missing_versions(keys, found)
+
+
+def _fill_missing_versions(keys, found):
+    missing = [key for key in keys if key not in found]
+    for key in missing:
+        cache.add(key, uuid4().hex, None)
+    if missing:
+        found.update(cache.get_many(missing))
+    return {keys[key]: found.get(key) for key in keys}
+
+
+def tag_version(tag: str) -> str:
+    return tag_versions([tag])[tag]
+
+
+def invalidate_tags(*tags: str) -> None:
+    """Tandai semua nilai yang bergantung pada tag sebagai usang"""
+    cache.set_many({_tag_key(tag): uuid4().hex for tag in tags}, None)
+
+
+def get_many_or_compute(
+    keys: List[str],
+    compute_missing: Callable[[List[str]], Dict[str, T]],
+    timeout: int,
+    tags: Iterable[str] = (),
+) -> Dict[str, T]:
+    """
+    Cache-aside untuk beberapa key sekaligus
+
+    Args:
+        keys: Key cache yang dibutuhkan
+        compute_missing: Fungsi yang menerima daftar key yang tidak ada/usang
+            dan mengembalikan dict {key: nilai}
+        timeout: TTL dalam detik
+        tags: Tag yang membuat nilai usang saat di-invalidate
+
+    Returns:
+        Dict {key: nilai} untuk semua key
+    """
+    tag_keys = {_tag_key(tag): tag for tag in tags}
+    found = cache.get_many(list(keys) + list(tag_keys))
+    versions = _fill_missing_versions(tag_keys, {key: found[key] for key in tag_keys if key in found})
+
+    values = {}
+    for key in keys:
+        entry = found.get(key)
+        if entry is not None and entry[0] == versions:
+            values[key] = entry[1]
+    missing = [key for key in keys if key not in values]
+    if missing:
+        # Hitung dari primary: replica yang tertinggal tidak boleh mengisi cache dengan data lama
+        with use_primary():
+            fresh = compute_missing(missing)
+        cache.set_many({key: (versions, value) for key, value in fresh.items()}, timeout)
+        values.update(fresh)
+
+    if keys:
+        _stats.record(_namespace(keys[0]), len(keys) - len(missing), len(missing))
+    return values
+
+
+def get_or_compute(key: str, compute: Callable[[], T], timeout: int, tags: Iterable[str] = ()) -> T:
+    """Cache-aside untuk satu key: ambil dari cache atau hitung lalu simpan"""
+    return get_many_or_compute([key], lambda missing: {key: compute()}, timeout, tags)[key]
+
+
+def get_cache_stats() -> Dict[str, Dict[str, float]]:
+    """
+    Jumlah hit/miss per namespace dari semua proses
+
+    Returns:
+        Dict {namespace: {'hits', 'misses', 'hit_rate'}}
+    """
+    _stats.flush()
+    namespaces = cache.get(_STATS_NAMESPACES_KEY) or []
+    counters = cache.get_many(
+        [f'cachestats:{namespace}:{kind}' for namespace in namespaces for kind in ('hits', 'misses')]
+    )
+    stats = {}
+    for namespace in namespaces:
+        hits = counters.get(f'cachestats:{namespace}:hits', 0)
+        misses = counters.get(f'cachestats:{namespace}:misses', 0)
+        stats[namespace] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / (hits + misses), 3) if hits + misses else 0.0,
+        }
+    return stats
+
+
+def reset_cache_stats() -> None:
+    namespaces = cache.get(_STATS_NAMESPACES_KEY) or []
+    cache.delete_many(
+        [f'cachestats:{namespace}:{kind}' for namespace in namespaces for kind in ('hits', 'misses')]
+        + [_STATS_NAMESPACES_KEY]
+    )
@@ -0,0 +1,32 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.inpatient_billing import accrue_inpatient_charges, create_missing_stays
+
+
+class Command(BaseCommand):
+    help = 'Tagih biaya kamar semua rawat inap aktif/belum final (jalankan setiap malam)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help='Tanggal accrual YYYY-MM-DD (default hari ini)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Ukuran batch pembuatan Payment baru')
+
+    def handle(self, *args, **options):
+        try:
+            as_of = date.fromisoformat(options['date']) if options['date'] else None
+        except ValueError:
+            raise CommandError('Format tanggal harus YYYY-MM-DD')
+
+        started = time.perf_counter()
+        stays = create_missing_stays()
+        result = accrue_inpatient_charges(as_of=as_of, batch_size=options['batch_size'])
+        elapsed = time.perf_counter() - started
+
+        if stays:
+            self.stdout.write(f'{stays} segmen rawat inap dibuat untuk data lama.')
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['inpatients']} rawat inap ditagih, {result['payments_created']} tagihan baru "
+            f"({elapsed:.2f} detik)."
+        ))
@@ -0,0 +1,124 @@
+import copy
+import json
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.utils import load_backend
+
+from core.models import Patient
+
+
+# Mode pembanding: koneksi baru per request vs konfigurasi dari settings
+MODES = ('fresh', 'configured')
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round((len(ordered) - 1) * fraction))]
+
+
+def _mode_settings(settings_dict, mode):
+    settings_dict = copy.deepcopy(settings_dict)
+    if mode == 'fresh':
+        settings_dict['CONN_MAX_AGE'] = 0
+        settings_dict['OPTIONS'].pop('pool', None)
+    return settings_dict
+
+
+class Command(BaseCommand):
+    help = 'Bandingkan latency request dengan koneksi baru per request vs koneksi persisten/pool di bawah beban paralel'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Jumlah request per thread')
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--mode', choices=MODES, action='append', help='Hanya jalankan mode tertentu')
+        parser.add_argument('--json', action='store_true', help='Cetak hasil sebagai JSON')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        base = connection.settings_dict
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            raise CommandError('Benchmark butuh database file/server, bukan SQLite in-memory.')
+
+        results = {}
+        for mode in options['mode'] or MODES:
+            results[mode] = self._run(mode, base, options['requests'], options['concurrency'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(
+            f"{'Mode':12} {'CONN_MAX_AGE':>12} {'Pool':>5} {'Koneksi':>8} {'p50 ms':>8} {'p95 ms':>8} {'Mean ms':>8} {'Req/s':>8}"
+        )
+        for mode, row in results.items():
+            self.stdout.write(
+                f"{mode:12} {row['conn_max_age']:>12} {'ya' if row['pool'] else '-':>5} {row['connections_opened']:>8} "
+                f"{row['p50_ms']:>8} {row['p95_ms']:>8} {row['mean_ms']:>8} {row['requests_per_second']:>8}"
+            )
+
+    def _run(self, mode, base, requests_per_thread, concurrency):
+        alias = f'__benchmark_{mode}'
+        settings_dict = _mode_settings(base, mode)
+        backend = load_backend(settings_dict['ENGINE'])
+        timings, errors, lock = [], [], threading.Lock()
+        opened = [0]
+
+        def count_connection(sender, connection, **kwargs):
+            if connection.alias == alias:
+                with lock:
+                    opened[0] += 1
+
+        def worker():
+            # Satu koneksi per thread, seperti worker WSGI
+            connection = backend.DatabaseWrapper(settings_dict, alias)
+            sql, params = Patient.objects.filter(pk=0).values('pk').query.get_compiler(connection=connection).as_sql()
+            local = []
+            try:
+                for _ in range(requests_per_thread):
+                    # Siklus request Django: close_old_connections() di awal dan akhir setiap request
+                    started = time.perf_counter()
+                    connection.close_if_unusable_or_obsolete()
+                    with connection.cursor() as cursor:
+                        cursor.execute(sql, params)
+                        cursor.fetchall()
+                    connection.close_if_unusable_or_obsolete()
+                    local.append((time.perf_counter() - started) * 1000)
+            except Exception as exc:
+                with lock:
+                    errors.append(exc)
+            finally:
+                connection.close()
+            with lock:
+                timings.extend(local)
+
+        connection_created.connect(count_connection, weak=False)
+        started = time.perf_counter()
+        try:
+            threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            elapsed = time.perf_counter() - started
+            connection_created.disconnect(count_connection)
+            if settings_dict['OPTIONS'].get('pool'):
+                backend.DatabaseWrapper(settings_dict, alias).close_pool()
+
+        if errors:
+            raise CommandError(f'Mode {mode} gagal: {errors[0]}')
+        return {
+            'conn_max_age': settings_dict['CONN_MAX_AGE'],
+            'pool': bool(settings_dict['OPTIONS'].get('pool')),
+            'requests': len(timings),
+            'connections_opened': opened[0],
+            'p50_ms': round(statistics.median(timings), 3),
+            'p95_ms': round(_percentile(timings, 0.95), 3),
+            'mean_ms': round(statistics.mean(timings), 3),
+            'requests_per_second': round(len(timings) / elapsed, 1),
+        }
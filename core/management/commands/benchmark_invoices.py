@@ -0,0 +1,49 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.models import Payment
+from core.services.invoices import allocate_invoice_numbers, assign_invoice_numbers
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Ukur throughput pembuatan nomor invoice (default 100.000 nomor, data di-rollback)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=100000)
+        parser.add_argument('--block-size', type=int, default=1000, help='Jumlah nomor per alokasi/bulk_create')
+        parser.add_argument('--insert', action='store_true', help='Sekalian bulk_create Payment untuk setiap blok')
+        parser.add_argument('--keep', action='store_true', help='Jangan rollback hasil benchmark')
+
+    def handle(self, *args, **options):
+        count, block_size = options['count'], options['block_size']
+        started = time.perf_counter()
+        try:
+            with transaction.atomic():
+                remaining = count
+                while remaining > 0:
+                    size = min(block_size, remaining)
+                    if options['insert']:
+                        Payment.objects.bulk_create(
+                            assign_invoice_numbers([Payment(service_name='Benchmark') for _ in range(size)]),
+                            batch_size=block_size,
+                        )
+                    else:
+                        allocate_invoice_numbers(size)
+                    remaining -= size
+                if not options['keep']:
+                    raise _Rollback
+        except _Rollback:
+            pass
+        elapsed = time.perf_counter() - started
+
+        mode = 'alokasi + bulk_create' if options['insert'] else 'alokasi'
+        self.stdout.write(self.style.SUCCESS(
+            f'{count} nomor invoice ({mode}, blok {block_size}) dalam {elapsed:.2f} detik '
+            f'= {count / elapsed:,.0f} invoice/detik'
+        ))
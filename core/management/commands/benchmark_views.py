@@ -0,0 +1,129 @@
+import json
+import platform
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import Doctor, Inpatient, MedicalRecord, Patient, Payment, Prescription
+from core.services.dataset import BENCH_USERS
+
+
+def _doctor_patient(user):
+    return {
+        'patient_id': MedicalRecord.objects.filter(doctor_id=user.doctor_profile_id)
+        .values_list('patient_id', flat=True).first() or 0
+    }
+
+
+# (nama, user, url name, kwargs, query string)
+BENCHMARK_VIEWS = [
+    ('home', None, 'home', None, ''),
+    ('admin_dashboard', 'bench_admin', 'admin_dashboard', None, ''),
+    ('doctor_dashboard', 'bench_doctor', 'doctor_dashboard', None, ''),
+    ('doctor_appointments', 'bench_doctor', 'doctor_appointments', None, ''),
+    ('doctor_appointments_search', 'bench_doctor', 'doctor_appointments', None, '?search=Budi'),
+    ('doctor_availability', 'bench_doctor', 'doctor_availability', None, ''),
+    ('doctor_patient_list', 'bench_doctor', 'doctor:patient_list', None, ''),
+    ('doctor_patient_detail', 'bench_doctor', 'doctor:patient_detail', _doctor_patient, ''),
+    ('doctor_patient_appointments', 'bench_doctor', 'doctor:appointments', None, ''),
+    ('patient_dashboard', 'bench_patient', 'patient_dashboard', None, ''),
+    ('patient_bills', 'bench_patient', 'patient_bills', None, ''),
+    ('book_appointment', 'bench_patient', 'book_appointment', None, ''),
+]
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round((len(ordered) - 1) * fraction))]
+
+
+class Command(BaseCommand):
+    help = 'Ukur latency (p50/p95) dan jumlah query setiap dashboard & list view, hasil disimpan ke JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--warmup', type=int, default=2)
+        parser.add_argument('--view', action='append', help='Hanya jalankan view tertentu (bisa diulang)')
+        parser.add_argument('--output', help='Simpan hasil ke file JSON')
+        parser.add_argument('--compare', help='Bandingkan dengan file JSON hasil rilis sebelumnya')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        users = {user.username: user for user in User.objects.filter(username__in=BENCH_USERS)}
+        if len(users) != len(BENCH_USERS):
+            raise CommandError('User benchmark belum ada. Jalankan: python manage.py generate_dataset')
+
+        selected = [view for view in BENCHMARK_VIEWS if not options['view'] or view[0] in options['view']]
+        results = {}
+        for name, username, url_name, kwargs, query in selected:
+            client = Client(HTTP_HOST='localhost')
+            if username:
+                client.force_login(users[username])
+            url = reverse(url_name, kwargs=kwargs(users[username]) if kwargs else None) + query
+
+            for _ in range(options['warmup']):
+                client.get(url)
+
+            timings, query_counts = [], []
+            for _ in range(options['iterations']):
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    response = client.get(url)
+                    timings.append((time.perf_counter() - started) * 1000)
+                query_counts.append(len(queries))
+
+            results[name] = {
+                'url': url,
+                'status': response.status_code,
+                'p50_ms': round(_percentile(timings, 0.50), 2),
+                'p95_ms': round(_percentile(timings, 0.95), 2),
+                'mean_ms': round(statistics.mean(timings), 2),
+                'queries': max(query_counts),
+            }
+            row = results[name]
+            self.stdout.write(
+                f"{name:30} {row['status']:>4} p50 {row['p50_ms']:>9.2f} ms  p95 {row['p95_ms']:>9.2f} ms  "
+                f"{row['queries']:>4} query"
+            )
+
+        report = {
+            'generated_at': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'iterations': options['iterations'],
+            'dataset': {
+                'patients': Patient.objects.count(),
+                'doctors': Doctor.objects.count(),
+                'records': MedicalRecord.objects.count(),
+                'prescriptions': Prescription.objects.count(),
+                'payments': Payment.objects.count(),
+                'inpatients': Inpatient.objects.count(),
+            },
+            'views': results,
+        }
+
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump(report, handle, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Hasil disimpan ke {options['output']}"))
+
+        if options['compare']:
+            with open(options['compare']) as handle:
+                baseline = json.load(handle)['views']
+            self.stdout.write('\nPerbandingan dengan baseline (p95, query):')
+            for name, row in results.items():
+                if name not in baseline:
+                    continue
+                before = baseline[name]
+                change = (row['p95_ms'] - before['p95_ms']) / before['p95_ms'] * 100 if before['p95_ms'] else 0
+                self.stdout.write(
+                    f"{name:30} p95 {before['p95_ms']:>9.2f} -> {row['p95_ms']:>9.2f} ms ({change:+.0f}%)  "
+                    f"query {before['queries']} -> {row['queries']}"
+                )
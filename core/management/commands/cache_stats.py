@@ -0,0 +1,32 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.cache import get_cache_stats, reset_cache_stats
+
+
+class Command(BaseCommand):
+    help = 'Tampilkan jumlah hit/miss cache per namespace (core.cache)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--json', action='store_true', help='Cetak hasil sebagai JSON')
+        parser.add_argument('--reset', action='store_true', help='Kosongkan counter setelah ditampilkan')
+
+    def handle(self, *args, **options):
+        stats = get_cache_stats()
+        if options['json']:
+            self.stdout.write(json.dumps(stats, indent=2, sort_keys=True))
+        elif not stats:
+            self.stdout.write('Belum ada statistik (cache harus dipakai bersama oleh proses web).')
+        else:
+            self.stdout.write(f"Backend: {settings.CACHES['default']['BACKEND']}")
+            self.stdout.write(f"{'Namespace':30} {'Hit':>10} {'Miss':>10} {'Hit rate':>9}")
+            for namespace, row in sorted(stats.items()):
+                self.stdout.write(
+                    f"{namespace:30} {row['hits']:>10} {row['misses']:>10} {row['hit_rate']:>9.1%}"
+                )
+
+        if options['reset']:
+            reset_cache_stats()
+            self.stdout.write(self.style.SUCCESS('Statistik cache direset.'))
@@ -0,0 +1,51 @@
+import json
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.routers import use_replica
+from core.services.stock import expiring_lots, expiring_summary
+
+
+class Command(BaseCommand):
+    help = 'Laporan lot obat berstok yang sudah/akan kedaluwarsa dalam N hari (FEFO)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=90, help='Jendela hari dari tanggal acuan (default 90)')
+        parser.add_argument('--date', help='Tanggal acuan YYYY-MM-DD (default: hari ini)')
+        parser.add_argument('--limit', type=int, default=100, help='Jumlah lot yang ditampilkan (0 = semua)')
+        parser.add_argument('--json', action='store_true', help='Cetak hasil sebagai JSON')
+
+    @use_replica()
+    def handle(self, *args, **options):
+        try:
+            as_of = date.fromisoformat(options['date']) if options['date'] else None
+        except ValueError:
+            raise CommandError('Format --date harus YYYY-MM-DD')
+
+        lots = expiring_lots(options['days'], as_of)
+        if options['limit']:
+            lots = lots[:options['limit']]
+        rows = [
+            {
+                'medicine': lot.medicine.name,
+                'lot_number': lot.lot_number,
+                'expiry_date': lot.expiry_date.isoformat(),
+                'quantity': lot.quantity,
+            }
+            for lot in lots
+        ]
+        summary = expiring_summary(options['days'], as_of)
+
+        if options['json']:
+            summary['value'] = str(summary['value'])
+            self.stdout.write(json.dumps({'summary': summary, 'lots': rows}, indent=2))
+            return
+
+        self.stdout.write(f"{'Kedaluwarsa':12} {'Obat':40} {'Lot':15} {'Sisa':>8}")
+        for row in rows:
+            self.stdout.write(f"{row['expiry_date']:12} {row['medicine'][:40]:40} {row['lot_number'] or '-':15} {row['quantity']:>8}")
+        self.stdout.write(
+            f"{summary['lots']} lot, {summary['units']} unit (sudah kedaluwarsa: {summary['expired_units']}), "
+            f"nilai Rp {summary['value']:,.0f}"
+        )
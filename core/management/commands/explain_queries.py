@@ -0,0 +1,159 @@
+import json
+import re
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from core.models import Doctor, Inpatient, MedicalRecord, Patient, Payment, Schedule
+from core.routers import use_replica
+from core.services.stock import expiring_lots
+
+
+# Tabel besar yang tidak boleh di-scan penuh oleh query view
+BIG_TABLES = (
+    'core_medicalrecord',
+    'core_payment',
+    'core_inpatient',
+    'core_schedule',
+    'core_patient',
+    'core_prescription',
+    'core_medicinelot',
+)
+
+
+def view_queries(doctor_id, patient_id):
+    """Query representatif dari view dashboard dan daftar (nama -> queryset)"""
+    today = timezone.localdate()
+    return {
+        'doctor_appointments.pending': MedicalRecord.objects.filter(
+            doctor_id=doctor_id, confirmation_status='pending'
+        ).order_by('-created_at', '-id')[:11],
+        'doctor_dashboard.week_schedule': Schedule.objects.filter(
+            doctor_id=doctor_id, examination_date__range=[today, today + timedelta(days=7)]
+        ).order_by('examination_date', 'examination_time'),
+        'doctor_dashboard.recent_records': MedicalRecord.objects.filter(
+            doctor_id=doctor_id
+        ).order_by('-examination_date')[:5],
+        'doctor_patient_appointments.list': MedicalRecord.objects.filter(
+            doctor_id=doctor_id
+        ).order_by('-examination_date')[:50],
+        'book_appointment.slots': MedicalRecord.objects.filter(
+            doctor_id=doctor_id,
+            examination_date__range=[today, today + timedelta(days=30)],
+            status__in=['pending', 'confirmed'],
+        ),
+        'patient_dashboard.records': MedicalRecord.objects.filter(
+            patient_id=patient_id
+        ).order_by('-examination_date')[:10],
+        'patient_bills.list': Payment.objects.filter(
+            patient_id=patient_id, status='pending'
+        ).order_by('-created_at')[:20],
+        'admin_dashboard.active_inpatients': Inpatient.objects.filter(
+            discharge_date__isnull=True
+        ).order_by('-admission_date')[:20],
+        'admin_dashboard.recent_records': MedicalRecord.objects.order_by('-examination_date')[:5],
+        'admin_dashboard.recent_inpatients': Inpatient.objects.order_by('-admission_date')[:5],
+        'pharmacy.expiring_lots': expiring_lots(90)[:100],
+    }
+
+
+def _json_nodes(node):
+    """Semua dict di dalam plan JSON (rekursif)"""
+    if isinstance(node, dict):
+        yield node
+        children = node.values()
+    elif isinstance(node, list):
+        children = node
+    else:
+        return
+    for child in children:
+        yield from _json_nodes(child)
+
+
+def _postgresql_scans(plan):
+    # EXPLAIN (FORMAT JSON): node "Seq Scan" dengan "Relation Name"
+    return [node['Relation Name'] for node in _json_nodes(json.loads(plan)) if node.get('Node Type') == 'Seq Scan']
+
+
+def _mysql_scans(plan):
+    # EXPLAIN FORMAT=JSON: {"table": {"table_name": ..., "access_type": "ALL"}} di mana saja dalam plan
+    return [
+        node['table']['table_name'] for node in _json_nodes(json.loads(plan))
+        if isinstance(node.get('table'), dict) and node['table'].get('access_type') == 'ALL'
+    ]
+
+
+def _sqlite_scans(plan):
+    # EXPLAIN QUERY PLAN (teks): "SCAN tabel" tanpa "USING ... INDEX"
+    return [table for table, rest in re.findall(r'SCAN (\w+)(.*)', plan) if 'INDEX' not in rest]
+
+
+# Opsi EXPLAIN dan parser plan per vendor database
+EXPLAIN_BACKENDS = {
+    'postgresql': ({'format': 'json'}, _postgresql_scans),
+    'mysql': ({'format': 'json'}, _mysql_scans),
+    'sqlite': ({}, _sqlite_scans),
+}
+
+
+def find_full_scans(plan, vendor=None):
+    """Tabel besar yang di-scan penuh menurut output EXPLAIN vendor database"""
+    parse = EXPLAIN_BACKENDS[vendor or connection.vendor][1]
+    return sorted({table for table in parse(plan) if table in BIG_TABLES})
+
+
+class Command(BaseCommand):
+    help = 'Jalankan EXPLAIN untuk query view utama dan laporkan sequential scan pada tabel besar'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--doctor', type=int, help='ID dokter contoh (default: dokter pertama)')
+        parser.add_argument('--patient', type=int, help='ID pasien contoh (default: pasien pertama)')
+        parser.add_argument('--output', help='Simpan hasil EXPLAIN ke file JSON')
+        parser.add_argument('--compare', help='Bandingkan dengan file JSON hasil --output sebelumnya')
+        parser.add_argument('--verbose-plan', action='store_true', help='Tampilkan plan lengkap')
+        parser.add_argument(
+            '--fail-on-seq-scan',
+            action='store_true',
+            help='Exit code 1 jika masih ada sequential scan pada tabel besar',
+        )
+
+    @use_replica()
+    def handle(self, *args, **options):
+        doctor_id = options['doctor'] or Doctor.objects.values_list('pk', flat=True).first()
+        patient_id = options['patient'] or Patient.objects.values_list('pk', flat=True).first()
+        if doctor_id is None or patient_id is None:
+            raise CommandError('Butuh minimal satu dokter dan satu pasien di database.')
+
+        if connection.vendor not in EXPLAIN_BACKENDS:
+            raise CommandError(f'EXPLAIN untuk database {connection.vendor} belum didukung.')
+        explain_options = EXPLAIN_BACKENDS[connection.vendor][0]
+        previous = {}
+        if options['compare']:
+            with open(options['compare']) as fh:
+                previous = json.load(fh)
+
+        results = {}
+        for name, queryset in view_queries(doctor_id, patient_id).items():
+            plan = queryset.explain(**explain_options)
+            scans = find_full_scans(plan)
+            results[name] = {'plan': plan, 'full_scans': scans}
+
+            status = self.style.WARNING(f"SCAN {', '.join(scans)}") if scans else self.style.SUCCESS('index')
+            line = f'{name}: {status}'
+            if name in previous:
+                before = ', '.join(previous[name]['full_scans']) or 'index'
+                line += f' (sebelumnya: {before})'
+            self.stdout.write(line)
+            if options['verbose_plan']:
+                self.stdout.write(plan)
+
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(results, fh, indent=2)
+            self.stdout.write(f"Hasil disimpan ke {options['output']}")
+
+        scanned = [name for name, result in results.items() if result['full_scans']]
+        if options['fail_on_seq_scan'] and scanned:
+            raise CommandError(f"Sequential scan masih ada pada: {', '.join(scanned)}")
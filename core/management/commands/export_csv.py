@@ -0,0 +1,45 @@
+import sys
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.routers import use_replica
+from core.services.exports import EXPORT_CHUNK, EXPORTS, filter_dates, stream_csv
+
+
+class Command(BaseCommand):
+    help = 'Ekspor pembayaran, rekam medis, resep atau rawat inap ke CSV secara streaming (memori tetap)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('export', choices=sorted(EXPORTS), help='Data yang diekspor')
+        parser.add_argument('--output', '-o', help='File tujuan (default: stdout)')
+        parser.add_argument('--from', dest='date_from', help='Mulai tanggal YYYY-MM-DD (inklusif)')
+        parser.add_argument('--to', dest='date_to', help='Sampai tanggal YYYY-MM-DD (inklusif)')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK, help='Baris per query')
+
+    @use_replica()
+    def handle(self, *args, **options):
+        export = EXPORTS[options['export']]
+        try:
+            date_from = date.fromisoformat(options['date_from']) if options['date_from'] else None
+            date_to = date.fromisoformat(options['date_to']) if options['date_to'] else None
+        except ValueError:
+            raise CommandError('Format tanggal harus YYYY-MM-DD')
+        queryset = filter_dates(export, export.model.objects.all(), date_from, date_to)
+
+        started = time.perf_counter()
+        output = open(options['output'], 'w', newline='', encoding='utf-8') if options['output'] else sys.stdout
+        rows = -1  # tanpa header
+        try:
+            for line in stream_csv(export, queryset, options['chunk_size'], bom=bool(options['output'])):
+                output.write(line)
+                rows += 1
+        finally:
+            if options['output']:
+                output.close()
+
+        if options['output']:
+            self.stdout.write(self.style.SUCCESS(
+                f"{rows} baris diekspor ke {options['output']} ({time.perf_counter() - started:.2f} detik)."
+            ))
@@ -0,0 +1,48 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.reorder import COVER_DAYS, SERVICE_LEVEL_Z, compute_reorders, generate_purchase_orders
+from core.services.rollups import refresh_medicine_usage
+
+
+class Command(BaseCommand):
+    help = 'Forecast pemakaian obat dari rollup harian dan buat draft PO per supplier (jalankan setiap malam)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help='Tanggal forecast YYYY-MM-DD (default hari ini)')
+        parser.add_argument('--z', type=float, default=SERVICE_LEVEL_Z, help='Faktor safety stock (default 1.65 ~ 95%%)')
+        parser.add_argument('--cover-days', type=int, default=COVER_DAYS, help='Stok yang dipesan untuk N hari')
+        parser.add_argument('--full-refresh', action='store_true', help='Bangun ulang rollup pemakaian dari awal')
+        parser.add_argument('--dry-run', action='store_true', help='Tampilkan usulan tanpa membuat draft PO')
+
+    def handle(self, *args, **options):
+        try:
+            as_of = date.fromisoformat(options['date']) if options['date'] else None
+        except ValueError:
+            raise CommandError('Format tanggal harus YYYY-MM-DD')
+
+        started = time.perf_counter()
+        usage = refresh_medicine_usage(full=options['full_refresh'])
+        self.stdout.write(f"Rollup pemakaian: {usage['buckets']} obat-hari dihitung ulang ({usage['days']} hari).")
+
+        if options['dry_run']:
+            reorders, without_supplier = compute_reorders(as_of, options['z'], options['cover_days'])
+            self.stdout.write(f"{'Obat':40} {'Pakai/hari':>10} {'ROP':>7} {'Stok':>7} {'Dipesan':>8} {'Pesan':>7}")
+            for row in reorders:
+                self.stdout.write(
+                    f"{row['medicine'][:40]:40} {row['daily_usage']:>10} {row['reorder_point']:>7} "
+                    f"{row['stock_on_hand']:>7} {row['on_order']:>8} {row['quantity']:>7}"
+                )
+            result = {'orders': len({row['supplier_id'] for row in reorders}), 'lines': len(reorders),
+                      'without_supplier': without_supplier}
+        else:
+            result = generate_purchase_orders(as_of, options['z'], options['cover_days'])
+
+        if result['without_supplier']:
+            self.stdout.write(self.style.WARNING(f"{result['without_supplier']} obat dipakai tapi belum punya supplier."))
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['lines']} obat perlu dipesan di {result['orders']} PO"
+            f"{' (dry run)' if options['dry_run'] else ' draft'} ({time.perf_counter() - started:.2f} detik)."
+        ))
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.services.dataset import BENCH_PASSWORD, SCALES, generate_dataset
+
+
+class Command(BaseCommand):
+    help = 'Buat data rumah sakit sintetis (bulk_create per batch) untuk benchmark'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=sorted(SCALES), default='small')
+        for name in SCALES['small']:
+            parser.add_argument(f'--{name}', type=int, help=f'Override jumlah {name}')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        scale = dict(SCALES[options['scale']])
+        for name in scale:
+            if options[name] is not None:
+                scale[name] = options[name]
+
+        started = time.perf_counter()
+
+        def progress(model_name, written):
+            self.stdout.write(f'  {model_name}: {written}', ending='\r')
+            self.stdout.flush()
+
+        counts = generate_dataset(scale, batch_size=options['batch_size'], seed=options['seed'], progress=progress)
+        self.stdout.write('')
+        for name, count in counts.items():
+            self.stdout.write(f'{name:15} {count:>10}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Selesai dalam {time.perf_counter() - started:.1f} detik. '
+            f'User benchmark: bench_admin / bench_doctor / bench_patient (password: {BENCH_PASSWORD})'
+        ))
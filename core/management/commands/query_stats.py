@@ -0,0 +1,51 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from core.services.query_stats import QUERY_COUNT_BUCKETS, collect_stats, reset_stats
+
+
+SORT_KEYS = {
+    'queries': 'avg_queries',
+    'sql': 'avg_sql_ms',
+    'render': 'avg_render_ms',
+    'requests': 'requests',
+    'duplicates': 'duplicate_requests',
+}
+
+
+class Command(BaseCommand):
+    help = 'Tampilkan statistik query per view yang dikumpulkan QueryInstrumentationMiddleware'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sort', choices=sorted(SORT_KEYS), default='queries')
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument('--json', action='store_true', help='Cetak hasil lengkap sebagai JSON')
+        parser.add_argument('--reset', action='store_true', help='Kosongkan statistik setelah ditampilkan')
+
+    def handle(self, *args, **options):
+        stats = collect_stats()
+        if options['json']:
+            self.stdout.write(json.dumps(stats, indent=2, sort_keys=True))
+        elif not stats:
+            self.stdout.write('Belum ada statistik (cache harus dipakai bersama oleh proses web).')
+        else:
+            rows = sorted(stats.items(), key=lambda item: -item[1][SORT_KEYS[options['sort']]])
+            labels = [f'<={bound}' for bound in QUERY_COUNT_BUCKETS] + [f'>{QUERY_COUNT_BUCKETS[-1]}']
+            self.stdout.write(
+                f"{'View':40} {'Req':>6} {'Avg Q':>7} {'Max Q':>6} {'SQL ms':>8} {'Render ms':>10} {'Dup':>5}  Histogram query"
+            )
+            for name, row in rows[:options['limit']]:
+                histogram = ' '.join(
+                    f'{label}:{count}' for label, count in zip(labels, row['query_histogram']) if count
+                )
+                self.stdout.write(
+                    f"{name[:40]:40} {row['requests']:>6} {row['avg_queries']:>7} {row['max_queries']:>6} "
+                    f"{row['avg_sql_ms']:>8} {row['avg_render_ms']:>10} {row['duplicate_requests']:>5}  {histogram}"
+                )
+                for sql, count in sorted(row['duplicates'].items(), key=lambda item: -item[1])[:3]:
+                    self.stdout.write(f'    {count}x {sql[:120]}')
+
+        if options['reset']:
+            reset_stats()
+            self.stdout.write(self.style.SUCCESS('Statistik direset.'))
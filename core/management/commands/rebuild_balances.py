@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import PatientBalance
+from core.services.balances import ZERO, compute_patient_balances, refresh_patient_balances
+
+
+class Command(BaseCommand):
+    help = 'Bangun ulang snapshot saldo tagihan pasien dari tabel Payment dan laporkan selisih'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Hanya cek drift tanpa memperbaiki snapshot (exit code 1 jika ada drift)',
+        )
+
+    def handle(self, *args, **options):
+        actual = compute_patient_balances()
+        stored = {
+            patient_id: values
+            for patient_id, *values in PatientBalance.objects.values_list(
+                'patient_id', 'total_amount', 'total_paid', 'overdue_amount'
+            )
+        }
+
+        drifted = [
+            patient_id
+            for patient_id in set(actual) | set(stored)
+            if tuple(stored.get(patient_id, (ZERO, ZERO, ZERO))) != tuple(actual.get(patient_id, (ZERO, ZERO, ZERO)))
+        ]
+        self.stdout.write(f'{len(drifted)} dari {len(set(actual) | set(stored))} snapshot tidak sinkron.')
+
+        if options['check']:
+            if drifted:
+                raise CommandError(f'Snapshot saldo tidak sinkron untuk {len(drifted)} pasien.')
+            return
+
+        refresh_patient_balances(drifted)
+        self.stdout.write(self.style.SUCCESS(f'{len(drifted)} snapshot saldo diperbaiki.'))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.counters import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = 'Bangun ulang counter dashboard dari tabel sumber dan laporkan selisih (drift)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Hanya cek drift tanpa memperbaiki counter (exit code 1 jika ada drift)',
+        )
+
+    def handle(self, *args, **options):
+        check_only = options['check']
+        drifted = []
+        for name, stored, actual in rebuild_counters(check_only=check_only):
+            if stored == actual:
+                self.stdout.write(f'{name}: {actual} (ok)')
+            else:
+                drifted.append(name)
+                self.stdout.write(self.style.WARNING(f'{name}: tersimpan={stored}, aktual={actual}'))
+
+        if check_only and drifted:
+            raise CommandError(f"Counter tidak sinkron: {', '.join(drifted)}")
+        if drifted:
+            self.stdout.write(self.style.SUCCESS(f'{len(drifted)} counter diperbaiki.'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Semua counter sinkron.'))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from core.services.patient_search import rebuild_search_index, use_trigram
+
+
+class Command(BaseCommand):
+    help = 'Bangun ulang indeks token pencarian pasien (tidak diperlukan di PostgreSQL/pg_trgm)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        if use_trigram():
+            self.stdout.write('PostgreSQL memakai indeks trigram, tidak ada yang perlu dibangun ulang.')
+            return
+
+        total = rebuild_search_index(
+            batch_size=options['batch_size'],
+            progress=lambda count: self.stdout.write(f'  {count} token', ending='\r'),
+        )
+        self.stdout.write(self.style.SUCCESS(f'Indeks pencarian dibangun ulang: {total} token.'))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.stock import reconcile_stock
+
+
+class Command(BaseCommand):
+    help = 'Cocokkan stok obat dan sisa lot dengan buku stok (StockMovement) dan laporkan selisihnya'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Hanya laporkan selisih tanpa mengubah stok (exit code 1 jika ada selisih)',
+        )
+
+    def handle(self, *args, **options):
+        # Laporkan selisih lebih dulu, baru tulis
+        drifted = reconcile_stock(dry_run=True)
+        for name, stored, ledger in drifted:
+            self.stdout.write(self.style.WARNING(f'{name}: tersimpan={stored}, buku stok={ledger}'))
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS('Stok sinkron dengan buku stok.'))
+        elif options['dry_run']:
+            raise CommandError(f'{len(drifted)} stok obat/lot tidak sinkron dengan buku stok')
+        else:
+            repaired = reconcile_stock()
+            self.stdout.write(self.style.SUCCESS(f'{len(repaired)} stok obat/lot diperbaiki.'))
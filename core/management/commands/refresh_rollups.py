@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.services.rollups import ROLLUPS, refresh_rollups
+
+
+class Command(BaseCommand):
+    help = 'Perbarui rollup harian (pendapatan, kunjungan, resep) dari baris yang berubah sejak watermark'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--only', action='append', choices=sorted(ROLLUPS),
+            help='Hanya rollup ini (boleh diulang; default semua)',
+        )
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Bangun ulang dari awal (jalankan berkala: data yang dihapus/pindah tanggal tidak terdeteksi incremental)',
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        results = refresh_rollups(options['only'], full=options['full'])
+        for name, result in results.items():
+            self.stdout.write(f"{name:15} {result['buckets']:>8} bucket dihitung ulang ({result['days']} hari)")
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(results)} rollup diperbarui{' (full)' if options['full'] else ''} "
+            f"({time.perf_counter() - started:.2f} detik)."
+        ))
@@ -0,0 +1,70 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from core.routers import use_replica
+from core.services.reports import TOP_LIMIT, annual_report, monthly_report
+
+
+class Command(BaseCommand):
+    help = 'Laporan bulanan/tahunan pendapatan, kunjungan dan resep dari rollup harian'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--year', type=int, help='Tahun laporan (default tahun ini)')
+        parser.add_argument('--month', type=int, help='Bulan 1-12 (tanpa --month: laporan tahunan)')
+        parser.add_argument('--top', type=int, default=TOP_LIMIT, help='Jumlah dokter/obat teratas')
+        parser.add_argument('--json', action='store_true', help='Cetak hasil sebagai JSON')
+
+    @use_replica()
+    def handle(self, *args, **options):
+        year = options['year'] or timezone.localdate().year
+        month = options['month']
+        if month is not None and not 1 <= month <= 12:
+            raise CommandError('--month harus 1-12')
+
+        started = time.perf_counter()
+        report = monthly_report(year, month, options['top']) if month else annual_report(year, options['top'])
+        elapsed = time.perf_counter() - started
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2, cls=DjangoJSONEncoder))
+            return
+
+        revenue, visits, prescriptions = report['revenue'], report['visits'], report['prescriptions']
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Laporan {report['period']}"))
+        self.stdout.write(
+            f"Tagihan: {revenue['total']['payments']} pembayaran, Rp {revenue['total']['amount']:,.0f} "
+            f"(dibayar Rp {revenue['total']['paid_amount']:,.0f})"
+        )
+        self.stdout.write('  Per metode:')
+        for row in revenue['by_method']:
+            self.stdout.write(f"  {row['method']:12} {row['payments']:>8} Rp {row['amount']:>18,.0f}")
+        self.stdout.write('  Per status:')
+        for row in revenue['by_status']:
+            self.stdout.write(f"  {row['status']:12} {row['payments']:>8} Rp {row['amount']:>18,.0f}")
+
+        self.stdout.write(
+            f"Kunjungan: {visits['total']['visits']} (selesai {visits['total']['completed']}, "
+            f"batal {visits['total']['cancelled']})"
+        )
+        for row in visits['by_doctor']:
+            self.stdout.write(f"  {row['doctor__name'][:40]:40} {row['visits']:>8}")
+
+        self.stdout.write(
+            f"Resep: {prescriptions['total']['prescribed']} ditulis, {prescriptions['total']['dispensed']} diserahkan "
+            f"({prescriptions['total']['quantity']} unit)"
+        )
+        for row in prescriptions['by_medicine']:
+            self.stdout.write(f"  {row['medicine__name'][:40]:40} {row['prescribed']:>8} {row['quantity']:>8}")
+
+        if 'months' in report:
+            self.stdout.write(f"{'Bulan':>5} {'Pembayaran':>10} {'Tagihan':>18} {'Kunjungan':>10} {'Resep':>8}")
+            for row in report['months']:
+                self.stdout.write(
+                    f"{row['month']:>5} {row['payments']:>10} {row['amount']:>18,.0f} "
+                    f"{row['visits']:>10} {row['prescribed']:>8}"
+                )
+        self.stdout.write(self.style.SUCCESS(f"Dibaca dari rollup dalam {elapsed * 1000:.1f} ms."))
@@ -0,0 +1,71 @@
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from core.routers import replica_aliases, use_primary, use_replica
+from core.services.query_stats import RequestQueries, registry
+
+
+PIN_PRIMARY_COOKIE = 'pin_primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Catat jumlah query, waktu SQL, query duplikat dan waktu render per view.
+    Di mode DEBUG angka-angkanya juga dikirim sebagai response header
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_INSTRUMENTATION', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = RequestQueries()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(queries))
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - started) * 1000
+        render_ms = max(total_ms - queries.sql_seconds * 1000, 0.0)
+
+        match = getattr(request, 'resolver_match', None)
+        view_name = (match.view_name or match._func_path) if match else 'unresolved'
+        registry.record(view_name, queries, render_ms)
+
+        if settings.DEBUG:
+            response['X-Query-Count'] = str(queries.count)
+            response['X-Query-Time-Ms'] = f'{queries.sql_seconds * 1000:.1f}'
+            response['X-Duplicate-Queries'] = str(sum(count - 1 for count in queries.duplicates.values()))
+            response['X-Render-Time-Ms'] = f'{render_ms:.1f}'
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Request GET/HEAD/OPTIONS membaca dari replica. POST dan request lain yang
+    menulis tetap di primary, lalu browser di-pin ke primary selama
+    REPLICA_PIN_SECONDS agar redirect berikutnya melihat data yang baru ditulis
+    """
+
+    def __init__(self, get_response):
+        if not replica_aliases():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        use_replica_for_request = request.method in SAFE_METHODS and PIN_PRIMARY_COOKIE not in request.COOKIES
+        with (use_replica() if use_replica_for_request else use_primary()) as state:
+            response = self.get_response(request)
+        if state.wrote or request.method not in SAFE_METHODS:
+            response.set_cookie(
+                PIN_PRIMARY_COOKIE, '1',
+                max_age=getattr(settings, 'REPLICA_PIN_SECONDS', 10),
+                httponly=True, samesite='Lax',
+            )
+        return response
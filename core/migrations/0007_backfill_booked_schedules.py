@@ -0,0 +1,39 @@
+from django.db import migrations
+
+
+def backfill_booked_schedules(apps, schema_editor):
+    """Buat baris Schedule 'booked' untuk appointment aktif yang sudah ada"""
+    MedicalRecord = apps.get_model('core', 'MedicalRecord')
+    Schedule = apps.get_model('core', 'Schedule')
+
+    records = MedicalRecord.objects.filter(
+        examination_time__isnull=False,
+        status__in=['pending', 'confirmed'],
+    ).exclude(confirmation_status='rejected').values_list(
+        'doctor_id', 'examination_date', 'examination_time'
+    ).distinct()
+
+    batch = []
+    for doctor_id, examination_date, examination_time in records.iterator(chunk_size=2000):
+        batch.append(Schedule(
+            doctor_id=doctor_id,
+            examination_date=examination_date,
+            examination_time=examination_time,
+            status='booked',
+        ))
+        if len(batch) >= 2000:
+            Schedule.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        Schedule.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_doctor_is_available_doctor_working_hours_end_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_booked_schedules, migrations.RunPython.noop),
+    ]
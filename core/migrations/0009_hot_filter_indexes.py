@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_dashboardcounter'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='inpatient',
+            index=models.Index(fields=['discharge_date', 'admission_date'], name='inpatient_discharge_adm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inpatient',
+            index=models.Index(fields=['admission_date'], name='inpatient_admission_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='medicalrecord',
+            index=models.Index(fields=['doctor', 'confirmation_status', 'created_at'], name='medrec_doc_conf_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='medicalrecord',
+            index=models.Index(fields=['doctor', 'examination_date'], name='medrec_doc_exam_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='medicalrecord',
+            index=models.Index(fields=['patient', 'examination_date'], name='medrec_pat_exam_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='medicalrecord',
+            index=models.Index(fields=['examination_date'], name='medrec_exam_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['patient', 'status', 'created_at'], name='payment_pat_status_created_idx'),
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:06
+
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Salinan tokenizer saat migrasi ini dibuat (jangan impor kode aplikasi di migrasi)
+TOKEN_MAX_LENGTH = 50
+_WORD = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text):
+    return list(dict.fromkeys(word[:TOKEN_MAX_LENGTH] for word in _WORD.findall((text or '').lower())))
+
+
+def tokenize_patient(name, phone, bpjs):
+    tokens = tokenize(name) + tokenize(bpjs)
+    phone_digits = re.sub(r'\D', '', phone or '')
+    if phone_digits:
+        tokens.append(phone_digits[:TOKEN_MAX_LENGTH])
+    return list(dict.fromkeys(tokens))
+
+
+TRIGRAM_INDEXES = {
+    'patient_name_trgm_idx': 'UPPER("name"::text)',
+    'patient_phone_trgm_idx': 'UPPER("phone"::text)',
+    'patient_bpjs_trgm_idx': 'UPPER("bpjs_status"::text)',
+}
+
+
+def build_search_index(apps, schema_editor):
+    """PostgreSQL: indeks trigram GIN; backend lain: isi tabel token untuk pasien yang sudah ada"""
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for name, expression in TRIGRAM_INDEXES.items():
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS {name} ON core_patient USING gin ({expression} gin_trgm_ops)'
+            )
+        return
+
+    Patient = apps.get_model('core', 'Patient')
+    PatientSearchToken = apps.get_model('core', 'PatientSearchToken')
+    batch = []
+    patients = Patient.objects.values_list('id', 'name', 'phone', 'bpjs_status').order_by('id')
+    for patient_id, name, phone, bpjs in patients.iterator(chunk_size=2000):
+        batch.extend(PatientSearchToken(patient_id=patient_id, token=token) for token in tokenize_patient(name, phone, bpjs))
+        if len(batch) >= 5000:
+            PatientSearchToken.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        PatientSearchToken.objects.bulk_create(batch)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for name in TRIGRAM_INDEXES:
+            schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_invoicesequence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PatientSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=50)),
+                ('patient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='core.patient')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['token', 'patient'], name='patient_search_token_idx')],
+            },
+        ),
+        migrations.RunPython(build_search_index, drop_search_index),
+    ]
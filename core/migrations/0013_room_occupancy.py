@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:19
+
+from django.db import migrations, models
+
+
+def backfill_occupied_beds(apps, schema_editor):
+    """Isi occupied_beds dari rawat inap yang masih aktif"""
+    Inpatient = apps.get_model('core', 'Inpatient')
+    Room = apps.get_model('core', 'Room')
+
+    active = Inpatient.objects.filter(discharge_date__isnull=True).order_by().values('room_id').annotate(
+        total=models.Count('id')
+    )
+    for row in active:
+        Room.objects.filter(pk=row['room_id']).update(occupied_beds=row['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_patient_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='room',
+            name='occupied_beds',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['room_type'], name='room_type_idx'),
+        ),
+        migrations.RunPython(backfill_occupied_beds, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_inpatient_stays(apps, schema_editor):
+    """Satu segmen per rawat inap lama (riwayat pindah ruangan tidak tersedia)"""
+    Inpatient = apps.get_model('core', 'Inpatient')
+    InpatientStay = apps.get_model('core', 'InpatientStay')
+
+    rows = Inpatient.objects.values_list('pk', 'room_id', 'admission_date', 'discharge_date', 'room__daily_rate')
+    batch = []
+    for pk, room_id, admission_date, discharge_date, daily_rate in rows.iterator(chunk_size=2000):
+        batch.append(InpatientStay(
+            inpatient_id=pk,
+            room_id=room_id,
+            start_date=admission_date,
+            end_date=discharge_date,
+            daily_rate=daily_rate,
+        ))
+        if len(batch) >= 2000:
+            InpatientStay.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        InpatientStay.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_room_occupancy'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inpatient',
+            name='accrued_through',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='inpatient',
+            name='payment',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='inpatient', to='core.payment'),
+        ),
+        migrations.AlterField(
+            model_name='inpatient',
+            name='cost',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10),
+        ),
+        migrations.CreateModel(
+            name='InpatientStay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('daily_rate', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('inpatient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stays', to='core.inpatient')),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stays', to='core.room')),
+            ],
+            options={
+                'ordering': ['start_date', 'id'],
+                'indexes': [models.Index(fields=['inpatient', 'end_date'], name='stay_inpatient_end_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_inpatient_stays, migrations.RunPython.noop),
+    ]
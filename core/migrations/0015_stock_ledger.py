@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:27
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def open_stock_ledger(apps, schema_editor):
+    """Saldo awal buku stok dari stok saat ini; resep lama dianggap sudah diserahkan"""
+    Medicine = apps.get_model('core', 'Medicine')
+    Prescription = apps.get_model('core', 'Prescription')
+    StockMovement = apps.get_model('core', 'StockMovement')
+
+    StockMovement.objects.bulk_create(
+        [
+            StockMovement(medicine_id=medicine_id, kind='adjustment', quantity=stock, note='Saldo awal')
+            for medicine_id, stock in Medicine.objects.exclude(stock=0).values_list('pk', 'stock').iterator()
+        ],
+        batch_size=1000,
+    )
+    Prescription.objects.filter(dispensed_at__isnull=True).update(dispensed_at=django.utils.timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_inpatient_billing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='prescription',
+            name='dispensed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='prescription',
+            name='quantity',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AlterField(
+            model_name='medicine',
+            name='stock',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.CreateModel(
+            name='StockMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('receipt', 'Penerimaan'), ('dispense', 'Pengeluaran Resep'), ('adjustment', 'Penyesuaian')], max_length=20)),
+                ('quantity', models.IntegerField()),
+                ('note', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('medicine', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='movements', to='core.medicine')),
+                ('prescription', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='movements', to='core.prescription')),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['medicine', 'created_at'], name='movement_medicine_date_idx')],
+            },
+        ),
+        migrations.RunPython(open_stock_ledger, migrations.RunPython.noop),
+    ]
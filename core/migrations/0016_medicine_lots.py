@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:31
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def create_opening_lots(apps, schema_editor):
+    """Satu lot per obat berstok dengan kedaluwarsa obat saat ini; mutasi lama ikut lot tersebut"""
+    Medicine = apps.get_model('core', 'Medicine')
+    MedicineLot = apps.get_model('core', 'MedicineLot')
+    StockMovement = apps.get_model('core', 'StockMovement')
+
+    MedicineLot.objects.bulk_create(
+        [
+            MedicineLot(medicine_id=medicine_id, expiry_date=expiry_date, quantity=stock)
+            for medicine_id, expiry_date, stock in Medicine.objects.filter(stock__gt=0)
+            .values_list('pk', 'expiry_date', 'stock').iterator()
+        ],
+        batch_size=1000,
+    )
+    StockMovement.objects.filter(lot__isnull=True).update(
+        lot=models.Subquery(MedicineLot.objects.filter(medicine=models.OuterRef('medicine')).values('pk')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_stock_ledger'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MedicineLot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('lot_number', models.CharField(blank=True, max_length=50)),
+                ('expiry_date', models.DateField()),
+                ('quantity', models.PositiveIntegerField(default=0, editable=False)),
+                ('received_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('medicine', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lots', to='core.medicine')),
+            ],
+            options={
+                'ordering': ['expiry_date', 'id'],
+            },
+        ),
+        migrations.AddField(
+            model_name='stockmovement',
+            name='lot',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='movements', to='core.medicinelot'),
+        ),
+        migrations.AddIndex(
+            model_name='medicinelot',
+            index=models.Index(fields=['expiry_date'], name='lot_expiry_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='medicinelot',
+            index=models.Index(fields=['medicine', 'expiry_date'], name='lot_medicine_expiry_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='medicinelot',
+            constraint=models.UniqueConstraint(fields=('medicine', 'lot_number', 'expiry_date'), name='unique_medicine_lot'),
+        ),
+        migrations.RunPython(create_opening_lots, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:35
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_medicine_lots'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MedicineUsageDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('quantity', models.PositiveIntegerField(default=0)),
+                ('prescriptions', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PurchaseOrder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('draft', 'Draft'), ('sent', 'Dikirim ke Supplier'), ('received', 'Diterima'), ('cancelled', 'Dibatalkan')], default='draft', max_length=20)),
+                ('forecast_date', models.DateField(blank=True, null=True)),
+                ('notes', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PurchaseOrderLine',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.PositiveIntegerField()),
+                ('unit_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('daily_usage', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('reorder_point', models.PositiveIntegerField(default=0)),
+                ('stock_on_hand', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('value', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='supplier',
+            name='lead_time_days',
+            field=models.PositiveIntegerField(default=7),
+        ),
+        migrations.AddIndex(
+            model_name='prescription',
+            index=models.Index(fields=['dispensed_at'], name='prescription_dispensed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='prescription',
+            index=models.Index(fields=['prescription_date', 'medicine'], name='prescription_date_med_idx'),
+        ),
+        migrations.AddField(
+            model_name='medicineusagedaily',
+            name='medicine',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='usage_daily', to='core.medicine'),
+        ),
+        migrations.AddField(
+            model_name='purchaseorder',
+            name='supplier',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='purchase_orders', to='core.supplier'),
+        ),
+        migrations.AddField(
+            model_name='purchaseorderline',
+            name='medicine',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='purchase_order_lines', to='core.medicine'),
+        ),
+        migrations.AddField(
+            model_name='purchaseorderline',
+            name='order',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lines', to='core.purchaseorder'),
+        ),
+        migrations.AddIndex(
+            model_name='medicineusagedaily',
+            index=models.Index(fields=['date'], name='usage_date_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='medicineusagedaily',
+            constraint=models.UniqueConstraint(fields=('medicine', 'date'), name='unique_medicine_usage_day'),
+        ),
+        migrations.AddIndex(
+            model_name='purchaseorder',
+            index=models.Index(fields=['supplier', 'status'], name='po_supplier_status_idx'),
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def reset_usage_rollup(apps, schema_editor):
+    # Kolom prescribed baru: refresh berikutnya membangun ulang rollup resep dari awal
+    apps.get_model('core', 'RollupWatermark').objects.filter(name='medicine_usage').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_reorder_forecasting'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevenueDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('method', models.CharField(choices=[('cash', 'Cash / Tunai'), ('transfer', 'Transfer Bank'), ('debit', 'Debit Card'), ('credit', 'Credit Card'), ('bpjs', 'BPJS')], max_length=50)),
+                ('status', models.CharField(choices=[('pending', 'Menunggu Pembayaran'), ('paid', 'Sudah Dibayar'), ('partial', 'Pembayaran Sebagian'), ('overdue', 'Terlambat'), ('cancelled', 'Dibatalkan')], max_length=20)),
+                ('payments', models.PositiveIntegerField(default=0)),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('paid_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='VisitDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('visits', models.PositiveIntegerField(default=0)),
+                ('completed', models.PositiveIntegerField(default=0)),
+                ('cancelled', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='prescription',
+            name='prescription_dispensed_idx',
+        ),
+        migrations.AddField(
+            model_name='medicineusagedaily',
+            name='prescribed',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='prescription',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='medicalrecord',
+            index=models.Index(fields=['updated_at'], name='medrec_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['updated_at'], name='payment_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['created_at'], name='payment_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='prescription',
+            index=models.Index(fields=['updated_at'], name='prescription_updated_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='revenuedaily',
+            constraint=models.UniqueConstraint(fields=('date', 'method', 'status'), name='unique_revenue_day'),
+        ),
+        migrations.AddField(
+            model_name='visitdaily',
+            name='doctor',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='visits_daily', to='core.doctor'),
+        ),
+        migrations.AddIndex(
+            model_name='visitdaily',
+            index=models.Index(fields=['date'], name='visit_date_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='visitdaily',
+            constraint=models.UniqueConstraint(fields=('doctor', 'date'), name='unique_visit_day'),
+        ),
+        migrations.RunPython(reset_usage_rollup, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations
+from django.db.models import F
+
+
+def mark_legacy_stays_accrued(apps, schema_editor):
+    # Rawat inap yang sudah pulang sebelum ada accrual ditagih manual (cost diisi tangan):
+    # anggap final agar accrual malam tidak membuat Payment baru dan menimpa cost-nya
+    Inpatient = apps.get_model('core', 'Inpatient')
+    Inpatient.objects.filter(
+        discharge_date__isnull=False, accrued_through__isnull=True, payment__isnull=True,
+    ).update(accrued_through=F('discharge_date'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_rollup_reports'),
+    ]
+
+    operations = [
+        migrations.RunPython(mark_legacy_stays_accrued, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_inpatient_legacy_accrual'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='inpatient',
+            name='cost',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+    ]
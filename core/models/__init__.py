@@ -3,9 +3,18 @@ from .doctor import Doctor, DoctorAvailability, DoctorLeave
 from .room import Room
 from .supplier import Supplier
 from .medicine import Medicine
+from .medicine_lot import MedicineLot
 from .medical_record import MedicalRecord
 from .inpatient import Inpatient
 from .prescription import Prescription
 from .schedule import Schedule
 from .payment import Payment
-from .transaction import MedicalTransaction
\ No newline at end of file
+from .transaction import MedicalTransaction
+from .counter import DashboardCounter
+from .balance import PatientBalance
+from .invoice_sequence import InvoiceSequence
+from .patient_search import PatientSearchToken
+from .inpatient_stay import InpatientStay
+from .stock_movement import StockMovement
+from .rollup import MedicineUsageDaily, RevenueDaily, RollupWatermark, VisitDaily
+from .purchase_order import PurchaseOrder, PurchaseOrderLine
\ No newline at end of file
@@ -0,0 +1,18 @@
+from django.db import models
+from .patient import Patient
+
+class PatientBalance(models.Model):
+    """Snapshot saldo tagihan per pasien, diperbarui inkremental saat Payment disimpan"""
+    patient = models.OneToOneField(Patient, on_delete=models.CASCADE, related_name='balance')
+    total_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    total_paid = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    overdue_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Saldo {self.patient.name}: Rp{self.outstanding_amount:,.0f}"
+
+    @property
+    def outstanding_amount(self):
+        """Sisa tagihan yang belum dibayar"""
+        return self.total_amount - self.total_paid
@@ -0,0 +1,10 @@
+from django.db import models
+
+class DashboardCounter(models.Model):
+    """Counter statistik dashboard yang disimpan (materialized) agar dibaca O(1)"""
+    name = models.CharField(max_length=50, unique=True)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
@@ -1,5 +1,6 @@
 from django.db import models
 from .patient import Patient
+from .payment import Payment
 from .room import Room
 
 class Inpatient(models.Model):
@@ -8,7 +9,17 @@ class Inpatient(models.Model):
     admission_date = models.DateField()
     discharge_date = models.DateField(null=True, blank=True)
     diagnosis = models.TextField()
-    cost = models.DecimalField(max_digits=10, decimal_places=2)
+    cost = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    # Tagihan rawat inap (diisi accrual malam hari, lihat core.services.inpatient_billing)
+    payment = models.OneToOneField(Payment, on_delete=models.SET_NULL, null=True, blank=True, related_name='inpatient')
+    accrued_through = models.DateField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Filter rawat inap aktif (discharge_date IS NULL) diurutkan per tanggal masuk
+            models.Index(fields=['discharge_date', 'admission_date'], name='inpatient_discharge_adm_idx'),
+            models.Index(fields=['admission_date'], name='inpatient_admission_idx'),
+        ]
 
     def __str__(self):
         return f"Rawat Inap: {self.patient.name}"
\ No newline at end of file
@@ -0,0 +1,21 @@
+from django.db import models
+from .inpatient import Inpatient
+from .room import Room
+
+class InpatientStay(models.Model):
+    """Satu segmen rawat inap di satu ruangan (pindah ruangan membuat segmen baru)"""
+    inpatient = models.ForeignKey(Inpatient, on_delete=models.CASCADE, related_name='stays')
+    room = models.ForeignKey(Room, on_delete=models.CASCADE, related_name='stays')
+    start_date = models.DateField()
+    end_date = models.DateField(null=True, blank=True)
+    # Tarif ruangan saat segmen dimulai, agar perubahan tarif tidak mengubah tagihan lama
+    daily_rate = models.DecimalField(max_digits=10, decimal_places=2)
+
+    class Meta:
+        ordering = ['start_date', 'id']
+        indexes = [
+            models.Index(fields=['inpatient', 'end_date'], name='stay_inpatient_end_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.inpatient_id} @ {self.room_id}: {self.start_date} - {self.end_date or '...'}"
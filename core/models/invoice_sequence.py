@@ -0,0 +1,10 @@
+from django.db import models
+
+class InvoiceSequence(models.Model):
+    """Nomor urut invoice per tahun; dialokasikan per blok oleh core.services.invoices"""
+    name = models.CharField(max_length=20, unique=True)
+    last_value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.last_value}"
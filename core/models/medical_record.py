@@ -31,6 +31,14 @@ class MedicalRecord(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['doctor', 'confirmation_status', 'created_at'], name='medrec_doc_conf_created_idx'),
+            models.Index(fields=['doctor', 'examination_date'], name='medrec_doc_exam_date_idx'),
+            models.Index(fields=['patient', 'examination_date'], name='medrec_pat_exam_date_idx'),
+            models.Index(fields=['examination_date'], name='medrec_exam_date_idx'),
+            # Rollup kunjungan harian: baris yang berubah sejak watermark
+            models.Index(fields=['updated_at'], name='medrec_updated_idx'),
+        ]
 
     def __str__(self):
         return f"MR-{self.id} | {self.patient.name} - {self.status}"
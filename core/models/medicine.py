@@ -5,8 +5,10 @@ class Medicine(models.Model):
     name = models.CharField(max_length=100)
     medicine_class = models.CharField(max_length=50)  # gol_obat
     medicine_type = models.CharField(max_length=50)   # jenis_obat
+    # Kedaluwarsa terdekat dari lot yang masih ada stoknya (diperbarui buku stok)
     expiry_date = models.DateField()
-    stock = models.IntegerField(default=0)
+    # Hanya diubah lewat buku stok (core.services.stock), bukan diedit langsung
+    stock = models.IntegerField(default=0, editable=False)
     price = models.DecimalField(max_digits=10, decimal_places=2)
     supplier = models.ForeignKey(Supplier, on_delete=models.SET_NULL, null=True, blank=True)
 
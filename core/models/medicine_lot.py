@@ -0,0 +1,27 @@
+from django.db import models
+from django.utils import timezone
+from .medicine import Medicine
+
+class MedicineLot(models.Model):
+    """Satu batch obat dengan tanggal kedaluwarsa sendiri; stok obat = jumlah sisa semua lot"""
+    medicine = models.ForeignKey(Medicine, on_delete=models.CASCADE, related_name='lots')
+    lot_number = models.CharField(max_length=50, blank=True)
+    expiry_date = models.DateField()
+    # Sisa stok lot, hanya diubah lewat buku stok (core.services.stock)
+    quantity = models.PositiveIntegerField(default=0, editable=False)
+    received_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['expiry_date', 'id']
+        constraints = [
+            models.UniqueConstraint(fields=['medicine', 'lot_number', 'expiry_date'], name='unique_medicine_lot'),
+        ]
+        indexes = [
+            # Laporan kedaluwarsa: range scan tanggal di semua obat
+            models.Index(fields=['expiry_date'], name='lot_expiry_idx'),
+            # FEFO: lot satu obat urut kedaluwarsa terdekat
+            models.Index(fields=['medicine', 'expiry_date'], name='lot_medicine_expiry_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.medicine} lot {self.lot_number or '-'} ({self.expiry_date})"
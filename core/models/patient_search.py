@@ -0,0 +1,15 @@
+from django.db import models
+from .patient import Patient
+
+class PatientSearchToken(models.Model):
+    """Token pencarian pasien (nama, telepon, BPJS) untuk backend tanpa pg_trgm"""
+    patient = models.ForeignKey(Patient, on_delete=models.CASCADE, related_name='search_tokens')
+    token = models.CharField(max_length=50)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['token', 'patient'], name='patient_search_token_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.token} -> {self.patient_id}"
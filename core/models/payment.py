@@ -36,13 +36,18 @@ class Payment(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['patient', 'status', 'created_at'], name='payment_pat_status_created_idx'),
+            # Rollup pendapatan harian: baris yang berubah sejak watermark, lalu per hari
+            models.Index(fields=['updated_at'], name='payment_updated_idx'),
+            models.Index(fields=['created_at'], name='payment_created_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         """Generate invoice number jika belum ada"""
         if not self.invoice_number:
-            from datetime import datetime
-            timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-            self.invoice_number = f"INV-{timestamp}-{self.patient_id}"
+            from core.services.invoices import next_invoice_number
+            self.invoice_number = next_invoice_number()
         super().save(*args, **kwargs)
 
     def __str__(self):
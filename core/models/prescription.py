@@ -8,6 +8,17 @@ class Prescription(models.Model):
     prescription_date = models.DateField()
     dosage = models.CharField(max_length=50)
     notes = models.TextField(blank=True)
+    quantity = models.PositiveIntegerField(default=1)
+    # Diisi saat obat diserahkan; stok obat dikurangi lewat buku stok (StockMovement)
+    dispensed_at = models.DateTimeField(null=True, blank=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Rollup resep per obat: baris yang berubah sejak watermark, lalu per tanggal/obat
+            models.Index(fields=['updated_at'], name='prescription_updated_idx'),
+            models.Index(fields=['prescription_date', 'medicine'], name='prescription_date_med_idx'),
+        ]
 
     def __str__(self):
         return f"Resep untuk {self.medical_record.patient.name}"
\ No newline at end of file
@@ -0,0 +1,42 @@
+from django.db import models
+from django.utils import timezone
+from .medicine import Medicine
+from .supplier import Supplier
+
+class PurchaseOrder(models.Model):
+    STATUS_CHOICES = [
+        ('draft', 'Draft'),
+        ('sent', 'Dikirim ke Supplier'),
+        ('received', 'Diterima'),
+        ('cancelled', 'Dibatalkan'),
+    ]
+
+    supplier = models.ForeignKey(Supplier, on_delete=models.CASCADE, related_name='purchase_orders')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='draft')
+    # Tanggal forecast yang menghasilkan draft ini
+    forecast_date = models.DateField(null=True, blank=True)
+    notes = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['supplier', 'status'], name='po_supplier_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"PO #{self.pk} {self.supplier} ({self.get_status_display()})"
+
+class PurchaseOrderLine(models.Model):
+    order = models.ForeignKey(PurchaseOrder, on_delete=models.CASCADE, related_name='lines')
+    medicine = models.ForeignKey(Medicine, on_delete=models.CASCADE, related_name='purchase_order_lines')
+    quantity = models.PositiveIntegerField()
+    unit_price = models.DecimalField(max_digits=10, decimal_places=2)
+    # Dasar perhitungan forecast saat draft dibuat
+    daily_usage = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    reorder_point = models.PositiveIntegerField(default=0)
+    stock_on_hand = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.medicine} x {self.quantity}"
@@ -0,0 +1,69 @@
+from django.db import models
+from .doctor import Doctor
+from .medicine import Medicine
+from .payment import Payment
+
+class RollupWatermark(models.Model):
+    """Batas waktu terakhir yang sudah diproses oleh rollup harian (per nama rollup)"""
+    name = models.CharField(max_length=50, unique=True)
+    value = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+class MedicineUsageDaily(models.Model):
+    """Resep per obat per hari (tanggal resep): jumlah ditulis dan pemakaian dari yang sudah diserahkan"""
+    medicine = models.ForeignKey(Medicine, on_delete=models.CASCADE, related_name='usage_daily')
+    date = models.DateField()
+    prescribed = models.PositiveIntegerField(default=0)
+    # Hanya resep yang sudah diserahkan
+    quantity = models.PositiveIntegerField(default=0)
+    prescriptions = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['medicine', 'date'], name='unique_medicine_usage_day'),
+        ]
+        indexes = [
+            models.Index(fields=['date'], name='usage_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.medicine_id} {self.date}: {self.quantity}"
+
+class RevenueDaily(models.Model):
+    """Tagihan per hari (tanggal dibuat) per metode dan status pembayaran"""
+    date = models.DateField()
+    method = models.CharField(max_length=50, choices=Payment.PAYMENT_METHOD_CHOICES)
+    status = models.CharField(max_length=20, choices=Payment.STATUS_CHOICES)
+    payments = models.PositiveIntegerField(default=0)
+    amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    paid_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'method', 'status'], name='unique_revenue_day'),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.method}/{self.status}: {self.amount}"
+
+class VisitDaily(models.Model):
+    """Kunjungan (rekam medis) per dokter per hari pemeriksaan"""
+    doctor = models.ForeignKey(Doctor, on_delete=models.CASCADE, related_name='visits_daily')
+    date = models.DateField()
+    visits = models.PositiveIntegerField(default=0)
+    completed = models.PositiveIntegerField(default=0)
+    cancelled = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['doctor', 'date'], name='unique_visit_day'),
+        ]
+        indexes = [
+            models.Index(fields=['date'], name='visit_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.doctor_id} {self.date}: {self.visits}"
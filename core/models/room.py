@@ -13,6 +13,17 @@ class Room(models.Model):
     room_type = models.CharField(max_length=20, choices=ROOM_TYPE_CHOICES)
     capacity = models.PositiveIntegerField()
     daily_rate = models.DecimalField(max_digits=10, decimal_places=2)
+    # Jumlah tempat tidur terpakai, dijaga oleh signal Inpatient (lihat core.services.occupancy)
+    occupied_beds = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['room_type'], name='room_type_idx'),
+        ]
+
+    @property
+    def free_beds(self):
+        return max(self.capacity - self.occupied_beds, 0)
 
     def __str__(self):
         return self.name
\ No newline at end of file
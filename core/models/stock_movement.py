@@ -0,0 +1,33 @@
+from django.db import models
+from django.utils import timezone
+from .medicine import Medicine
+from .medicine_lot import MedicineLot
+from .prescription import Prescription
+
+class StockMovement(models.Model):
+    """Satu baris buku stok obat; Medicine.stock selalu sama dengan jumlah quantity semua baris"""
+    KIND_CHOICES = [
+        ('receipt', 'Penerimaan'),
+        ('dispense', 'Pengeluaran Resep'),
+        ('adjustment', 'Penyesuaian'),
+    ]
+
+    medicine = models.ForeignKey(Medicine, on_delete=models.CASCADE, related_name='movements')
+    lot = models.ForeignKey(MedicineLot, on_delete=models.SET_NULL, null=True, blank=True, related_name='movements')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    # Positif = stok masuk, negatif = stok keluar
+    quantity = models.IntegerField()
+    prescription = models.ForeignKey(
+        Prescription, on_delete=models.SET_NULL, null=True, blank=True, related_name='movements'
+    )
+    note = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['medicine', 'created_at'], name='movement_medicine_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.medicine_id}: {self.quantity:+d}"
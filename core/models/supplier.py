@@ -5,6 +5,8 @@ class Supplier(models.Model):
     address = models.TextField()
     phone = models.CharField(max_length=20)
     email = models.EmailField()
+    # Rata-rata hari dari pemesanan sampai obat diterima (dipakai forecast reorder point)
+    lead_time_days = models.PositiveIntegerField(default=7)
 
     def __str__(self):
         return self.name
\ No newline at end of file
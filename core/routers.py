@@ -0,0 +1,71 @@
+"""
+Routing database primary/replica: tulis ke primary, baca ke replica di dalam use_replica().
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class RoutingState:
+    def __init__(self, read_from_replica):
+        self.read_from_replica = read_from_replica
+        self.wrote = False
+
+
+_state = ContextVar('db_routing_state', default=None)
+
+
+@contextmanager
+def _routing(read_from_replica):
+    state = RoutingState(read_from_replica)
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+def use_replica():
+    """Baca dari replica di dalam blok ini (penulisan tetap ke primary)"""
+    return _routing(read_from_replica=True)
+
+
+def use_primary():
+    """Paksa semua baca di dalam blok ini ke primary"""
+    return _routing(read_from_replica=False)
+
+
+def replica_aliases():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        replicas = replica_aliases()
+        if (
+            state is None
+            or not state.read_from_replica
+            or not replicas
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            # Read-after-write: sisa request/command membaca dari primary
+            state.read_from_replica = False
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
@@ -0,0 +1,4 @@
+"""
+Service layer untuk app core.
+Berisi logika domain yang dipakai bersama oleh views di accounts dan hospital.
+"""
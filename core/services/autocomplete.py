@@ -0,0 +1,153 @@
+"""
+Autocomplete dokter dan pasien untuk kolom pencarian.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+
+from django.conf import settings
+
+from core.services.patient_search import search_patients, tokenize
+from core.services.roster import get_doctor_roster, get_roster_version
+
+
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 20
+AUTOCOMPLETE_CACHE_SIZE = getattr(settings, 'AUTOCOMPLETE_CACHE_SIZE', 1024)
+AUTOCOMPLETE_CACHE_TTL = getattr(settings, 'AUTOCOMPLETE_CACHE_TTL', 60)
+PATIENT_AUTOCOMPLETE_MIN_LENGTH = 2
+
+
+class LRUCache:
+    """LRU sederhana dengan batas umur entri, aman dipakai antar thread"""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_results = LRUCache(AUTOCOMPLETE_CACHE_SIZE, AUTOCOMPLETE_CACHE_TTL)
+
+
+class DoctorPrefixIndex:
+    """Daftar token terurut untuk pencarian awalan dengan bisect"""
+
+    def __init__(self, doctors):
+        self.doctors = {doctor['id']: doctor for doctor in doctors}
+        pairs = sorted(
+            (token, doctor['id'])
+            for doctor in doctors
+            for token in tokenize(f"{doctor['name']} {doctor['specialty']} {doctor['unit']}")
+        )
+        self.tokens = [token for token, _ in pairs]
+        self.doctor_ids = [doctor_id for _, doctor_id in pairs]
+
+    def _prefix_matches(self, term):
+        matches = {}
+        position = bisect_left(self.tokens, term)
+        while position < len(self.tokens) and self.tokens[position].startswith(term):
+            doctor_id = self.doctor_ids[position]
+            matches[doctor_id] = max(matches.get(doctor_id, 0), 2 if self.tokens[position] == term else 1)
+            position += 1
+        return matches
+
+    def search(self, terms, limit):
+        scores = dict.fromkeys(self.doctors, 0)
+        for term in terms:
+            matches = self._prefix_matches(term)
+            scores = {doctor_id: score + matches[doctor_id] for doctor_id, score in scores.items() if doctor_id in matches}
+        ranked = sorted(
+            scores,
+            key=lambda doctor_id: (
+                -scores[doctor_id],
+                not self.doctors[doctor_id]['is_available'],
+                self.doctors[doctor_id]['name'],
+            ),
+        )
+        return [self.doctors[doctor_id] for doctor_id in ranked[:limit]]
+
+
+_doctor_index = {'version': None, 'index': None}
+_doctor_index_lock = threading.Lock()
+
+
+def _get_doctor_index(version):
+    with _doctor_index_lock:
+        if _doctor_index['version'] != version:
+            _doctor_index.update(version=version, index=DoctorPrefixIndex(get_doctor_roster()))
+        return _doctor_index['index']
+
+
+def _clamp_limit(limit):
+    try:
+        limit = int(limit or AUTOCOMPLETE_LIMIT)
+    except (TypeError, ValueError):
+        limit = AUTOCOMPLETE_LIMIT
+    return max(1, min(limit, AUTOCOMPLETE_MAX_LIMIT))
+
+
+def autocomplete_doctors(query, limit=AUTOCOMPLETE_LIMIT):
+    """
+    Dokter yang cocok dengan awalan kata pada nama, spesialis atau unit
+
+    Returns:
+        List dict entri roster (id, name, specialty, unit, is_available, available_days)
+    """
+    limit = _clamp_limit(limit)
+    terms = tuple(tokenize(query))
+    version = get_roster_version()
+    key = ('doctor', version, terms, limit)
+    results = _results.get(key)
+    if results is None:
+        results = _get_doctor_index(version).search(terms, limit)
+        _results.set(key, results)
+    return results
+
+
+def autocomplete_patients(query, limit=AUTOCOMPLETE_LIMIT):
+    """
+    Pasien yang cocok dengan nama, telepon atau nomor BPJS (minimal 2 karakter)
+
+    Returns:
+        List dict (id, name, phone, date_of_birth)
+    """
+    limit = _clamp_limit(limit)
+    query = (query or '').strip().lower()
+    if len(query) < PATIENT_AUTOCOMPLETE_MIN_LENGTH:
+        return []
+    key = ('patient', query, limit)
+    results = _results.get(key)
+    if results is None:
+        results = [
+            {**row, 'date_of_birth': row['date_of_birth'].isoformat()}
+            for row in search_patients(query).values('id', 'name', 'phone', 'date_of_birth')[:limit]
+        ]
+        _results.set(key, results)
+    return results
@@ -0,0 +1,135 @@
+"""
+Snapshot saldo tagihan per pasien, diperbarui setiap Payment berubah.
+"""
+
+from decimal import Decimal
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import DecimalField, F, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.models import PatientBalance, Payment
+
+
+ZERO = Decimal('0')
+BALANCE_FIELDS = ['total_amount', 'total_paid', 'overdue_amount', 'updated_at']
+UPSERT_BATCH = 1000
+
+
+def payment_contribution(amount, paid_amount, status):
+    """Kontribusi satu Payment ke (total_amount, total_paid, overdue_amount)"""
+    overdue = amount - paid_amount if status == 'overdue' else ZERO
+    return amount, paid_amount, overdue
+
+
+def apply_balance_delta(patient_id, total_delta, paid_delta, overdue_delta):
+    """Tambahkan selisih ke snapshot pasien; bangun ulang jika snapshot belum ada"""
+    if not patient_id or not any((total_delta, paid_delta, overdue_delta)):
+        return
+    updated = PatientBalance.objects.filter(patient_id=patient_id).update(
+        total_amount=F('total_amount') + total_delta,
+        total_paid=F('total_paid') + paid_delta,
+        overdue_amount=F('overdue_amount') + overdue_delta,
+        updated_at=timezone.now(),
+    )
+    if not updated:
+        refresh_patient_balances([patient_id])
+
+
+def _balance_aggregates():
+    money = DecimalField(max_digits=14, decimal_places=2)
+    zero = Value(ZERO, output_field=money)
+    return {
+        'sum_amount': Coalesce(Sum('amount'), zero, output_field=money),
+        'sum_paid': Coalesce(Sum('paid_amount'), zero, output_field=money),
+        'sum_overdue': Coalesce(
+            Sum(F('amount') - F('paid_amount'), filter=Q(status='overdue')), zero, output_field=money
+        ),
+    }
+
+
+def compute_patient_balances(patient_ids=None):
+    """
+    Hitung saldo langsung dari tabel Payment dengan satu query GROUP BY
+
+    Returns:
+        Dictionary {patient_id: (total_amount, total_paid, overdue_amount)}
+    """
+    payments = Payment.objects.filter(patient__isnull=False)
+    if patient_ids is not None:
+        payments = payments.filter(patient_id__in=patient_ids)
+    rows = payments.order_by().values('patient_id').annotate(**_balance_aggregates())
+    return {
+        row['patient_id']: (row['sum_amount'], row['sum_paid'], row['sum_overdue'])
+        for row in rows
+    }
+
+
+def refresh_patient_balances(patient_ids=None):
+    """Bangun ulang snapshot saldo (semua pasien jika patient_ids None)"""
+    computed = compute_patient_balances(patient_ids)
+    if patient_ids is not None:
+        for patient_id in patient_ids:
+            computed.setdefault(patient_id, (ZERO, ZERO, ZERO))
+
+    now = timezone.now()
+    balances = [
+        PatientBalance(
+            patient_id=patient_id,
+            total_amount=total,
+            total_paid=paid,
+            overdue_amount=overdue,
+            updated_at=now,
+        )
+        for patient_id, (total, paid, overdue) in computed.items()
+    ]
+    if connection.features.supports_update_conflicts_with_target:
+        # PostgreSQL/SQLite: INSERT ... ON CONFLICT (patient_id) DO UPDATE
+        PatientBalance.objects.bulk_create(
+            balances,
+            batch_size=UPSERT_BATCH,
+            update_conflicts=True,
+            unique_fields=['patient'],
+            update_fields=BALANCE_FIELDS,
+        )
+    else:
+        for start in range(0, len(balances), UPSERT_BATCH):
+            _update_then_insert(balances[start:start + UPSERT_BATCH])
+    return computed
+
+
+def _update_then_insert(balances, attempts=3):
+    """
+    Upsert tanpa target konflik (MySQL): update snapshot yang sudah ada, lalu insert yang belum
+
+    Jika writer lain menyisipkan snapshot pasien yang sama di antara keduanya, insert gagal
+    karena unique patient_id dan seluruh batch diulang (baris itu kini ikut di-update)
+    """
+    for attempt in range(attempts):
+        existing = dict(
+            PatientBalance.objects.filter(patient_id__in=[balance.patient_id for balance in balances])
+            .values_list('patient_id', 'pk')
+        )
+        for balance in balances:
+            balance.pk = existing.get(balance.patient_id)
+        PatientBalance.objects.bulk_update(
+            [balance for balance in balances if balance.pk], BALANCE_FIELDS, batch_size=UPSERT_BATCH
+        )
+        missing = [balance for balance in balances if not balance.pk]
+        try:
+            with transaction.atomic():
+                PatientBalance.objects.bulk_create(missing, batch_size=UPSERT_BATCH)
+            return
+        except IntegrityError:
+            if attempt == attempts - 1:
+                raise
+
+
+def get_patient_balance(patient):
+    """Ambil snapshot saldo pasien, bangun dari Payment jika belum ada"""
+    balance = PatientBalance.objects.filter(patient=patient).first()
+    if balance is None:
+        refresh_patient_balances([patient.pk])
+        balance = PatientBalance.objects.get(patient=patient)
+    return balance
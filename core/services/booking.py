@@ -0,0 +1,67 @@
+"""
+Booking appointment: klaim baris Schedule lebih dulu, baru buat rekam medis.
+"""
+
+from django.db import IntegrityError, transaction
+
+from core.models import MedicalRecord, Schedule
+
+
+class SlotUnavailableError(Exception):
+    """Slot dokter sudah dipesan pasien lain atau tidak tersedia"""
+
+
+def _slot_filter(doctor_id, examination_date, examination_time):
+    return {
+        'doctor_id': doctor_id,
+        'examination_date': examination_date,
+        'examination_time': examination_time,
+    }
+
+
+def claim_slot(doctor, examination_date, examination_time):
+    """
+    Ambil slot dokter: UPDATE bersyarat baris yang tersedia atau INSERT baris unik baru
+
+    Raises:
+        SlotUnavailableError: jika slot sudah diambil atau ditutup
+    """
+    slot = _slot_filter(doctor.pk, examination_date, examination_time)
+    with transaction.atomic():
+        # UPDATE bersyarat mengunci baris; pemenang mengubah status, yang kalah dapat 0 baris
+        claimed = Schedule.objects.filter(status='available', **slot).update(status='booked')
+        if not claimed:
+            try:
+                with transaction.atomic():
+                    Schedule.objects.create(status='booked', **slot)
+            except IntegrityError:
+                raise SlotUnavailableError(
+                    f"Dokter {doctor.name} tidak tersedia pada waktu tersebut. Silahkan pilih waktu lain."
+                )
+
+
+def reserve_appointment(patient, doctor, examination_date, examination_time, notes=''):
+    """
+    Pesan slot dokter secara atomik dan buat rekam medis berstatus pending
+
+    Raises:
+        SlotUnavailableError: jika slot sudah diambil atau ditutup
+    """
+    with transaction.atomic():
+        claim_slot(doctor, examination_date, examination_time)
+        return MedicalRecord.objects.create(
+            patient=patient,
+            doctor=doctor,
+            examination_date=examination_date,
+            examination_time=examination_time,
+            notes=notes,
+            status='pending',
+        )
+
+
+def release_appointment(record):
+    """Kembalikan slot yang dipakai appointment (ditolak, dibatalkan, atau dihapus)"""
+    if not record.examination_time:
+        return 0
+    slot = _slot_filter(record.doctor_id, record.examination_date, record.examination_time)
+    return Schedule.objects.filter(status='booked', **slot).update(status='available')
@@ -0,0 +1,63 @@
+"""
+Counter dashboard yang dijaga signal dan bisa dibangun ulang dengan rebuild_counters.
+"""
+
+from django.db.models import F
+from django.utils import timezone
+
+from core.models import DashboardCounter, Doctor, Inpatient, Patient, Room
+from core.services.occupancy import rebuild_room_occupancy
+
+
+COUNTER_SOURCES = {
+    'patients': lambda: Patient.objects.count(),
+    'doctors': lambda: Doctor.objects.count(),
+    'active_inpatients': lambda: Inpatient.objects.filter(discharge_date__isnull=True).count(),
+    'rooms': lambda: Room.objects.count(),
+}
+
+
+def increment_counter(name, delta=1):
+    """Tambah/kurangi counter secara atomik di database"""
+    DashboardCounter.objects.filter(name=name).update(
+        value=F('value') + delta,
+        updated_at=timezone.now(),
+    )
+
+
+def get_dashboard_counters():
+    """Ambil semua counter dashboard dalam satu query"""
+    counters = dict(DashboardCounter.objects.values_list('name', 'value'))
+    for name, source in COUNTER_SOURCES.items():
+        if name not in counters:
+            # Counter belum pernah dibangun, hitung sekali lalu simpan
+            counter, _ = DashboardCounter.objects.get_or_create(
+                name=name, defaults={'value': source()}
+            )
+            counters[name] = counter.value
+    return counters
+
+
+def rebuild_counters(check_only=False):
+    """
+    Hitung ulang semua counter dari tabel sumber, termasuk occupied_beds ruangan
+
+    Stok obat tidak disentuh: rekonsiliasi dengan buku stok lewat reconcile_stock
+
+    Args:
+        check_only: Jika True, hanya laporkan selisih tanpa memperbaiki
+
+    Returns:
+        List of (name, stored_value, actual_value) untuk setiap counter dan
+        setiap ruangan yang counter-nya tidak sinkron
+    """
+    stored = dict(DashboardCounter.objects.values_list('name', 'value'))
+    report = []
+    for name, source in COUNTER_SOURCES.items():
+        actual = source()
+        report.append((name, stored.get(name), actual))
+        if not check_only and stored.get(name) != actual:
+            DashboardCounter.objects.update_or_create(name=name, defaults={'value': actual})
+    for room_name, stored_beds, actual_beds in rebuild_room_occupancy(check_only=check_only):
+        report.append((f'occupied_beds:{room_name}', stored_beds, actual_beds))
+    return report
@@ -0,0 +1,311 @@
+"""
+Dataset rumah sakit sintetis untuk benchmark.
+"""
+
+import random
+from datetime import date, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import (
+    Doctor, DoctorAvailability, Inpatient, MedicalRecord, Medicine, MedicineLot,
+    Patient, Payment, Prescription, Room, Schedule, StockMovement, Supplier,
+)
+from core.services.balances import refresh_patient_balances
+from core.services.counters import rebuild_counters
+from core.services.inpatient_billing import create_missing_stays
+from core.services.invoices import assign_invoice_numbers
+from core.services.patient_search import rebuild_search_index
+
+
+SCALES = {
+    'tiny': {
+        'suppliers': 5, 'medicines': 50, 'rooms': 20, 'doctors': 20, 'patients': 1000,
+        'records': 5000, 'prescriptions': 8000, 'payments': 4000, 'inpatients': 300,
+    },
+    'small': {
+        'suppliers': 20, 'medicines': 500, 'rooms': 200, 'doctors': 200, 'patients': 10000,
+        'records': 50000, 'prescriptions': 100000, 'payments': 40000, 'inpatients': 5000,
+    },
+    'large': {
+        'suppliers': 100, 'medicines': 5000, 'rooms': 2000, 'doctors': 2000, 'patients': 1000000,
+        'records': 3000000, 'prescriptions': 5000000, 'payments': 2000000, 'inpatients': 200000,
+    },
+}
+
+BENCH_PASSWORD = 'benchmark123'
+BENCH_USERS = ('bench_admin', 'bench_doctor', 'bench_patient')
+
+FIRST_NAMES = (
+    'Budi', 'Siti', 'Agus', 'Dewi', 'Rina', 'Andi', 'Putri', 'Joko', 'Ayu', 'Rudi',
+    'Sri', 'Bambang', 'Wulan', 'Hendra', 'Fitri', 'Eko', 'Indah', 'Dian', 'Yusuf', 'Nur',
+)
+LAST_NAMES = (
+    'Santoso', 'Wijaya', 'Saputra', 'Pratama', 'Lestari', 'Hidayat', 'Kurniawan', 'Sari',
+    'Nugroho', 'Setiawan', 'Rahmawati', 'Susanto', 'Utami', 'Gunawan', 'Permata', 'Siregar',
+)
+SPECIALTIES = (
+    ('Umum', 'Poliklinik Umum'), ('Anak', 'Poli Anak'), ('Penyakit Dalam', 'Poli Penyakit Dalam'),
+    ('Bedah', 'Poli Bedah'), ('Kandungan', 'Poli Kandungan'), ('Gigi', 'Poli Gigi'),
+    ('Mata', 'Poli Mata'), ('Saraf', 'Poli Saraf'), ('Jantung', 'Poli Jantung'),
+)
+DIAGNOSES = ('ISPA', 'Demam berdarah', 'Hipertensi', 'Diabetes melitus', 'Gastritis', 'Tifoid', 'Migrain')
+MEDICINES = ('Paracetamol', 'Amoxicillin', 'Omeprazole', 'Metformin', 'Amlodipine', 'Cetirizine', 'Ibuprofen')
+ROOM_RATES = {'VIP': 1500000, 'Kelas 1': 750000, 'Kelas 2': 500000, 'Kelas 3': 250000, 'ICU': 3000000}
+CONSULTATION_TIMES = [time(hour, minute) for hour in range(8, 17) for minute in (0, 30)]
+
+
+def _name(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def _birth_date(rng, min_age=1, max_age=85):
+    return date.today() - timedelta(days=rng.randint(min_age * 365, max_age * 365))
+
+
+def _bulk(model, rows, batch_size, progress):
+    """Tulis generator baris ke database per batch"""
+    batch = []
+    written = 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            model.objects.bulk_create(batch, batch_size=batch_size)
+            written += len(batch)
+            batch = []
+            progress(model.__name__, written)
+    if batch:
+        model.objects.bulk_create(batch, batch_size=batch_size)
+        written += len(batch)
+    progress(model.__name__, written)
+    return list(model.objects.order_by('id').values_list('id', flat=True))
+
+
+def generate_dataset(scale, batch_size=5000, seed=42, progress=None):
+    """
+    Buat data sintetis sesuai `scale` (dict jumlah per tabel, lihat SCALES)
+
+    Returns:
+        Dict jumlah baris yang dibuat per tabel
+    """
+    rng = random.Random(seed)
+    progress = progress or (lambda name, written: None)
+    today = timezone.localdate()
+
+    supplier_ids = _bulk(Supplier, (
+        Supplier(name=f"PT Farma {i + 1}", address='Jakarta', phone=f"021{i:07d}", email=f"supplier{i + 1}@example.com")
+        for i in range(scale['suppliers'])
+    ), batch_size, progress)
+
+    medicine_ids = _bulk(Medicine, (
+        Medicine(
+            name=f"{rng.choice(MEDICINES)} {rng.choice((250, 500, 1000))}mg #{i + 1}",
+            medicine_class=rng.choice(('Bebas', 'Bebas Terbatas', 'Keras')),
+            medicine_type=rng.choice(('Tablet', 'Kapsul', 'Sirup')),
+            expiry_date=today + timedelta(days=rng.randint(30, 1000)),
+            stock=rng.randint(0, 5000),
+            price=Decimal(rng.randint(1, 200) * 500),
+            supplier_id=rng.choice(supplier_ids) if supplier_ids else None,
+        )
+        for i in range(scale['medicines'])
+    ), batch_size, progress)
+
+    def lots():
+        # 1-3 lot per obat, lot pertama kedaluwarsa pada Medicine.expiry_date (terdekat)
+        for medicine_id, stock, expiry_date in Medicine.objects.filter(stock__gt=0).values_list('pk', 'stock', 'expiry_date').iterator():
+            count = min(rng.randint(1, 3), stock)
+            for i in range(count):
+                quantity = stock // count + (stock % count if i == 0 else 0)
+                yield MedicineLot(
+                    medicine_id=medicine_id,
+                    lot_number=f"L{medicine_id:05d}-{i + 1}",
+                    expiry_date=expiry_date + timedelta(days=180 * i),
+                    quantity=quantity,
+                )
+
+    _bulk(MedicineLot, lots(), batch_size, progress)
+
+    # Saldo awal buku stok agar stok obat dan lot sama dengan jumlah mutasinya
+    _bulk(StockMovement, (
+        StockMovement(medicine_id=medicine_id, lot_id=lot_id, kind='adjustment', quantity=quantity, note='Saldo awal')
+        for lot_id, medicine_id, quantity in MedicineLot.objects.values_list('pk', 'medicine_id', 'quantity').iterator()
+    ), batch_size, progress)
+
+    def rooms():
+        for i in range(scale['rooms']):
+            room_type = rng.choice(list(ROOM_RATES))
+            yield Room(
+                name=f"Ruang {i + 1}",
+                room_type=room_type,
+                capacity=rng.randint(1, 6),
+                daily_rate=Decimal(ROOM_RATES[room_type]),
+            )
+
+    room_ids = _bulk(Room, rooms(), batch_size, progress)
+
+    def doctors():
+        for i in range(scale['doctors']):
+            specialty, unit = rng.choice(SPECIALTIES)
+            yield Doctor(
+                name=f"dr. {_name(rng)}",
+                email=f"dokter{i + 1}@example.com",
+                date_of_birth=_birth_date(rng, 28, 65),
+                gender=rng.choice(('Laki-laki', 'Perempuan')),
+                specialty=specialty,
+                position=f"Dokter Spesialis {specialty}" if specialty != 'Umum' else 'Dokter Umum',
+                unit=unit,
+                monthly_salary=Decimal(rng.randint(10, 60) * 1000000),
+            )
+
+    doctor_ids = _bulk(Doctor, doctors(), batch_size, progress)
+
+    _bulk(DoctorAvailability, (
+        DoctorAvailability(doctor_id=doctor_id, day_of_week=day, start_time=time(8), end_time=time(16))
+        for doctor_id in doctor_ids
+        for day in range(5)
+    ), batch_size, progress)
+
+    patient_ids = _bulk(Patient, (
+        Patient(
+            name=_name(rng),
+            address='Jl. Merdeka No. %d' % rng.randint(1, 300),
+            phone=f"08{rng.randint(10 ** 9, 10 ** 10 - 1)}",
+            date_of_birth=_birth_date(rng),
+            gender=rng.choice(('Laki-laki', 'Perempuan')),
+            blood_type=rng.choice([choice for choice, _ in Patient.BLOOD_CHOICES]),
+            bpjs_status=rng.choice(('', 'Aktif', 'Tidak Aktif')),
+        )
+        for _ in range(scale['patients'])
+    ), batch_size, progress)
+
+    # Slot (dokter, tanggal, jam) unik: dokter tidak memeriksa dua pasien sekaligus
+    days = range(-365, 31)
+    if scale['records'] > len(doctor_ids) * len(days) * len(CONSULTATION_TIMES):
+        raise ValueError("Jumlah rekam medis melebihi jumlah slot jadwal dokter")
+
+    def records():
+        taken = set()
+        for _ in range(scale['records']):
+            while True:
+                doctor_id, day, slot = rng.choice(doctor_ids), rng.choice(days), rng.randrange(len(CONSULTATION_TIMES))
+                # Kunci slot sebagai satu integer agar set tetap kecil untuk jutaan rekam medis
+                key = (doctor_id * len(days) + day - days.start) * len(CONSULTATION_TIMES) + slot
+                if key not in taken:
+                    taken.add(key)
+                    break
+            examination_date = today + timedelta(days=day)
+            if examination_date < today:
+                status, confirmation, diagnosis = 'completed', 'approved', rng.choice(DIAGNOSES)
+            else:
+                status = rng.choice(('pending', 'confirmed'))
+                confirmation = 'approved' if status == 'confirmed' else 'pending'
+                diagnosis = None
+            yield MedicalRecord(
+                patient_id=rng.choice(patient_ids),
+                doctor_id=doctor_id,
+                examination_date=examination_date,
+                examination_time=CONSULTATION_TIMES[slot],
+                diagnosis=diagnosis,
+                status=status,
+                confirmation_status=confirmation,
+                notes='Keluhan: ' + rng.choice(('demam', 'batuk', 'pusing', 'nyeri perut', 'kontrol rutin')),
+            )
+
+    record_ids = _bulk(MedicalRecord, records(), batch_size, progress)
+
+    # Appointment aktif memegang slot jadwalnya, sama seperti lewat reserve_appointment()
+    _bulk(Schedule, (
+        Schedule(
+            doctor_id=doctor_id, examination_date=examination_date, examination_time=examination_time, status='booked',
+        )
+        for doctor_id, examination_date, examination_time in MedicalRecord.objects.filter(
+            status__in=('pending', 'confirmed'),
+        ).values_list('doctor_id', 'examination_date', 'examination_time').iterator()
+    ), batch_size, progress)
+
+    _bulk(Prescription, (
+        Prescription(
+            medical_record_id=rng.choice(record_ids),
+            medicine_id=rng.choice(medicine_ids),
+            prescription_date=today - timedelta(days=rng.randint(0, 365)),
+            dosage=rng.choice(('3x1', '2x1', '1x1')),
+            quantity=rng.choice((10, 15, 30)),
+            # Resep lama sudah diserahkan sebelum ada buku stok
+            dispensed_at=timezone.now(),
+        )
+        for _ in range(scale['prescriptions'] if record_ids and medicine_ids else 0)
+    ), batch_size, progress)
+
+    def payments():
+        batch = []
+        for _ in range(scale['payments']):
+            amount = Decimal(rng.randint(1, 100) * 50000)
+            status = rng.choices(('paid', 'pending', 'partial', 'overdue'), weights=(6, 2, 1, 1))[0]
+            paid = amount if status == 'paid' else (amount / 2 if status == 'partial' else Decimal(0))
+            batch.append(Payment(
+                patient_id=rng.choice(patient_ids),
+                service_name=rng.choice(('Konsultasi Medis', 'Rawat Inap', 'Laboratorium', 'Obat')),
+                amount=amount,
+                paid_amount=paid,
+                status=status,
+                method=rng.choice([choice for choice, _ in Payment.PAYMENT_METHOD_CHOICES]),
+                due_date=today + timedelta(days=rng.randint(-60, 30)),
+                created_at=timezone.now() - timedelta(days=rng.randint(0, 365)),
+            ))
+            if len(batch) >= batch_size:
+                yield from assign_invoice_numbers(batch)
+                batch = []
+        yield from assign_invoice_numbers(batch)
+
+    _bulk(Payment, payments(), batch_size, progress)
+
+    def inpatients():
+        for _ in range(scale['inpatients']):
+            admission = today - timedelta(days=rng.randint(0, 365))
+            discharge = None if rng.random() < 0.1 else admission + timedelta(days=rng.randint(1, 14))
+            discharge = discharge if discharge and discharge <= today else None
+            yield Inpatient(
+                patient_id=rng.choice(patient_ids),
+                room_id=rng.choice(room_ids),
+                admission_date=admission,
+                discharge_date=discharge,
+                diagnosis=rng.choice(DIAGNOSES),
+                cost=Decimal(rng.randint(1, 40) * 250000),
+                # Rawat inap yang sudah pulang dianggap sudah ditagih (tidak ikut accrual)
+                accrued_through=discharge,
+            )
+
+    _bulk(Inpatient, inpatients() if room_ids else iter(()), batch_size, progress)
+    create_missing_stays(batch_size)
+
+    create_bench_users(doctor_ids[0] if doctor_ids else None, patient_ids[0] if patient_ids else None)
+    rebuild_counters()
+    refresh_patient_balances()
+    rebuild_search_index(batch_size)
+
+    return {
+        name: model.objects.count()
+        for name, model in (
+            ('suppliers', Supplier), ('medicines', Medicine), ('rooms', Room), ('doctors', Doctor),
+            ('patients', Patient), ('records', MedicalRecord), ('prescriptions', Prescription),
+            ('payments', Payment), ('inpatients', Inpatient),
+        )
+    }
+
+
+@transaction.atomic
+def create_bench_users(doctor_id, patient_id):
+    """Buat/perbarui user bench_admin, bench_doctor dan bench_patient untuk benchmark_views"""
+    User = get_user_model()
+    profiles = {
+        'bench_admin': {'role': 'admin', 'is_staff': True},
+        'bench_doctor': {'role': 'doctor', 'doctor_profile_id': doctor_id},
+        'bench_patient': {'role': 'patient', 'patient_profile_id': patient_id},
+    }
+    for username, fields in profiles.items():
+        user, _ = User.objects.update_or_create(username=username, defaults=fields)
+        user.set_password(BENCH_PASSWORD)
+        user.save(update_fields=['password'])
@@ -0,0 +1,80 @@
+"""
+Ringkasan dashboard dokter dengan jumlah query tetap, di-cache per dokter.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count
+from django.utils import timezone
+
+from core.cache import get_or_compute, invalidate_tags
+from core.models import MedicalRecord, Prescription, Schedule
+
+
+SUMMARY_CACHE_TIMEOUT = getattr(settings, 'DOCTOR_SUMMARY_CACHE_TIMEOUT', 60)
+
+
+def _summary_key(doctor_id, today):
+    return f'doctor_summary:{doctor_id}:{today.isoformat()}'
+
+
+def _summary_tag(doctor_id):
+    return f'doctor_summary:{doctor_id}'
+
+
+def invalidate_doctor_summary(doctor_id):
+    """Tandai ringkasan dashboard dokter di cache sebagai usang"""
+    invalidate_tags(_summary_tag(doctor_id))
+
+
+def _build_summary(doctor, today):
+    records = MedicalRecord.objects.filter(doctor=doctor)
+
+    counts = records.aggregate(
+        total_records=Count('id'),
+        total_patients=Count('patient', distinct=True),
+    )
+
+    week_schedule = list(
+        Schedule.objects.filter(
+            doctor=doctor,
+            examination_date__range=[today, today + timedelta(days=7)],
+        ).order_by('examination_date', 'examination_time')
+    )
+
+    return {
+        **counts,
+        'week_schedule': week_schedule,
+        'today_schedule': [s for s in week_schedule if s.examination_date == today],
+        'recent_records': list(
+            records.select_related('patient').order_by('-examination_date')[:5]
+        ),
+        'recent_prescriptions': list(
+            Prescription.objects.filter(medical_record__doctor=doctor)
+            .select_related('medical_record__patient', 'medicine')
+            .order_by('-prescription_date')[:5]
+        ),
+        'pending_patients': list(
+            records.filter(diagnosis__isnull=False, treatment__isnull=True)
+            .select_related('patient')
+            .order_by('-examination_date')[:5]
+        ),
+    }
+
+
+def get_doctor_summary(doctor):
+    """
+    Ambil ringkasan dashboard dokter (ter-cache singkat per dokter)
+
+    Returns:
+        Dictionary berisi counter, jadwal minggu/hari ini, dan daftar terbaru
+    """
+    today = timezone.localdate()
+    summary = get_or_compute(
+        _summary_key(doctor.pk, today),
+        lambda: _build_summary(doctor, today),
+        SUMMARY_CACHE_TIMEOUT,
+        tags=[_summary_tag(doctor.pk)],
+    )
+    return {**summary, 'today': today}
@@ -0,0 +1,163 @@
+"""
+Ekspor CSV streaming per halaman keyset (pk).
+"""
+
+import csv
+from datetime import datetime, time, timedelta
+
+from django.db import models
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from core.models import Inpatient, MedicalRecord, Payment, Prescription
+
+
+EXPORT_CHUNK = 2000
+# Excel membaca CSV UTF-8 dengan benar jika ada BOM
+UTF8_BOM = '\ufeff'
+# Sel teks berawalan karakter ini dibaca spreadsheet sebagai formula (CSV injection)
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class Echo:
+    """Pseudo-buffer untuk csv.writer: writerow() mengembalikan baris, tidak menyimpannya"""
+
+    def write(self, value):
+        return value
+
+
+class Export:
+    """Definisi satu ekspor: model, kolom (header, field lookup) dan field tanggal untuk filter"""
+
+    def __init__(self, model, columns, date_field):
+        self.model = model
+        self.columns = columns
+        self.date_field = date_field
+
+    @property
+    def headers(self):
+        return [header for header, _ in self.columns]
+
+    @property
+    def fields(self):
+        return [field for _, field in self.columns]
+
+
+EXPORTS = {
+    'payments': Export(Payment, [
+        ('ID', 'pk'),
+        ('No. Invoice', 'invoice_number'),
+        ('Pasien', 'patient__name'),
+        ('Layanan', 'service_name'),
+        ('Tagihan', 'amount'),
+        ('Dibayar', 'paid_amount'),
+        ('Status', 'status'),
+        ('Metode', 'method'),
+        ('Dibuat', 'created_at'),
+        ('Jatuh Tempo', 'due_date'),
+        ('Tanggal Bayar', 'payment_date'),
+    ], 'created_at'),
+    'medical_records': Export(MedicalRecord, [
+        ('ID', 'pk'),
+        ('Pasien', 'patient__name'),
+        ('Dokter', 'doctor__name'),
+        ('Tanggal Periksa', 'examination_date'),
+        ('Jam', 'examination_time'),
+        ('Status', 'status'),
+        ('Diagnosis', 'diagnosis'),
+        ('Tindakan', 'treatment'),
+        ('No. Invoice', 'payment__invoice_number'),
+    ], 'examination_date'),
+    'prescriptions': Export(Prescription, [
+        ('ID', 'pk'),
+        ('Rekam Medis', 'medical_record_id'),
+        ('Pasien', 'medical_record__patient__name'),
+        ('Dokter', 'medical_record__doctor__name'),
+        ('Obat', 'medicine__name'),
+        ('Tanggal Resep', 'prescription_date'),
+        ('Dosis', 'dosage'),
+        ('Jumlah', 'quantity'),
+        ('Diserahkan', 'dispensed_at'),
+    ], 'prescription_date'),
+    'inpatients': Export(Inpatient, [
+        ('ID', 'pk'),
+        ('Pasien', 'patient__name'),
+        ('Ruangan', 'room__name'),
+        ('Tipe Ruangan', 'room__room_type'),
+        ('Tanggal Masuk', 'admission_date'),
+        ('Tanggal Pulang', 'discharge_date'),
+        ('Diagnosis', 'diagnosis'),
+        ('Biaya', 'cost'),
+        ('Ditagih Sampai', 'accrued_through'),
+        ('No. Invoice', 'payment__invoice_number'),
+    ], 'admission_date'),
+}
+
+
+def export_for_model(model):
+    """Nama dan definisi ekspor untuk sebuah model"""
+    for name, export in EXPORTS.items():
+        if export.model is model:
+            return name, export
+    raise KeyError(f"Tidak ada ekspor untuk {model.__name__}")
+
+
+def filter_dates(export, queryset, date_from=None, date_to=None):
+    """Batasi ekspor ke rentang tanggal (inklusif) pada field tanggal ekspor, tetap bisa memakai indeks"""
+    field = export.date_field
+    if isinstance(export.model._meta.get_field(field), models.DateTimeField):
+        # Rentang waktu lokal, bukan __date (fungsi di kolom tidak memakai indeks)
+        if date_from:
+            queryset = queryset.filter(**{f'{field}__gte': timezone.make_aware(datetime.combine(date_from, time.min))})
+        if date_to:
+            end = timezone.make_aware(datetime.combine(date_to + timedelta(days=1), time.min))
+            queryset = queryset.filter(**{f'{field}__lt': end})
+        return queryset
+    if date_from:
+        queryset = queryset.filter(**{f'{field}__gte': date_from})
+    if date_to:
+        queryset = queryset.filter(**{f'{field}__lte': date_to})
+    return queryset
+
+
+def _cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return timezone.localtime(value).strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        # Awali dengan ' agar Excel/LibreOffice menampilkannya sebagai teks
+        return "'" + value
+    return value
+
+
+def iter_rows(queryset, fields, chunk_size=EXPORT_CHUNK):
+    """Baris values_list per halaman keyset (pk > pk terakhir), memori tetap satu halaman"""
+    queryset = queryset.order_by('pk').values_list('pk', *fields)
+    last_pk = None
+    while True:
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        rows = list(page[:chunk_size])
+        for row in rows:
+            yield row[1:]
+        if len(rows) < chunk_size:
+            return
+        last_pk = rows[-1][0]
+
+
+def stream_csv(export, queryset=None, chunk_size=EXPORT_CHUNK, bom=True):
+    """Generator baris CSV (header lebih dulu) untuk ekspor `export`"""
+    writer = csv.writer(Echo())
+    header = writer.writerow(export.headers)
+    yield UTF8_BOM + header if bom else header
+    queryset = export.model.objects.all() if queryset is None else queryset
+    for row in iter_rows(queryset, export.fields, chunk_size):
+        yield writer.writerow([_cell(value) for value in row])
+
+
+def csv_response(queryset, chunk_size=EXPORT_CHUNK):
+    """StreamingHttpResponse CSV untuk queryset (misalnya dari action admin)"""
+    name, export = export_for_model(queryset.model)
+    response = StreamingHttpResponse(stream_csv(export, queryset, chunk_size), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{name}-{timezone.localdate():%Y%m%d}.csv"'
+    return response
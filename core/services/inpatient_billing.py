@@ -0,0 +1,238 @@
+"""
+Tagihan kamar rawat inap per segmen InpatientStay, dihitung di database.
+"""
+
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import (
+    Case, DecimalField, ExpressionWrapper, F, Func, IntegerField, OuterRef, Q, Subquery, Sum, Value, When,
+)
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from core.models import Inpatient, InpatientStay, Payment
+from core.services.balances import refresh_patient_balances
+from core.services.invoices import assign_invoice_numbers
+
+
+INPATIENT_SERVICE_NAME = 'Rawat Inap'
+MONEY = DecimalField(max_digits=14, decimal_places=2)
+
+
+class DaysBetween(Func):
+    """Selisih hari antara dua tanggal (end - start) sebagai integer di database"""
+    output_field = IntegerField()
+
+    def __init__(self, end, start, **extra):
+        super().__init__(end, start, **extra)
+
+    def as_sql(self, compiler, connection, **extra):
+        # PostgreSQL: date - date menghasilkan integer
+        return super().as_sql(compiler, connection, template='(%(expressions)s)', arg_joiner=' - ', **extra)
+
+    def as_mysql(self, compiler, connection, **extra):
+        return super().as_sql(compiler, connection, function='DATEDIFF', **extra)
+
+    def as_sqlite(self, compiler, connection, **extra):
+        end, end_params = compiler.compile(self.source_expressions[0])
+        start, start_params = compiler.compile(self.source_expressions[1])
+        return f'CAST(julianday({end}) - julianday({start}) AS INTEGER)', (*end_params, *start_params)
+
+
+def _stay_charge(as_of):
+    nights = Greatest(DaysBetween(Coalesce('end_date', Value(as_of)), 'start_date'), Value(0))
+    return ExpressionWrapper(nights * F('daily_rate'), output_field=MONEY)
+
+
+def inpatient_charge(as_of, **lookup):
+    """
+    Subquery total biaya kamar satu rawat inap
+
+    Contoh:
+        inpatient_charge(as_of, inpatient_id=OuterRef('pk'))          # dari Inpatient
+        inpatient_charge(as_of, inpatient__payment_id=OuterRef('pk'))  # dari Payment
+    """
+    total = (
+        InpatientStay.objects.filter(**lookup).order_by()
+        .values('inpatient_id').annotate(total=Sum(_stay_charge(as_of))).values('total')[:1]
+    )
+    return Coalesce(Subquery(total, output_field=MONEY), Value(Decimal('0')), output_field=MONEY)
+
+
+def unbilled_inpatients():
+    """Rawat inap yang masih aktif atau sudah pulang tapi tagihannya belum difinalisasi"""
+    return Inpatient.objects.filter(
+        Q(discharge_date__isnull=True)
+        | Q(accrued_through__isnull=True)
+        | Q(accrued_through__lt=F('discharge_date'))
+    )
+
+
+# ==================== SEGMEN RAWAT INAP ====================
+
+def _correct_stay_dates(inpatient, previous_admission_date, previous_discharge_date):
+    """
+    Geser tanggal segmen setelah tanggal masuk/pulang dikoreksi (misalnya lewat admin)
+
+    Returns:
+        True jika ada tanggal segmen yang digeser
+    """
+    stays = InpatientStay.objects.filter(inpatient=inpatient)
+    changed = False
+    admission_date, discharge_date = inpatient.admission_date, inpatient.discharge_date
+
+    if previous_admission_date is not None and previous_admission_date != admission_date:
+        # Segmen pertama mulai di tanggal masuk baru; segmen lain tidak boleh mulai sebelumnya
+        stays.filter(start_date__lt=admission_date).update(start_date=admission_date)
+        first = stays.order_by('start_date', 'id').values_list('pk', flat=True).first()
+        stays.filter(pk=first).update(start_date=admission_date)
+        changed = True
+
+    if None not in (previous_discharge_date, discharge_date) and previous_discharge_date != discharge_date:
+        # Segmen terakhir berakhir di tanggal pulang baru; segmen lain tidak boleh melewatinya
+        stays.filter(end_date__gt=discharge_date).update(end_date=discharge_date)
+        last = stays.order_by('-start_date', '-id').values_list('pk', flat=True).first()
+        stays.filter(pk=last).update(end_date=discharge_date)
+        changed = True
+    return changed
+
+
+def record_stay_change(inpatient, created, was_active, previous_room_id, change_date=None,
+                       previous_admission_date=None, previous_discharge_date=None):
+    """
+    Perbarui segmen InpatientStay setelah Inpatient disimpan (dipanggil dari signal)
+
+    Returns:
+        True jika rawat inap baru saja selesai (pulang) atau tanggal rawat inap yang sudah
+        selesai dikoreksi, dan tagihannya perlu difinalisasi (ulang)
+    """
+    is_active = inpatient.discharge_date is None
+    change_date = change_date or timezone.localdate()
+    open_stays = InpatientStay.objects.filter(inpatient=inpatient, end_date__isnull=True)
+
+    if created:
+        InpatientStay.objects.create(
+            inpatient=inpatient,
+            room_id=inpatient.room_id,
+            start_date=inpatient.admission_date,
+            end_date=inpatient.discharge_date,
+            daily_rate=inpatient.room.daily_rate,
+        )
+        return not is_active
+
+    if not was_active and not is_active:
+        return _correct_stay_dates(inpatient, previous_admission_date, previous_discharge_date)
+
+    _correct_stay_dates(inpatient, previous_admission_date, None)
+    if was_active and not is_active:
+        open_stays.update(end_date=inpatient.discharge_date)
+        return True
+
+    if is_active and (not was_active or previous_room_id != inpatient.room_id):
+        # Pindah ruangan (atau dibuka kembali): tutup segmen lama, buka segmen di ruangan baru
+        open_stays.update(end_date=change_date)
+        InpatientStay.objects.create(
+            inpatient=inpatient,
+            room_id=inpatient.room_id,
+            start_date=change_date,
+            daily_rate=inpatient.room.daily_rate,
+        )
+    return False
+
+
+def create_missing_stays(batch_size=5000):
+    """Buat segmen untuk rawat inap tanpa segmen (misalnya hasil bulk_create tanpa signal)"""
+    missing = (
+        Inpatient.objects.filter(stays__isnull=True)
+        .values_list('pk', 'room_id', 'admission_date', 'discharge_date', 'room__daily_rate')
+    )
+    created = 0
+    batch = list(missing[:batch_size])
+    while batch:
+        InpatientStay.objects.bulk_create([
+            InpatientStay(
+                inpatient_id=pk, room_id=room_id, start_date=admission_date,
+                end_date=discharge_date, daily_rate=daily_rate,
+            )
+            for pk, room_id, admission_date, discharge_date, daily_rate in batch
+        ])
+        created += len(batch)
+        batch = list(missing[:batch_size])
+    return created
+
+
+# ==================== ACCRUAL ====================
+
+def _create_missing_payments(targets, batch_size):
+    """Buat Payment rawat inap untuk target yang belum punya, per batch dengan bulk_create"""
+    created = 0
+    missing = targets.filter(payment__isnull=True).order_by('pk').values_list('pk', 'patient_id')
+    batch = list(missing[:batch_size])
+    while batch:
+        payments = assign_invoice_numbers([
+            Payment(patient_id=patient_id, service_name=INPATIENT_SERVICE_NAME, amount=0, status='pending')
+            for _, patient_id in batch
+        ])
+        Payment.objects.bulk_create(payments, batch_size=batch_size)
+
+        # MySQL tidak mengembalikan id dari bulk_create; baca ulang lewat nomor invoice
+        inpatient_by_invoice = {payment.invoice_number: pk for payment, (pk, _) in zip(payments, batch)}
+        Inpatient.objects.bulk_update(
+            [
+                Inpatient(pk=inpatient_by_invoice[invoice_number], payment_id=payment_id)
+                for invoice_number, payment_id in Payment.objects.filter(
+                    invoice_number__in=list(inpatient_by_invoice)
+                ).values_list('invoice_number', 'pk')
+            ],
+            ['payment'],
+            batch_size=batch_size,
+        )
+        created += len(batch)
+        batch = list(missing[:batch_size])
+    return created
+
+
+def accrue_inpatient_charges(as_of=None, inpatients=None, batch_size=1000):
+    """
+    Tagih biaya kamar rawat inap secara set-based sampai tanggal `as_of`
+
+    Args:
+        as_of: Tanggal accrual (default hari ini); rawat inap aktif ditagih sampai malam sebelumnya
+        inpatients: Queryset target (default semua rawat inap yang belum difinalisasi)
+
+    Returns:
+        Dict {'inpatients': jumlah ditagih, 'payments_created': Payment baru}
+    """
+    as_of = as_of or timezone.localdate()
+    targets = (unbilled_inpatients() if inpatients is None else inpatients).filter(admission_date__lte=as_of)
+
+    with transaction.atomic():
+        patient_ids = list(targets.order_by().values_list('patient_id', flat=True).distinct())
+        if not patient_ids:
+            return {'inpatients': 0, 'payments_created': 0}
+        payments_created = _create_missing_payments(targets, batch_size)
+
+        # Payment dulu: update Inpatient di bawah mengubah siapa yang termasuk target
+        charge = inpatient_charge(as_of, inpatient__payment_id=OuterRef('pk'))
+        Payment.objects.filter(pk__in=targets.values('payment_id')).update(
+            amount=charge,
+            # Tagihan lunas yang bertambah malam ini menjadi pembayaran sebagian
+            status=Case(When(status='paid', paid_amount__lt=charge, then=Value('partial')), default=F('status')),
+            updated_at=timezone.now(),
+        )
+        billed = targets.update(
+            cost=inpatient_charge(as_of, inpatient_id=OuterRef('pk')),
+            accrued_through=Coalesce('discharge_date', Value(as_of)),
+        )
+        refresh_patient_balances(patient_ids)
+
+    return {'inpatients': billed, 'payments_created': payments_created}
+
+
+def finalize_inpatient_charges(inpatient):
+    """Finalisasi tagihan saat pasien pulang (segmen terakhir sudah ditutup)"""
+    return accrue_inpatient_charges(
+        as_of=inpatient.discharge_date,
+        inpatients=Inpatient.objects.filter(pk=inpatient.pk),
+    )
@@ -0,0 +1,129 @@
+"""
+Nomor invoice dari InvoiceSequence per tahun, dialokasikan per blok.
+"""
+
+from threading import local
+
+from django.db import DatabaseError, IntegrityError, connections, router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.models import InvoiceSequence
+
+
+INVOICE_PREFIX = 'INV'
+
+_own_connections = local()
+
+
+def _sequence_name(year):
+    return f"{INVOICE_PREFIX}-{year}"
+
+
+def format_invoice_number(year, value):
+    return f"{INVOICE_PREFIX}-{year}-{value:08d}"
+
+
+def _own_connection(alias):
+    """Koneksi kedua per thread untuk mengalokasikan blok di luar transaksi pemanggil"""
+    own = getattr(_own_connections, alias, None)
+    if own is None:
+        own = connections.create_connection(alias)
+        setattr(_own_connections, alias, own)
+    return own
+
+
+def _reserve_on_own_connection(own, name, count):
+    """UPDATE (atau INSERT baris tahun baru) dan baca nomor terakhir dalam transaksi sendiri"""
+    quote = own.ops.quote_name
+    table = quote(InvoiceSequence._meta.db_table)
+    now = own.ops.adapt_datetimefield_value(timezone.now())
+    for attempt in range(2):
+        own.set_autocommit(False)
+        try:
+            with own.cursor() as cursor:
+                cursor.execute(
+                    f"UPDATE {table} SET {quote('last_value')} = {quote('last_value')} + %s, "
+                    f"{quote('updated_at')} = %s WHERE {quote('name')} = %s",
+                    [count, now, name],
+                )
+                if not cursor.rowcount:
+                    cursor.execute(
+                        f"INSERT INTO {table} ({quote('name')}, {quote('last_value')}, {quote('updated_at')}) "
+                        f"VALUES (%s, %s, %s)",
+                        [name, count, now],
+                    )
+                cursor.execute(f"SELECT {quote('last_value')} FROM {table} WHERE {quote('name')} = %s", [name])
+                last = cursor.fetchone()[0]
+            own.commit()
+            return last
+        except IntegrityError:
+            # Baris tahun ini baru saja dibuat oleh proses lain: ulangi sebagai UPDATE
+            own.rollback()
+            if attempt:
+                raise
+        except DatabaseError:
+            own.rollback()
+            raise
+        finally:
+            own.set_autocommit(True)
+            own.close_if_unusable_or_obsolete()
+
+
+def reserve_invoice_block(count, year=None):
+    """
+    Pesan `count` nomor urut berturut-turut dalam transaksi pendek yang langsung di-commit
+
+    Returns:
+        Tuple (tahun, nomor pertama, nomor terakhir)
+    """
+    if count < 1:
+        raise ValueError('count harus >= 1')
+    year = year or timezone.localdate().year
+    name = _sequence_name(year)
+    alias = router.db_for_write(InvoiceSequence)
+    connection = connections[alias]
+
+    if connection.in_atomic_block and connection.features.has_select_for_update:
+        # Kunci baris sequence di transaksi pemanggil baru lepas saat commit-nya (misalnya
+        # setelah seluruh accrual rawat inap); SQLite tidak punya kunci baris, tetap di sini
+        last = _reserve_on_own_connection(_own_connection(alias), name, count)
+        return year, last - count + 1, last
+
+    sequences = InvoiceSequence.objects.using(alias).filter(name=name)
+    with transaction.atomic(using=alias):
+        if not sequences.update(last_value=F('last_value') + count, updated_at=timezone.now()):
+            try:
+                with transaction.atomic(using=alias):
+                    InvoiceSequence.objects.using(alias).create(name=name, last_value=count)
+                return year, 1, count
+            except IntegrityError:
+                # Baris tahun ini baru saja dibuat oleh proses lain
+                sequences.update(last_value=F('last_value') + count, updated_at=timezone.now())
+        last = sequences.values_list('last_value', flat=True).get()
+    return year, last - count + 1, last
+
+
+def allocate_invoice_numbers(count, year=None):
+    """Alokasikan `count` nomor invoice unik dalam satu blok"""
+    year, first, last = reserve_invoice_block(count, year)
+    return [format_invoice_number(year, value) for value in range(first, last + 1)]
+
+
+def next_invoice_number():
+    """Satu nomor invoice untuk Payment.save"""
+    return allocate_invoice_numbers(1)[0]
+
+
+def assign_invoice_numbers(payments):
+    """
+    Isi invoice_number yang kosong sebelum bulk_create (save() tidak dipanggil)
+
+    Contoh:
+        Payment.objects.bulk_create(assign_invoice_numbers(payments))
+    """
+    missing = [payment for payment in payments if not payment.invoice_number]
+    if missing:
+        for payment, number in zip(missing, allocate_invoice_numbers(len(missing))):
+            payment.invoice_number = number
+    return payments
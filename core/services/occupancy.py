@@ -0,0 +1,178 @@
+"""
+Okupansi ruangan: penerimaan, pindah ruangan dan timeline tempat tidur terpakai.
+"""
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+
+from core.models import Inpatient, Room
+
+
+class RoomFullError(Exception):
+    """Semua tempat tidur di ruangan sudah terisi"""
+
+
+def adjust_occupancy(room_id, delta):
+    """Tambah/kurangi jumlah tempat tidur terpakai secara atomik di database"""
+    if not room_id or not delta:
+        return
+    rooms = Room.objects.filter(pk=room_id)
+    if delta < 0:
+        rooms = rooms.filter(occupied_beds__gte=-delta)
+    rooms.update(occupied_beds=F('occupied_beds') + delta)
+
+
+def admit_patient(patient, room, admission_date, diagnosis, cost=0):
+    """
+    Rawat inap pasien di ruangan jika masih ada tempat tidur kosong
+
+    Raises:
+        RoomFullError: jika kapasitas ruangan sudah penuh
+    """
+    with transaction.atomic():
+        locked = Room.objects.select_for_update().only('capacity', 'occupied_beds').get(pk=room.pk)
+        if locked.occupied_beds >= locked.capacity:
+            raise RoomFullError(f"Ruangan {room.name} penuh. Silahkan pilih ruangan lain.")
+        # Signal post_save Inpatient menambah occupied_beds di transaksi yang sama
+        return Inpatient.objects.create(
+            patient=patient,
+            room=room,
+            admission_date=admission_date,
+            diagnosis=diagnosis,
+            cost=cost,
+        )
+
+
+def transfer_patient(inpatient, room, transfer_date=None):
+    """
+    Pindahkan pasien rawat inap ke ruangan lain (segmen tagihan baru mulai transfer_date)
+
+    Raises:
+        RoomFullError: jika ruangan tujuan sudah penuh
+    """
+    with transaction.atomic():
+        locked = Room.objects.select_for_update().only('capacity', 'occupied_beds').get(pk=room.pk)
+        if locked.occupied_beds >= locked.capacity:
+            raise RoomFullError(f"Ruangan {room.name} penuh. Silahkan pilih ruangan lain.")
+        inpatient.room = room
+        inpatient._transfer_date = transfer_date
+        inpatient.save(update_fields=['room'])
+    return inpatient
+
+
+def discharge_patient(inpatient, discharge_date):
+    """Pulangkan pasien rawat inap (tempat tidur dibebaskan dan tagihan difinalisasi oleh signal)"""
+    inpatient.discharge_date = discharge_date
+    inpatient.save(update_fields=['discharge_date'])
+    return inpatient
+
+
+def free_beds_by_room_type():
+    """
+    Kapasitas, tempat tidur terpakai dan kosong per tipe ruangan (satu query ke tabel Room)
+
+    Returns:
+        Dictionary {room_type: {'capacity', 'occupied', 'free'}}
+    """
+    rows = Room.objects.order_by().values('room_type').annotate(
+        capacity_total=Sum('capacity'),
+        occupied_total=Sum('occupied_beds'),
+    )
+    return {
+        row['room_type']: {
+            'capacity': row['capacity_total'],
+            'occupied': row['occupied_total'],
+            'free': max(row['capacity_total'] - row['occupied_total'], 0),
+        }
+        for row in rows
+    }
+
+
+def rooms_with_free_beds(room_type=None):
+    """Ruangan yang masih punya tempat tidur kosong, paling lega lebih dulu"""
+    rooms = Room.objects.filter(occupied_beds__lt=F('capacity'))
+    if room_type:
+        rooms = rooms.filter(room_type=room_type)
+    return rooms.annotate(free=F('capacity') - F('occupied_beds')).order_by('-free', 'name')
+
+
+def occupancy_timeline(start_date, end_date, room_type=None, room_id=None):
+    """
+    Jumlah tempat tidur terpakai per hari untuk rentang tanggal (inklusif)
+
+    Dihitung mundur dari counter saat ini dengan range scan pada indeks
+    admission_date/discharge_date, bukan dengan memindai seluruh riwayat rawat inap
+
+    Returns:
+        List of dict {'date', 'occupied', 'capacity', 'free'}
+    """
+    if end_date < start_date:
+        return []
+
+    rooms = Room.objects.all()
+    stays = Inpatient.objects.order_by()
+    if room_type:
+        rooms = rooms.filter(room_type=room_type)
+        stays = stays.filter(room__room_type=room_type)
+    if room_id:
+        rooms = rooms.filter(pk=room_id)
+        stays = stays.filter(room_id=room_id)
+
+    totals = rooms.aggregate(capacity=Sum('capacity'), occupied=Sum('occupied_beds'))
+    capacity = totals['capacity'] or 0
+
+    # Terpakai di start_date = aktif sekarang - aktif yang masuk setelah start_date
+    #                          + yang masuk sebelumnya tapi pulang setelah start_date
+    admitted_later = Q(discharge_date__isnull=True, admission_date__gt=start_date)
+    left_later = Q(discharge_date__gt=start_date, admission_date__lte=start_date)
+    # Kondisi juga di WHERE agar memakai range scan indeks, bukan hanya di FILTER aggregate
+    correction = stays.filter(admitted_later | left_later).aggregate(
+        admitted_later=Count('id', filter=admitted_later),
+        left_later=Count('id', filter=left_later),
+    )
+    occupied = (totals['occupied'] or 0) - correction['admitted_later'] + correction['left_later']
+
+    admissions = dict(
+        stays.filter(admission_date__gt=start_date, admission_date__lte=end_date)
+        .values('admission_date').annotate(total=Count('id')).values_list('admission_date', 'total')
+    )
+    discharges = dict(
+        stays.filter(discharge_date__gt=start_date, discharge_date__lte=end_date)
+        .values('discharge_date').annotate(total=Count('id')).values_list('discharge_date', 'total')
+    )
+
+    timeline = []
+    day = start_date
+    while day <= end_date:
+        if day != start_date:
+            occupied += admissions.get(day, 0) - discharges.get(day, 0)
+        timeline.append({
+            'date': day,
+            'occupied': occupied,
+            'capacity': capacity,
+            'free': max(capacity - occupied, 0),
+        })
+        day += timedelta(days=1)
+    return timeline
+
+
+def rebuild_room_occupancy(check_only=False):
+    """
+    Hitung ulang occupied_beds semua ruangan dari rawat inap aktif
+
+    Returns:
+        List of (room_name, stored_value, actual_value) untuk ruangan yang tidak sinkron
+    """
+    actual = dict(
+        Inpatient.objects.filter(discharge_date__isnull=True).order_by()
+        .values('room_id').annotate(total=Count('id')).values_list('room_id', 'total')
+    )
+    drifted = []
+    for room_id, name, stored in Room.objects.values_list('pk', 'name', 'occupied_beds'):
+        if stored != actual.get(room_id, 0):
+            drifted.append((name, stored, actual.get(room_id, 0)))
+            if not check_only:
+                Room.objects.filter(pk=room_id).update(occupied_beds=actual.get(room_id, 0))
+    return drifted
@@ -0,0 +1,161 @@
+"""
+Pencarian pasien berdasarkan nama, nomor telepon dan nomor BPJS.
+"""
+
+import re
+from functools import reduce
+from operator import and_, or_
+
+from django.db import connection
+from django.db.models import Case, F, IntegerField, Max, OuterRef, Q, Subquery, Value, When
+
+from core.models import Patient, PatientSearchToken
+
+
+TOKEN_MAX_LENGTH = 50
+MAX_QUERY_TERMS = 5
+
+_WORD = re.compile(r'[a-z0-9]+')
+
+
+def use_trigram():
+    return connection.vendor == 'postgresql'
+
+
+def tokenize(text):
+    """Pecah teks menjadi token huruf kecil/angka (tanpa duplikat, urutan tetap)"""
+    return list(dict.fromkeys(word[:TOKEN_MAX_LENGTH] for word in _WORD.findall((text or '').lower())))
+
+
+def tokenize_patient(name, phone, bpjs):
+    """Token untuk satu pasien: kata-kata nama, nomor telepon (angka saja) dan nomor BPJS"""
+    tokens = tokenize(name) + tokenize(bpjs)
+    phone_digits = re.sub(r'\D', '', phone or '')
+    if phone_digits:
+        tokens.append(phone_digits[:TOKEN_MAX_LENGTH])
+    return list(dict.fromkeys(tokens))
+
+
+def index_patients(patients):
+    """Bangun ulang token untuk daftar pasien (dua query per batch)"""
+    if use_trigram():
+        return 0
+    patients = list(patients)
+    PatientSearchToken.objects.filter(patient__in=[patient.pk for patient in patients]).delete()
+    tokens = [
+        PatientSearchToken(patient_id=patient.pk, token=token)
+        for patient in patients
+        for token in tokenize_patient(patient.name, patient.phone, patient.bpjs_status)
+    ]
+    PatientSearchToken.objects.bulk_create(tokens, batch_size=5000)
+    return len(tokens)
+
+
+def rebuild_search_index(batch_size=5000, progress=None):
+    """Bangun ulang seluruh tabel token (dipakai setelah bulk import)"""
+    if use_trigram():
+        return 0
+    PatientSearchToken.objects.all().delete()
+    total = 0
+    batch = []
+    for patient in Patient.objects.only('name', 'phone', 'bpjs_status').order_by('pk').iterator(chunk_size=batch_size):
+        batch.append(patient)
+        if len(batch) >= batch_size:
+            total += index_patients(batch)
+            batch = []
+            if progress:
+                progress(total)
+    if batch:
+        total += index_patients(batch)
+    return total
+
+
+def _prefix_upper_bound(term):
+    """
+    Token terkecil yang lebih besar dari semua token berawalan `term`.
+    Token hanya berisi [0-9a-z] (angka diurutkan sebelum huruf di semua collation)
+    """
+    chars = list(term)
+    while chars:
+        last = chars.pop()
+        if last == '9':
+            return ''.join(chars) + 'a'
+        if last != 'z':
+            return ''.join(chars) + chr(ord(last) + 1)
+    return None
+
+
+def _prefix_range(term):
+    upper = _prefix_upper_bound(term)
+    return Q(token__gte=term, token__lt=upper) if upper else Q(token__gte=term)
+
+
+def _token_matches(terms):
+    """patient_id + skor untuk pasien yang cocok dengan semua term"""
+    per_term = {
+        f'term_{i}': Max(Case(
+            When(token=term, then=Value(2)),
+            When(_prefix_range(term), then=Value(1)),
+            default=Value(0),
+            output_field=IntegerField(),
+        ))
+        for i, term in enumerate(terms)
+    }
+    return (
+        PatientSearchToken.objects
+        .filter(reduce(or_, [_prefix_range(term) for term in terms]))
+        .values('patient_id')
+        .annotate(**per_term)
+        .filter(**{f'{name}__gt': 0 for name in per_term})
+        .annotate(score=reduce(lambda left, right: left + right, [F(name) for name in per_term]))
+    )
+
+
+def _trigram_filter(terms, prefix=''):
+    return reduce(and_, [
+        Q(**{f'{prefix}name__icontains': term})
+        | Q(**{f'{prefix}phone__icontains': term})
+        | Q(**{f'{prefix}bpjs_status__icontains': term})
+        for term in terms
+    ])
+
+
+def _terms(query):
+    compact = re.sub(r'[\s\-+().]', '', query or '')
+    if compact.isdigit():
+        # Nomor telepon/BPJS yang ditulis dengan spasi atau tanda hubung
+        return [compact[:TOKEN_MAX_LENGTH]]
+    return tokenize(query)[:MAX_QUERY_TERMS]
+
+
+def matching_patients(query):
+    """Queryset pasien (tanpa urutan) yang cocok dengan query, untuk filter patient__in"""
+    terms = _terms(query)
+    if not terms:
+        return Patient.objects.all()
+    if use_trigram():
+        return Patient.objects.filter(_trigram_filter(terms))
+    return Patient.objects.filter(pk__in=_token_matches(terms).values('patient_id'))
+
+
+def search_patients(query, queryset=None):
+    """
+    Cari pasien berdasarkan nama, telepon atau nomor BPJS
+
+    Returns:
+        Queryset pasien dengan anotasi `search_rank`, diurutkan dari yang paling relevan
+    """
+    queryset = Patient.objects.all() if queryset is None else queryset
+    terms = _terms(query)
+    if not terms:
+        return queryset
+    if use_trigram():
+        from django.contrib.postgres.search import TrigramSimilarity
+        return queryset.filter(_trigram_filter(terms)).annotate(
+            search_rank=TrigramSimilarity('name', ' '.join(terms))
+        ).order_by('-search_rank', 'name')
+
+    matches = _token_matches(terms)
+    return queryset.filter(pk__in=matches.values('patient_id')).annotate(
+        search_rank=Subquery(matches.filter(patient_id=OuterRef('pk')).values('score')[:1])
+    ).order_by('-search_rank', 'name')
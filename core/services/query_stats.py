@@ -0,0 +1,172 @@
+"""
+Statistik query database per view, digabung antar proses lewat cache.
+"""
+
+import os
+import re
+import socket
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+SQL_MS_BUCKETS = (1, 5, 10, 50, 100, 500, 1000)
+MAX_FINGERPRINTS_PER_VIEW = 20
+QUERY_STATS_FLUSH_SECONDS = getattr(settings, 'QUERY_STATS_FLUSH_SECONDS', 60)
+QUERY_STATS_CACHE_TIMEOUT = 24 * 60 * 60
+PROCESS_INDEX_KEY = 'query_stats:processes'
+
+_IN_LIST = re.compile(r'\(\s*%s(?:\s*,\s*%s)+\s*\)')
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """Normalisasi SQL agar query yang sama dengan parameter berbeda dikelompokkan"""
+    sql = _LITERALS.sub('?', sql)
+    sql = _IN_LIST.sub('(...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()[:500]
+
+
+class RequestQueries:
+    """execute_wrapper yang mencatat query satu request"""
+
+    def __init__(self):
+        self.count = 0
+        self.sql_seconds = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_seconds += time.perf_counter() - started
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    @property
+    def duplicates(self):
+        return {sql: count for sql, count in self.fingerprints.items() if count > 1}
+
+
+def _empty_view_stats():
+    return {
+        'requests': 0,
+        'queries': 0,
+        'max_queries': 0,
+        'sql_ms': 0.0,
+        'render_ms': 0.0,
+        'duplicate_requests': 0,
+        'query_histogram': [0] * (len(QUERY_COUNT_BUCKETS) + 1),
+        'sql_ms_histogram': [0] * (len(SQL_MS_BUCKETS) + 1),
+        'duplicates': {},
+    }
+
+
+def process_key():
+    """Key cache statistik proses ini (dihitung saat dipakai: worker hasil fork punya pid sendiri)"""
+    return f'query_stats:process:{socket.gethostname()}:{os.getpid()}'
+
+
+class QueryStatsRegistry:
+    """Agregasi statistik per view di dalam satu proses"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+        self._last_flush = time.monotonic()
+
+    def record(self, view_name, queries, render_ms):
+        sql_ms = queries.sql_seconds * 1000
+        duplicates = queries.duplicates
+        with self._lock:
+            stats = self._views.setdefault(view_name, _empty_view_stats())
+            stats['requests'] += 1
+            stats['queries'] += queries.count
+            stats['max_queries'] = max(stats['max_queries'], queries.count)
+            stats['sql_ms'] += sql_ms
+            stats['render_ms'] += render_ms
+            stats['query_histogram'][bisect_left(QUERY_COUNT_BUCKETS, queries.count)] += 1
+            stats['sql_ms_histogram'][bisect_left(SQL_MS_BUCKETS, sql_ms)] += 1
+            if duplicates:
+                stats['duplicate_requests'] += 1
+                seen = stats['duplicates']
+                for sql, count in duplicates.items():
+                    seen[sql] = max(seen.get(sql, 0), count)
+                if len(seen) > MAX_FINGERPRINTS_PER_VIEW:
+                    stats['duplicates'] = dict(
+                        sorted(seen.items(), key=lambda item: -item[1])[:MAX_FINGERPRINTS_PER_VIEW]
+                    )
+            should_flush = time.monotonic() - self._last_flush >= QUERY_STATS_FLUSH_SECONDS
+        if should_flush:
+            self.flush()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                name: {**stats, 'duplicates': dict(stats['duplicates'])}
+                for name, stats in self._views.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._views = {}
+
+    def flush(self):
+        """Simpan snapshot proses ini ke cache agar bisa digabung dengan proses lain"""
+        self._last_flush = time.monotonic()
+        key = process_key()
+        cache.set(key, self.snapshot(), QUERY_STATS_CACHE_TIMEOUT)
+        processes = set(cache.get(PROCESS_INDEX_KEY) or ())
+        if key not in processes:
+            processes.add(key)
+            cache.set(PROCESS_INDEX_KEY, sorted(processes), QUERY_STATS_CACHE_TIMEOUT)
+
+
+registry = QueryStatsRegistry()
+
+
+def _merge(target, stats):
+    target['requests'] += stats['requests']
+    target['queries'] += stats['queries']
+    target['max_queries'] = max(target['max_queries'], stats['max_queries'])
+    target['sql_ms'] += stats['sql_ms']
+    target['render_ms'] += stats['render_ms']
+    target['duplicate_requests'] += stats['duplicate_requests']
+    for key in ('query_histogram', 'sql_ms_histogram'):
+        target[key] = [a + b for a, b in zip(target[key], stats[key])]
+    for sql, count in stats['duplicates'].items():
+        target['duplicates'][sql] = max(target['duplicates'].get(sql, 0), count)
+
+
+def collect_stats():
+    """
+    Gabungkan statistik semua proses yang tercatat di cache
+
+    Returns:
+        Dict {view_name: stats} dengan rata-rata per request
+    """
+    registry.flush()
+    keys = cache.get(PROCESS_INDEX_KEY) or [process_key()]
+    merged = {}
+    for snapshot in cache.get_many(keys).values():
+        for name, stats in snapshot.items():
+            _merge(merged.setdefault(name, _empty_view_stats()), stats)
+    for stats in merged.values():
+        requests = stats['requests'] or 1
+        stats['avg_queries'] = round(stats['queries'] / requests, 2)
+        stats['avg_sql_ms'] = round(stats['sql_ms'] / requests, 2)
+        stats['avg_render_ms'] = round(stats['render_ms'] / requests, 2)
+    return merged
+
+
+def reset_stats():
+    """Hapus statistik di proses ini dan di cache"""
+    registry.reset()
+    cache.delete_many(list(cache.get(PROCESS_INDEX_KEY) or ()) + [process_key(), PROCESS_INDEX_KEY])
@@ -0,0 +1,144 @@
+"""
+Forecast titik pemesanan ulang obat dan draft PurchaseOrder per supplier.
+"""
+
+import math
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, Q, Sum
+from django.utils import timezone
+
+from core.models import Medicine, MedicineLot, MedicineUsageDaily, PurchaseOrder, PurchaseOrderLine
+
+
+# Bobot rata-rata pemakaian per jendela hari (jendela pendek lebih responsif)
+WINDOWS = {7: 0.5, 30: 0.3, 90: 0.2}
+SERVICE_LEVEL_Z = 1.65  # ~95% permintaan terpenuhi selama lead time
+COVER_DAYS = 30
+
+
+def forecast_usage(as_of=None):
+    """
+    Rata-rata pemakaian harian per obat dari rollup (satu query)
+
+    Jendela dihitung sampai hari sebelum `as_of` (hari yang sudah lengkap)
+
+    Returns:
+        Dictionary {medicine_id: {'rates': {hari: rata-rata}, 'daily_usage', 'stddev'}}
+    """
+    as_of = as_of or timezone.localdate()
+    longest = max(WINDOWS)
+    aggregates = {
+        f'used_{days}': Sum('quantity', filter=Q(date__gte=as_of - timedelta(days=days)))
+        for days in WINDOWS
+    }
+    rows = (
+        MedicineUsageDaily.objects.filter(date__gte=as_of - timedelta(days=longest), date__lt=as_of)
+        .order_by().values('medicine_id')
+        .annotate(squares=Sum(F('quantity') * F('quantity')), **aggregates)
+    )
+
+    forecast = {}
+    for row in rows:
+        rates = {days: (row[f'used_{days}'] or 0) / days for days in WINDOWS}
+        mean = rates[longest]
+        variance = max(row['squares'] / longest - mean * mean, 0)
+        forecast[row['medicine_id']] = {
+            'rates': rates,
+            'daily_usage': sum(rates[days] * weight for days, weight in WINDOWS.items()),
+            'stddev': math.sqrt(variance),
+        }
+    return forecast
+
+
+def compute_reorders(as_of=None, z=SERVICE_LEVEL_Z, cover_days=COVER_DAYS):
+    """
+    Hitung reorder point dan jumlah pesanan untuk obat yang perlu dipesan ulang
+
+    Returns:
+        (list of dict per obat yang perlu dipesan, jumlah obat berpemakaian tanpa supplier)
+    """
+    as_of = as_of or timezone.localdate()
+    usage = forecast_usage(as_of)
+    if not usage:
+        return [], 0
+
+    usable = dict(
+        MedicineLot.objects.filter(quantity__gt=0, expiry_date__gte=as_of).order_by()
+        .values('medicine_id').annotate(total=Sum('quantity')).values_list('medicine_id', 'total')
+    )
+    on_order = dict(
+        PurchaseOrderLine.objects.filter(order__status='sent').order_by()
+        .values('medicine_id').annotate(total=Sum('quantity')).values_list('medicine_id', 'total')
+    )
+    medicines = Medicine.objects.filter(pk__in=list(usage)).values_list(
+        'pk', 'name', 'price', 'supplier_id', 'supplier__lead_time_days'
+    )
+
+    reorders, without_supplier = [], 0
+    for medicine_id, name, price, supplier_id, lead_time in medicines:
+        forecast = usage[medicine_id]
+        demand = forecast['daily_usage']
+        if not demand:
+            continue
+        if supplier_id is None:
+            without_supplier += 1
+            continue
+        safety_stock = z * forecast['stddev'] * math.sqrt(lead_time)
+        reorder_point = math.ceil(demand * lead_time + safety_stock)
+        position = usable.get(medicine_id, 0) + on_order.get(medicine_id, 0)
+        if position > reorder_point:
+            continue
+        reorders.append({
+            'medicine_id': medicine_id,
+            'medicine': name,
+            'supplier_id': supplier_id,
+            'unit_price': price,
+            'daily_usage': Decimal(str(round(demand, 2))),
+            'reorder_point': reorder_point,
+            'stock_on_hand': usable.get(medicine_id, 0),
+            'on_order': on_order.get(medicine_id, 0),
+            'quantity': math.ceil(reorder_point + demand * cover_days - position),
+        })
+    return reorders, without_supplier
+
+
+def generate_purchase_orders(as_of=None, z=SERVICE_LEVEL_Z, cover_days=COVER_DAYS):
+    """
+    Ganti draft PO hasil forecast sebelumnya dengan draft baru per supplier
+
+    Draft yang dibuat manual (tanpa forecast_date) tidak disentuh
+
+    Returns:
+        Dict {'orders', 'lines', 'without_supplier'}
+    """
+    as_of = as_of or timezone.localdate()
+    reorders, without_supplier = compute_reorders(as_of, z, cover_days)
+
+    by_supplier = {}
+    for reorder in reorders:
+        by_supplier.setdefault(reorder['supplier_id'], []).append(reorder)
+
+    with transaction.atomic():
+        PurchaseOrder.objects.filter(status='draft', forecast_date__isnull=False).delete()
+        lines = []
+        for supplier_id, supplier_reorders in sorted(by_supplier.items()):
+            # Satu INSERT per supplier (id dibutuhkan untuk baris PO; bulk_create di MySQL tidak mengembalikan id)
+            order = PurchaseOrder.objects.create(supplier_id=supplier_id, forecast_date=as_of)
+            lines.extend(
+                PurchaseOrderLine(
+                    order=order,
+                    medicine_id=reorder['medicine_id'],
+                    quantity=reorder['quantity'],
+                    unit_price=reorder['unit_price'],
+                    daily_usage=reorder['daily_usage'],
+                    reorder_point=reorder['reorder_point'],
+                    stock_on_hand=reorder['stock_on_hand'],
+                )
+                for reorder in supplier_reorders
+            )
+        PurchaseOrderLine.objects.bulk_create(lines, batch_size=1000)
+
+    return {'orders': len(by_supplier), 'lines': len(lines), 'without_supplier': without_supplier}
@@ -0,0 +1,116 @@
+"""
+Laporan bulanan dan tahunan dari tabel rollup harian.
+"""
+
+from datetime import date
+
+from django.db.models import DecimalField, Q, Sum, Value
+from django.db.models.functions import Coalesce, ExtractMonth
+
+from core.models import MedicineUsageDaily, RevenueDaily, VisitDaily
+
+
+TOP_LIMIT = 10
+MONEY = DecimalField(max_digits=14, decimal_places=2)
+BILLED = ~Q(status='cancelled')
+
+
+def _period(year, month=None):
+    if month:
+        end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+        return date(year, month, 1), end
+    return date(year, 1, 1), date(year + 1, 1, 1)
+
+
+def _revenue_totals(rows):
+    return rows.aggregate(
+        payments=Coalesce(Sum('payments'), 0),
+        amount=Coalesce(Sum('amount'), Value(0), output_field=MONEY),
+        paid_amount=Coalesce(Sum('paid_amount'), Value(0), output_field=MONEY),
+    )
+
+
+def period_report(start, end, top=TOP_LIMIT):
+    """
+    Ringkasan pendapatan, kunjungan dan resep untuk rentang tanggal [start, end) dari rollup
+
+    Returns:
+        Dictionary dengan kunci 'revenue', 'visits' dan 'prescriptions'
+    """
+    revenue = RevenueDaily.objects.filter(date__gte=start, date__lt=end).order_by()
+    visits = VisitDaily.objects.filter(date__gte=start, date__lt=end).order_by()
+    usage = MedicineUsageDaily.objects.filter(date__gte=start, date__lt=end).order_by()
+
+    return {
+        'revenue': {
+            'total': _revenue_totals(revenue.filter(BILLED)),
+            'by_method': list(
+                revenue.filter(BILLED).values('method')
+                .annotate(payments=Sum('payments'), amount=Sum('amount'), paid_amount=Sum('paid_amount'))
+                .order_by('-amount')
+            ),
+            'by_status': list(
+                revenue.values('status')
+                .annotate(payments=Sum('payments'), amount=Sum('amount'), paid_amount=Sum('paid_amount'))
+                .order_by('status')
+            ),
+        },
+        'visits': {
+            'total': visits.aggregate(
+                visits=Coalesce(Sum('visits'), 0),
+                completed=Coalesce(Sum('completed'), 0),
+                cancelled=Coalesce(Sum('cancelled'), 0),
+            ),
+            'by_doctor': list(
+                visits.values('doctor_id', 'doctor__name')
+                .annotate(visits=Sum('visits'), completed=Sum('completed'), cancelled=Sum('cancelled'))
+                .order_by('-visits', 'doctor__name')[:top]
+            ),
+        },
+        'prescriptions': {
+            'total': usage.aggregate(
+                prescribed=Coalesce(Sum('prescribed'), 0),
+                dispensed=Coalesce(Sum('prescriptions'), 0),
+                quantity=Coalesce(Sum('quantity'), 0),
+            ),
+            'by_medicine': list(
+                usage.values('medicine_id', 'medicine__name')
+                .annotate(prescribed=Sum('prescribed'), dispensed=Sum('prescriptions'), quantity=Sum('quantity'))
+                .order_by('-prescribed', 'medicine__name')[:top]
+            ),
+        },
+    }
+
+
+def monthly_report(year, month, top=TOP_LIMIT):
+    """Laporan satu bulan dari rollup harian"""
+    start, end = _period(year, month)
+    return {'period': f'{year}-{month:02d}', **period_report(start, end, top)}
+
+
+def annual_report(year, top=TOP_LIMIT):
+    """Laporan satu tahun dari rollup harian, ditambah rincian per bulan"""
+    start, end = _period(year)
+    report = {'period': str(year), **period_report(start, end, top)}
+
+    months = {
+        month: {'month': month, 'payments': 0, 'amount': 0, 'paid_amount': 0, 'visits': 0, 'prescribed': 0}
+        for month in range(1, 13)
+    }
+    by_month = [
+        (
+            RevenueDaily.objects.filter(BILLED),
+            {'payments': Sum('payments'), 'amount': Sum('amount'), 'paid_amount': Sum('paid_amount')},
+        ),
+        (VisitDaily.objects.all(), {'visits': Sum('visits')}),
+        (MedicineUsageDaily.objects.all(), {'prescribed': Sum('prescribed')}),
+    ]
+    for rows, aggregates in by_month:
+        rows = (
+            rows.filter(date__gte=start, date__lt=end).order_by()
+            .annotate(month=ExtractMonth('date')).values('month').annotate(**aggregates)
+        )
+        for row in rows:
+            months[row.pop('month')].update(row)
+    report['months'] = list(months.values())
+    return report
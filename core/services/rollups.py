@@ -0,0 +1,222 @@
+"""
+Rollup harian incremental berdasarkan watermark updated_at.
+"""
+
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from core.models import (
+    MedicalRecord, MedicineUsageDaily, Payment, Prescription, RevenueDaily, RollupWatermark, VisitDaily,
+)
+
+
+ROLLUP_OVERLAP = timedelta(minutes=5)
+# Batas jumlah key per statement (IN list)
+KEY_CHUNK = 500
+
+
+def _chunks(keys):
+    keys = sorted(keys)
+    for start in range(0, len(keys), KEY_CHUNK):
+        yield keys[start:start + KEY_CHUNK]
+
+
+def run_rollup(name, model, changed_buckets, rebuild_buckets, rebuild_all, full=False):
+    """
+    Jalankan satu rollup secara incremental dari watermark-nya
+
+    Args:
+        name: Nama watermark
+        model: Model rollup (dikosongkan dulu jika full=True)
+        changed_buckets: fungsi(since) -> iterable (day, key) yang berubah sejak `since`
+        rebuild_buckets: fungsi(day, keys) -> hitung ulang bucket dari tabel sumber
+        rebuild_all: fungsi() -> isi seluruh rollup dengan satu aggregate (run pertama / full)
+
+    Returns:
+        Dict {'days': jumlah hari, 'buckets': jumlah bucket yang dihitung ulang}
+    """
+    started = timezone.now()
+    with transaction.atomic():
+        # Kunci baris watermark: dua proses refresh yang sama tidak berjalan bersamaan
+        watermark, _ = RollupWatermark.objects.select_for_update().get_or_create(name=name)
+        if full or watermark.value is None:
+            model.objects.all().delete()
+            result = rebuild_all()
+        else:
+            buckets = {}
+            for day, key in changed_buckets(watermark.value - ROLLUP_OVERLAP):
+                buckets.setdefault(day, set()).add(key)
+            for day, keys in sorted(buckets.items()):
+                for chunk in _chunks(keys):
+                    rebuild_buckets(day, chunk)
+            result = {'days': len(buckets), 'buckets': sum(len(keys) for keys in buckets.values())}
+
+        watermark.value = started
+        watermark.save(update_fields=['value', 'updated_at'])
+    return result
+
+
+def bulk_insert(model, rows, build, batch_size=5000):
+    """Tulis hasil aggregate (iterator dict) ke tabel rollup per batch; kembalikan jumlah hari dan bucket"""
+    batch, days, count = [], set(), 0
+    for row in rows:
+        batch.append(build(row))
+        days.add(batch[-1].date)
+        if len(batch) >= batch_size:
+            model.objects.bulk_create(batch)
+            count += len(batch)
+            batch = []
+    model.objects.bulk_create(batch)
+    return {'days': len(days), 'buckets': count + len(batch)}
+
+
+# ==================== RESEP & PEMAKAIAN OBAT ====================
+
+def _usage_rows(prescriptions):
+    dispensed = Q(dispensed_at__isnull=False)
+    return (
+        prescriptions.order_by().values('prescription_date', 'medicine_id').annotate(
+            prescribed=Count('id'),
+            total=Sum('quantity', filter=dispensed, default=0),
+            count=Count('id', filter=dispensed),
+        )
+    )
+
+
+def _usage_row(row):
+    return MedicineUsageDaily(
+        medicine_id=row['medicine_id'],
+        date=row['prescription_date'],
+        prescribed=row['prescribed'],
+        quantity=row['total'],
+        prescriptions=row['count'],
+    )
+
+
+def _changed_usage(since):
+    return (
+        Prescription.objects.filter(updated_at__gte=since).order_by()
+        .values_list('prescription_date', 'medicine_id').distinct().iterator()
+    )
+
+
+def _rebuild_usage(day, medicine_ids):
+    MedicineUsageDaily.objects.filter(date=day, medicine_id__in=medicine_ids).delete()
+    rows = _usage_rows(Prescription.objects.filter(prescription_date=day, medicine_id__in=medicine_ids))
+    MedicineUsageDaily.objects.bulk_create([_usage_row(row) for row in rows])
+
+
+def _rebuild_all_usage():
+    return bulk_insert(MedicineUsageDaily, _usage_rows(Prescription.objects.all()).iterator(), _usage_row)
+
+
+def refresh_medicine_usage(full=False):
+    """Perbarui rollup resep/pemakaian obat harian dari resep yang berubah sejak watermark"""
+    return run_rollup(
+        'medicine_usage', MedicineUsageDaily, _changed_usage, _rebuild_usage, _rebuild_all_usage, full=full
+    )
+
+
+# ==================== PENDAPATAN ====================
+
+def _day_range(day):
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min))
+
+
+def _revenue_rows(payments):
+    return (
+        payments.order_by().annotate(day=TruncDate('created_at'))
+        .values('day', 'method', 'status')
+        .annotate(count=Count('id'), amount_total=Sum('amount'), paid_total=Sum('paid_amount'))
+    )
+
+
+def _revenue_row(row):
+    return RevenueDaily(
+        date=row['day'], method=row['method'], status=row['status'],
+        payments=row['count'], amount=row['amount_total'], paid_amount=row['paid_total'],
+    )
+
+
+def _changed_revenue(since):
+    # Bucket = satu hari penuh: pembayaran bisa pindah status/metode di hari yang sama
+    days = (
+        Payment.objects.filter(updated_at__gte=since).order_by()
+        .annotate(day=TruncDate('created_at')).values_list('day', flat=True).distinct()
+    )
+    return ((day, None) for day in days.iterator())
+
+
+def _rebuild_revenue(day, keys):
+    RevenueDaily.objects.filter(date=day).delete()
+    # Range created_at (indeks), bukan TruncDate di WHERE
+    start, end = _day_range(day)
+    rows = _revenue_rows(Payment.objects.filter(created_at__gte=start, created_at__lt=end))
+    RevenueDaily.objects.bulk_create([_revenue_row(row) for row in rows])
+
+
+def _rebuild_all_revenue():
+    return bulk_insert(RevenueDaily, _revenue_rows(Payment.objects.all()).iterator(), _revenue_row)
+
+
+def refresh_revenue(full=False):
+    """Perbarui rollup pendapatan harian dari pembayaran yang berubah sejak watermark"""
+    return run_rollup('revenue', RevenueDaily, _changed_revenue, _rebuild_revenue, _rebuild_all_revenue, full=full)
+
+
+# ==================== KUNJUNGAN ====================
+
+def _visit_rows(records):
+    return (
+        records.order_by().values('examination_date', 'doctor_id').annotate(
+            visits=Count('id'),
+            completed=Count('id', filter=Q(status='completed')),
+            cancelled=Count('id', filter=Q(status='cancelled')),
+        )
+    )
+
+
+def _visit_row(row):
+    return VisitDaily(
+        doctor_id=row['doctor_id'], date=row['examination_date'],
+        visits=row['visits'], completed=row['completed'], cancelled=row['cancelled'],
+    )
+
+
+def _changed_visits(since):
+    return (
+        MedicalRecord.objects.filter(updated_at__gte=since).order_by()
+        .values_list('examination_date', 'doctor_id').distinct().iterator()
+    )
+
+
+def _rebuild_visits(day, doctor_ids):
+    VisitDaily.objects.filter(date=day, doctor_id__in=doctor_ids).delete()
+    rows = _visit_rows(MedicalRecord.objects.filter(examination_date=day, doctor_id__in=doctor_ids))
+    VisitDaily.objects.bulk_create([_visit_row(row) for row in rows])
+
+
+def _rebuild_all_visits():
+    return bulk_insert(VisitDaily, _visit_rows(MedicalRecord.objects.all()).iterator(), _visit_row)
+
+
+def refresh_visits(full=False):
+    """Perbarui rollup kunjungan per dokter per hari dari rekam medis yang berubah sejak watermark"""
+    return run_rollup('visits', VisitDaily, _changed_visits, _rebuild_visits, _rebuild_all_visits, full=full)
+
+
+ROLLUPS = {
+    'medicine_usage': refresh_medicine_usage,
+    'revenue': refresh_revenue,
+    'visits': refresh_visits,
+}
+
+
+def refresh_rollups(names=None, full=False):
+    """Perbarui semua (atau sebagian) rollup harian; kembalikan hasil per rollup"""
+    return {name: ROLLUPS[name](full=full) for name in names or ROLLUPS}
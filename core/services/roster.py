@@ -0,0 +1,53 @@
+"""
+Roster dokter yang di-cache dan diinvalidasi lewat signal.
+"""
+
+from django.conf import settings
+
+from core.cache import get_or_compute, invalidate_tags, tag_version
+from core.models import Doctor, DoctorAvailability
+
+
+ROSTER_CACHE_TIMEOUT = getattr(settings, 'DOCTOR_ROSTER_CACHE_TIMEOUT', 60 * 60)
+ROSTER_TAG = 'doctor_roster'
+
+
+def get_roster_version():
+    """Versi roster saat ini, berubah setiap kali roster di-invalidate"""
+    return tag_version(ROSTER_TAG)
+
+
+def invalidate_doctor_roster():
+    """Tandai roster ter-cache sebagai usang"""
+    invalidate_tags(ROSTER_TAG)
+
+
+def _build_roster():
+    days = {}
+    for doctor_id, day in DoctorAvailability.objects.filter(is_active=True).values_list('doctor_id', 'day_of_week'):
+        days.setdefault(doctor_id, set()).add(day)
+    return [
+        {**doctor, 'available_days': tuple(sorted(days.get(doctor['id'], ())))}
+        for doctor in Doctor.objects.order_by('name').values('id', 'name', 'specialty', 'unit', 'is_available')
+    ]
+
+
+def get_doctor_roster():
+    """
+    Daftar semua dokter (urut nama) dari cache
+
+    Returns:
+        List dict (id, name, specialty, unit, is_available, available_days)
+    """
+    return get_or_compute('doctor_roster:all', _build_roster, ROSTER_CACHE_TIMEOUT, tags=[ROSTER_TAG])
+
+
+def get_roster_doctor(doctor_id):
+    """Entri roster untuk satu dokter, atau None jika tidak ada"""
+    return next((doctor for doctor in get_doctor_roster() if doctor['id'] == doctor_id), None)
+
+
+def available_doctors(limit=None):
+    """Dokter yang sedang menerima pasien, urut nama"""
+    doctors = [doctor for doctor in get_doctor_roster() if doctor['is_available']]
+    return doctors[:limit] if limit else doctors
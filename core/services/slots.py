@@ -0,0 +1,153 @@
+"""
+Slot appointment dokter: jadwal mingguan dikurangi cuti dan booking, di-cache per minggu.
+"""
+
+from datetime import datetime, timedelta
+
+from django.conf import settings
+
+from core.cache import get_many_or_compute, invalidate_tags
+from core.models import Doctor, DoctorAvailability, DoctorLeave, MedicalRecord
+
+
+SLOT_MINUTES = getattr(settings, 'APPOINTMENT_SLOT_MINUTES', 30)
+SLOT_CACHE_TIMEOUT = getattr(settings, 'APPOINTMENT_SLOT_CACHE_TIMEOUT', 60 * 60)
+
+# Status rekam medis yang masih menempati slot dokter
+ACTIVE_APPOINTMENT_STATUSES = ('pending', 'confirmed')
+
+
+def _week_start(day):
+    return day - timedelta(days=day.weekday())
+
+
+def _slots_tag(doctor_id):
+    return f'doctor_slots:{doctor_id}'
+
+
+def _week_key(doctor_id, week_start):
+    return f'slots:{doctor_id}:{week_start.isoformat()}'
+
+
+def invalidate_doctor_slots(doctor_id):
+    """Buang semua slot ter-cache milik dokter (dipanggil dari signal)"""
+    invalidate_tags(_slots_tag(doctor_id))
+
+
+def _iter_slot_times(start_time, end_time):
+    step = timedelta(minutes=SLOT_MINUTES)
+    anchor = datetime(2000, 1, 1)
+    current = datetime.combine(anchor, start_time)
+    end = datetime.combine(anchor, end_time)
+    while current + step <= end:
+        yield current.time(), (current + step).time()
+        current += step
+
+
+def _compute_slots(doctor_id, start_date, end_date):
+    """Hitung slot kosong untuk rentang tanggal dengan 4 query"""
+    doctor = Doctor.objects.filter(pk=doctor_id).values(
+        'working_hours_start', 'working_hours_end', 'is_available'
+    ).first()
+    days = (end_date - start_date).days + 1
+    result = {start_date + timedelta(days=i): () for i in range(days)}
+    if not doctor or not doctor['is_available']:
+        return result
+
+    availabilities = list(
+        DoctorAvailability.objects.filter(doctor_id=doctor_id).values_list(
+            'day_of_week', 'start_time', 'end_time', 'is_active'
+        )
+    )
+    if availabilities:
+        hours = {
+            day: (start, end)
+            for day, start, end, is_active in availabilities
+            if is_active
+        }
+    else:
+        # Dokter belum mengatur jadwal mingguan, pakai jam kerja default
+        hours = {
+            day: (doctor['working_hours_start'], doctor['working_hours_end'])
+            for day in range(7)
+        }
+
+    leaves = list(
+        DoctorLeave.objects.filter(
+            doctor_id=doctor_id,
+            start_date__lte=end_date,
+            end_date__gte=start_date,
+        ).values_list('start_date', 'end_date')
+    )
+
+    booked = {}
+    for day, time in MedicalRecord.objects.filter(
+        doctor_id=doctor_id,
+        examination_date__range=[start_date, end_date],
+        examination_time__isnull=False,
+        status__in=ACTIVE_APPOINTMENT_STATUSES,
+    ).exclude(confirmation_status='rejected').values_list('examination_date', 'examination_time'):
+        booked.setdefault(day, []).append(time)
+
+    for day in result:
+        if day.weekday() not in hours:
+            continue
+        if any(start <= day <= end for start, end in leaves):
+            continue
+        taken = booked.get(day, [])
+        start_time, end_time = hours[day.weekday()]
+        result[day] = tuple(
+            slot_start
+            for slot_start, slot_end in _iter_slot_times(start_time, end_time)
+            if not any(slot_start <= t < slot_end for t in taken)
+        )
+    return result
+
+
+def get_free_slots(doctor_id, start_date, end_date):
+    """
+    Ambil slot kosong dokter untuk rentang tanggal (inklusif)
+
+    Args:
+        doctor_id: ID dokter
+        start_date: Tanggal awal
+        end_date: Tanggal akhir
+
+    Returns:
+        Dictionary {tanggal: tuple jam mulai slot}
+    """
+    if end_date < start_date:
+        return {}
+
+    weeks = []
+    week = _week_start(start_date)
+    while week <= end_date:
+        weeks.append(week)
+        week += timedelta(days=7)
+    keys = {_week_key(doctor_id, week): week for week in weeks}
+
+    def compute_missing(missing_keys):
+        missing = [keys[key] for key in missing_keys]
+        computed = _compute_slots(doctor_id, missing[0], missing[-1] + timedelta(days=6))
+        return {
+            _week_key(doctor_id, week): {
+                week + timedelta(days=i): computed[week + timedelta(days=i)]
+                for i in range(7)
+            }
+            for week in missing
+        }
+
+    cached = get_many_or_compute(list(keys), compute_missing, SLOT_CACHE_TIMEOUT, tags=[_slots_tag(doctor_id)])
+
+    slots = {}
+    for week_slots in cached.values():
+        for day, times in week_slots.items():
+            if start_date <= day <= end_date:
+                slots[day] = times
+    return dict(sorted(slots.items()))
+
+
+def is_slot_free(doctor_id, examination_date, examination_time):
+    """Cek apakah jam tertentu merupakan slot kosong dokter"""
+    slots = get_free_slots(doctor_id, examination_date, examination_date)
+    return examination_time in slots.get(examination_date, ())
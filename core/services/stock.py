@@ -0,0 +1,329 @@
+"""
+Buku stok obat per lot (FEFO); stok hanya berubah lewat StockMovement.
+"""
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Case, Count, DecimalField, F, IntegerField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.models import Medicine, MedicineLot, Prescription, StockMovement
+
+
+STOCK_VALUE = DecimalField(max_digits=14, decimal_places=2)
+
+
+class InsufficientStockError(Exception):
+    """Stok obat tidak cukup untuk pengeluaran yang diminta"""
+
+
+def _shortage_error(medicine_ids):
+    names = ', '.join(Medicine.objects.filter(pk__in=medicine_ids).order_by('name').values_list('name', flat=True))
+    return InsufficientStockError(f"Stok obat tidak mencukupi: {names}")
+
+
+def _nearest_expiry():
+    nearest = (
+        MedicineLot.objects.filter(medicine=OuterRef('pk'), quantity__gt=0)
+        .order_by('expiry_date').values('expiry_date')[:1]
+    )
+    # Obat tanpa stok tetap menyimpan tanggal terakhirnya
+    return Coalesce(Subquery(nearest), F('expiry_date'))
+
+
+def _lock_lots(lots):
+    """Kunci lot berstok: list of (lot_id, medicine_id, quantity) urut kedaluwarsa terdekat"""
+    return list(
+        lots.select_for_update().filter(quantity__gt=0)
+        .order_by('medicine_id', 'expiry_date', 'id')
+        .values_list('pk', 'medicine_id', 'quantity')
+    )
+
+
+def _allocate_fefo(demands, lots):
+    """
+    Bagi kebutuhan ke lot, kedaluwarsa terdekat lebih dulu
+
+    Args:
+        demands: List of (key, medicine_id, quantity)
+        lots: Hasil _lock_lots()
+
+    Returns:
+        (list of (key, medicine_id, lot_id, quantity), set medicine_id yang stoknya kurang)
+    """
+    available = {}
+    for lot_id, medicine_id, quantity in lots:
+        available.setdefault(medicine_id, []).append([lot_id, quantity])
+
+    allocations, short = [], set()
+    for key, medicine_id, quantity in demands:
+        queue = available.get(medicine_id, [])
+        while quantity and queue:
+            lot = queue[0]
+            taken = min(quantity, lot[1])
+            allocations.append((key, medicine_id, lot[0], taken))
+            lot[1] -= taken
+            quantity -= taken
+            if not lot[1]:
+                queue.pop(0)
+        if quantity:
+            short.add(medicine_id)
+    return allocations, short
+
+
+def _apply_allocations(allocations, sign):
+    """Satu UPDATE untuk semua lot dan satu untuk semua obat (stok dan kedaluwarsa terdekat)"""
+    lot_deltas, medicine_deltas = {}, {}
+    for _, medicine_id, lot_id, quantity in allocations:
+        lot_deltas[lot_id] = lot_deltas.get(lot_id, 0) + sign * quantity
+        medicine_deltas[medicine_id] = medicine_deltas.get(medicine_id, 0) + sign * quantity
+
+    def delta(deltas):
+        return Case(
+            *[When(pk=pk, then=Value(value)) for pk, value in deltas.items()],
+            output_field=IntegerField(),
+        )
+
+    MedicineLot.objects.filter(pk__in=lot_deltas).update(quantity=F('quantity') + delta(lot_deltas))
+    Medicine.objects.filter(pk__in=medicine_deltas).update(
+        stock=F('stock') + delta(medicine_deltas),
+        expiry_date=_nearest_expiry(),
+    )
+
+
+# ==================== MUTASI STOK ====================
+
+def get_lot(medicine, lot_number='', expiry_date=None):
+    """Ambil/buat lot obat (default: tanpa nomor lot, kedaluwarsa obat saat ini)"""
+    lot, _ = MedicineLot.objects.get_or_create(
+        medicine_id=medicine.pk,
+        lot_number=lot_number,
+        expiry_date=expiry_date or medicine.expiry_date,
+    )
+    return lot
+
+
+def record_movement(medicine, kind, quantity, note='', prescription=None, lot=None):
+    """
+    Catat mutasi stok dan perbarui stok lot dan Medicine.stock secara atomik
+
+    Args:
+        quantity: Positif untuk stok masuk ke `lot` (default lot tanpa nomor),
+            negatif untuk stok keluar dari `lot` (default FEFO dari semua lot)
+
+    Returns:
+        List StockMovement (stok keluar bisa terbagi ke beberapa lot)
+
+    Raises:
+        InsufficientStockError: jika stok akan menjadi negatif
+    """
+    if not quantity:
+        raise ValueError("Jumlah mutasi stok tidak boleh 0")
+    with transaction.atomic():
+        if quantity > 0:
+            lot = lot or get_lot(medicine)
+            allocations, sign = [(None, medicine.pk, lot.pk, quantity)], 1
+        else:
+            lots = MedicineLot.objects.filter(pk=lot.pk) if lot else MedicineLot.objects.filter(medicine_id=medicine.pk)
+            allocations, short = _allocate_fefo([(None, medicine.pk, -quantity)], _lock_lots(lots))
+            if short:
+                raise _shortage_error(short)
+            sign = -1
+
+        _apply_allocations(allocations, sign)
+        return StockMovement.objects.bulk_create([
+            StockMovement(
+                medicine_id=medicine.pk,
+                lot_id=lot_id,
+                kind=kind,
+                quantity=sign * allocated,
+                prescription=prescription,
+                note=note,
+            )
+            for _, _, lot_id, allocated in allocations
+        ])
+
+
+def receive_stock(medicine, quantity, note='', lot_number='', expiry_date=None):
+    """Catat penerimaan obat dari supplier ke lot `lot_number`/`expiry_date`"""
+    if quantity <= 0:
+        raise ValueError("Jumlah penerimaan harus lebih dari 0")
+    with transaction.atomic():
+        lot = get_lot(medicine, lot_number, expiry_date)
+        return record_movement(medicine, 'receipt', quantity, note, lot=lot)[0]
+
+
+def adjust_stock(medicine, quantity, note='', lot=None):
+    """Koreksi stok (stock opname, obat rusak/kedaluwarsa) dengan selisih positif atau negatif"""
+    return record_movement(medicine, 'adjustment', quantity, note, lot=lot)
+
+
+def dispense_prescriptions(prescriptions, batch_size=1000):
+    """
+    Serahkan obat untuk sekumpulan resep dan kurangi stok secara set-based (FEFO)
+
+    Resep yang sudah diserahkan dilewati dan lot yang sudah kedaluwarsa tidak
+    dipakai. Jika ada obat yang stoknya kurang, seluruh batch dibatalkan.
+
+    Args:
+        prescriptions: Queryset atau list resep/id resep
+
+    Returns:
+        Jumlah resep yang diserahkan
+
+    Raises:
+        InsufficientStockError: jika stok layak pakai salah satu obat tidak cukup
+    """
+    if not hasattr(prescriptions, 'values'):
+        prescriptions = Prescription.objects.filter(pk__in=[getattr(p, 'pk', p) for p in prescriptions])
+    ids = list(prescriptions.order_by().values_list('pk', flat=True))
+    if not ids:
+        return 0
+
+    dispensed_at = timezone.now()
+    with transaction.atomic():
+        # UPDATE bersyarat mengunci baris resep; resep yang sudah diklaim batch lain tidak ikut
+        claimed = Prescription.objects.filter(pk__in=ids, dispensed_at__isnull=True).update(
+            dispensed_at=dispensed_at, updated_at=dispensed_at,
+        )
+        if not claimed:
+            return 0
+        rows = list(
+            Prescription.objects.filter(pk__in=ids, dispensed_at=dispensed_at)
+            .order_by('pk').values_list('pk', 'medicine_id', 'quantity')
+        )
+
+        lots = _lock_lots(MedicineLot.objects.filter(
+            medicine_id__in={medicine_id for _, medicine_id, _ in rows},
+            expiry_date__gte=timezone.localdate(),
+        ))
+        allocations, short = _allocate_fefo(rows, lots)
+        if short:
+            # Exception membatalkan klaim resep di batch ini
+            raise _shortage_error(short)
+
+        _apply_allocations(allocations, -1)
+        StockMovement.objects.bulk_create(
+            [
+                StockMovement(
+                    medicine_id=medicine_id,
+                    lot_id=lot_id,
+                    kind='dispense',
+                    quantity=-quantity,
+                    prescription_id=pk,
+                    created_at=dispensed_at,
+                )
+                for pk, medicine_id, lot_id, quantity in allocations
+            ],
+            batch_size=batch_size,
+        )
+    return len(rows)
+
+
+def dispense_prescription(prescription):
+    """Serahkan obat untuk satu resep (False jika sudah pernah diserahkan)"""
+    return dispense_prescriptions(Prescription.objects.filter(pk=prescription.pk)) == 1
+
+
+# ==================== LAPORAN KEDALUWARSA ====================
+
+def expiring_lots(days, as_of=None, include_expired=True):
+    """
+    Lot berstok yang kedaluwarsa dalam `days` hari (range scan pada indeks expiry_date)
+
+    Args:
+        days: Jendela hari dari `as_of`; -1 berarti hanya yang sudah kedaluwarsa
+        include_expired: Ikutkan lot yang sudah lewat tanggal kedaluwarsa
+    """
+    as_of = as_of or timezone.localdate()
+    lots = MedicineLot.objects.filter(quantity__gt=0, expiry_date__lte=as_of + timedelta(days=days))
+    if not include_expired:
+        lots = lots.filter(expiry_date__gte=as_of)
+    return lots.select_related('medicine').order_by('expiry_date', 'id')
+
+
+def expiring_summary(days, as_of=None):
+    """Jumlah lot, unit dan nilai persediaan yang kedaluwarsa dalam `days` hari (satu query)"""
+    as_of = as_of or timezone.localdate()
+    return expiring_lots(days, as_of).aggregate(
+        lots=Count('id'),
+        units=Coalesce(Sum('quantity'), 0),
+        expired_units=Coalesce(Sum('quantity', filter=Q(expiry_date__lt=as_of)), 0),
+        value=Coalesce(
+            Sum(F('quantity') * F('medicine__price'), output_field=STOCK_VALUE),
+            Value(0),
+            output_field=STOCK_VALUE,
+        ),
+    )
+
+
+# ==================== REKONSILIASI ====================
+
+def _stock_drift(medicine_ids=None):
+    """
+    Obat dan lot yang stoknya berbeda dengan jumlah mutasi di buku stok
+
+    Returns:
+        (list of (medicine_id, name, stored, ledger), list of (lot_id, label, stored, ledger))
+    """
+    movements = StockMovement.objects.order_by()
+    medicines = Medicine.objects.order_by('pk')
+    lots = MedicineLot.objects.order_by('pk')
+    if medicine_ids is not None:
+        movements = movements.filter(medicine_id__in=medicine_ids)
+        medicines = medicines.filter(pk__in=medicine_ids)
+        lots = lots.filter(medicine_id__in=medicine_ids)
+
+    ledger = dict(movements.values('medicine_id').annotate(total=Sum('quantity')).values_list('medicine_id', 'total'))
+    medicine_drift = [
+        (medicine_id, name, stored, ledger.get(medicine_id, 0))
+        for medicine_id, name, stored in medicines.values_list('pk', 'name', 'stock')
+        if stored != ledger.get(medicine_id, 0)
+    ]
+
+    lot_ledger = dict(
+        movements.filter(lot__isnull=False).values('lot_id').annotate(total=Sum('quantity')).values_list('lot_id', 'total')
+    )
+    lot_drift = [
+        (lot_id, f"{name} lot {lot_number or '-'} ({expiry_date})", stored, lot_ledger.get(lot_id, 0))
+        for lot_id, name, lot_number, expiry_date, stored in lots.values_list(
+            'pk', 'medicine__name', 'lot_number', 'expiry_date', 'quantity'
+        ).iterator()
+        if stored != lot_ledger.get(lot_id, 0)
+    ]
+    return medicine_drift, lot_drift
+
+
+def reconcile_stock(dry_run=False):
+    """
+    Cocokkan Medicine.stock dan sisa tiap lot dengan jumlah mutasi di buku stok
+
+    Selisih dihitung dulu tanpa menulis. Tanpa dry_run, lot dan obat yang tidak sinkron
+    dikunci (urutan sama dengan penyerahan resep), selisihnya dihitung ulang lalu ditulis;
+    jumlah buku stok negatif disimpan sebagai 0, baik untuk obat maupun lot.
+
+    Returns:
+        List of (name, stored_value, ledger_value) untuk obat/lot yang tidak sinkron
+    """
+    medicine_drift, lot_drift = _stock_drift()
+    report = [(name, stored, actual) for _, name, stored, actual in medicine_drift + lot_drift]
+    if dry_run or not report:
+        return report
+
+    medicine_ids = {medicine_id for medicine_id, *_ in medicine_drift}
+    medicine_ids |= set(
+        MedicineLot.objects.filter(pk__in=[lot_id for lot_id, *_ in lot_drift]).values_list('medicine_id', flat=True)
+    )
+    with transaction.atomic():
+        # Mutasi yang berjalan menunggu kunci ini, jadi nilai buku stok tidak tertimpa nilai lama
+        lots = MedicineLot.objects.select_for_update().filter(medicine_id__in=medicine_ids)
+        list(lots.order_by('medicine_id', 'expiry_date', 'id').values_list('pk'))
+        list(Medicine.objects.select_for_update().filter(pk__in=medicine_ids).order_by('pk').values_list('pk'))
+        medicine_drift, lot_drift = _stock_drift(medicine_ids)
+        for medicine_id, _, _, actual in medicine_drift:
+            Medicine.objects.filter(pk=medicine_id).update(stock=max(actual, 0))
+        for lot_id, _, _, actual in lot_drift:
+            MedicineLot.objects.filter(pk=lot_id).update(quantity=max(actual, 0))
+    return report
@@ -0,0 +1,229 @@
+"""
+Signal handlers untuk menjaga data turunan (cache, counter) tetap sinkron.
+"""
+
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import (
+    Doctor, DoctorAvailability, DoctorLeave, Inpatient, MedicalRecord, Patient, Payment, Room, Schedule,
+)
+from .services.balances import apply_balance_delta, payment_contribution
+from .services.booking import claim_slot, release_appointment
+from .services.counters import increment_counter
+from .services.occupancy import adjust_occupancy
+from .services.doctor_summary import invalidate_doctor_summary
+from .services.inpatient_billing import finalize_inpatient_charges, record_stay_change
+from .services.patient_search import index_patients
+from .services.roster import invalidate_doctor_roster
+from .services.slots import invalidate_doctor_slots
+
+
+def invalidate_on_commit(invalidate, *args):
+    # Setelah commit: pembaca yang menghitung ulang di antara bump versi dan commit
+    # akan menyimpan data lama di bawah versi baru sampai TTL habis
+    transaction.on_commit(partial(invalidate, *args))
+
+
+@receiver([post_save, post_delete], sender=Doctor)
+def invalidate_slots_for_doctor(sender, instance, **kwargs):
+    invalidate_on_commit(invalidate_doctor_slots, instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Doctor)
+@receiver([post_save, post_delete], sender=DoctorAvailability)
+def invalidate_roster(sender, instance, **kwargs):
+    invalidate_on_commit(invalidate_doctor_roster)
+
+
+@receiver([post_save, post_delete], sender=DoctorAvailability)
+@receiver([post_save, post_delete], sender=DoctorLeave)
+@receiver([post_save, post_delete], sender=MedicalRecord)
+def invalidate_slots_for_related(sender, instance, **kwargs):
+    invalidate_on_commit(invalidate_doctor_slots, instance.doctor_id)
+
+
+SLOT_FIELDS = ('doctor_id', 'examination_date', 'examination_time')
+
+
+def _appointment_closed(status, confirmation_status):
+    return status == 'cancelled' or confirmation_status == 'rejected'
+
+
+def _slot_moved(previous, instance):
+    return tuple(previous[field] for field in SLOT_FIELDS) != tuple(getattr(instance, field) for field in SLOT_FIELDS)
+
+
+@receiver(pre_save, sender=MedicalRecord)
+def remember_appointment_state(sender, instance, **kwargs):
+    instance._previous_appointment = None
+    if instance.pk:
+        instance._previous_appointment = MedicalRecord.objects.filter(pk=instance.pk).values(
+            *SLOT_FIELDS, 'status', 'confirmation_status'
+        ).first()
+
+
+@receiver(pre_save, sender=MedicalRecord)
+def claim_slot_for_moved_appointment(sender, instance, **kwargs):
+    # Jadwal diubah (atau appointment dibuka kembali): ambil slot baru sebelum menyimpan,
+    # SlotUnavailableError membatalkan penyimpanan jika slot sudah dipesan pasien lain
+    previous = instance._previous_appointment
+    if previous is None or not instance.examination_time:
+        return
+    if _appointment_closed(instance.status, instance.confirmation_status):
+        return
+    if _appointment_closed(previous['status'], previous['confirmation_status']) or _slot_moved(previous, instance):
+        claim_slot(instance.doctor, instance.examination_date, instance.examination_time)
+
+
+@receiver(post_save, sender=MedicalRecord)
+def release_previous_slot(sender, instance, **kwargs):
+    # Hanya saat berpindah ke batal/ditolak atau pindah jadwal: slot rekam medis yang
+    # sudah lama batal mungkin sudah dipesan pasien lain
+    previous = getattr(instance, '_previous_appointment', None)
+    if previous is None or _appointment_closed(previous['status'], previous['confirmation_status']):
+        return
+    if _appointment_closed(instance.status, instance.confirmation_status) or _slot_moved(previous, instance):
+        release_appointment(MedicalRecord(
+            doctor_id=previous['doctor_id'],
+            examination_date=previous['examination_date'],
+            examination_time=previous['examination_time'],
+        ))
+
+
+@receiver(post_delete, sender=MedicalRecord)
+def release_slot_for_deleted_appointment(sender, instance, **kwargs):
+    if not _appointment_closed(instance.status, instance.confirmation_status):
+        release_appointment(instance)
+
+
+@receiver([post_save, post_delete], sender=MedicalRecord)
+@receiver([post_save, post_delete], sender=Schedule)
+def invalidate_summary_for_doctor(sender, instance, **kwargs):
+    invalidate_on_commit(invalidate_doctor_summary, instance.doctor_id)
+
+
+# ==================== DASHBOARD COUNTERS ====================
+
+COUNTED_MODELS = {
+    Patient: 'patients',
+    Doctor: 'doctors',
+    Room: 'rooms',
+}
+
+
+@receiver(post_save, sender=Patient)
+@receiver(post_save, sender=Doctor)
+@receiver(post_save, sender=Room)
+def count_created(sender, instance, created, **kwargs):
+    if created:
+        increment_counter(COUNTED_MODELS[sender], 1)
+
+
+@receiver(post_delete, sender=Patient)
+@receiver(post_delete, sender=Doctor)
+@receiver(post_delete, sender=Room)
+def count_deleted(sender, instance, **kwargs):
+    increment_counter(COUNTED_MODELS[sender], -1)
+
+
+@receiver(post_save, sender=Patient)
+def index_patient_for_search(sender, instance, **kwargs):
+    index_patients([instance])
+
+
+@receiver(pre_save, sender=Inpatient)
+def remember_inpatient_state(sender, instance, **kwargs):
+    instance._was_active = False
+    instance._previous_room_id = None
+    instance._previous_dates = (None, None)
+    if instance.pk:
+        previous = Inpatient.objects.filter(pk=instance.pk).values(
+            'discharge_date', 'room_id', 'admission_date'
+        ).first()
+        instance._was_active = previous is not None and previous['discharge_date'] is None
+        instance._previous_room_id = previous and previous['room_id']
+        if previous:
+            instance._previous_dates = (previous['admission_date'], previous['discharge_date'])
+
+
+@receiver(post_save, sender=Inpatient)
+def count_active_inpatient(sender, instance, **kwargs):
+    is_active = instance.discharge_date is None
+    if is_active != instance._was_active:
+        increment_counter('active_inpatients', 1 if is_active else -1)
+
+
+@receiver(post_delete, sender=Inpatient)
+def count_deleted_inpatient(sender, instance, **kwargs):
+    if instance.discharge_date is None:
+        increment_counter('active_inpatients', -1)
+
+
+# ==================== ROOM OCCUPANCY ====================
+
+@receiver(post_save, sender=Inpatient)
+def update_room_occupancy(sender, instance, **kwargs):
+    is_active = instance.discharge_date is None
+    if is_active and instance._was_active and instance._previous_room_id == instance.room_id:
+        return
+    if instance._was_active:
+        adjust_occupancy(instance._previous_room_id, -1)
+    if is_active:
+        adjust_occupancy(instance.room_id, 1)
+
+
+@receiver(post_delete, sender=Inpatient)
+def release_room_bed(sender, instance, **kwargs):
+    if instance.discharge_date is None:
+        adjust_occupancy(instance.room_id, -1)
+
+
+# ==================== INPATIENT BILLING ====================
+
+@receiver(post_save, sender=Inpatient)
+def track_inpatient_stay(sender, instance, created, **kwargs):
+    discharged = record_stay_change(
+        instance, created, instance._was_active, instance._previous_room_id,
+        change_date=getattr(instance, '_transfer_date', None),
+        previous_admission_date=instance._previous_dates[0],
+        previous_discharge_date=instance._previous_dates[1],
+    )
+    if discharged:
+        finalize_inpatient_charges(instance)
+
+
+# ==================== PATIENT BALANCES ====================
+
+@receiver(pre_save, sender=Payment)
+def remember_payment_state(sender, instance, **kwargs):
+    instance._balance_previous = None
+    if instance.pk:
+        instance._balance_previous = Payment.objects.filter(pk=instance.pk).values(
+            'patient_id', 'amount', 'paid_amount', 'status'
+        ).first()
+
+
+@receiver(post_save, sender=Payment)
+def update_balance_on_save(sender, instance, **kwargs):
+    new = payment_contribution(instance.amount, instance.paid_amount, instance.status)
+    previous = instance._balance_previous
+    if previous is None:
+        apply_balance_delta(instance.patient_id, *new)
+        return
+
+    old = payment_contribution(previous['amount'], previous['paid_amount'], previous['status'])
+    if previous['patient_id'] != instance.patient_id:
+        apply_balance_delta(previous['patient_id'], *(-value for value in old))
+        apply_balance_delta(instance.patient_id, *new)
+    else:
+        apply_balance_delta(instance.patient_id, *(n - o for n, o in zip(new, old)))
+
+
+@receiver(post_delete, sender=Payment)
+def update_balance_on_delete(sender, instance, **kwargs):
+    old = payment_contribution(instance.amount, instance.paid_amount, instance.status)
+    apply_balance_delta(instance.patient_id, *(-value for value in old))
@@ -0,0 +1,50 @@
+from datetime import date, timedelta
+
+from core.models import Doctor, MedicalRecord, Medicine, Patient, Prescription
+from core.services.stock import receive_stock
+
+
+def create_doctor(**kwargs):
+    data = {
+        'name': 'Budi',
+        'date_of_birth': date(1980, 1, 1),
+        'gender': 'Laki-laki',
+        'specialty': 'Umum',
+        'position': 'Dokter Umum',
+        'unit': 'Poliklinik Umum',
+        'monthly_salary': 0,
+    }
+    data.update(kwargs)
+    return Doctor.objects.create(**data)
+
+
+def create_patient(**kwargs):
+    data = {
+        'name': 'Siti',
+        'date_of_birth': date(1990, 1, 1),
+        'gender': 'Perempuan',
+    }
+    data.update(kwargs)
+    return Patient.objects.create(**data)
+
+
+def create_medicine(name='Paracetamol', stock=0):
+    medicine = Medicine.objects.create(
+        name=name, medicine_class='Bebas', medicine_type='Tablet',
+        expiry_date=date.today() + timedelta(days=365), price=1000,
+    )
+    if stock:
+        receive_stock(medicine, stock)
+    return medicine
+
+
+def create_prescriptions(medicine, count, quantity=1):
+    record = MedicalRecord.objects.create(
+        patient=create_patient(), doctor=create_doctor(), examination_date=date.today(), diagnosis='Demam'
+    )
+    return Prescription.objects.bulk_create([
+        Prescription(
+            medical_record=record, medicine=medicine, prescription_date=date.today(), dosage='3x1', quantity=quantity
+        )
+        for _ in range(count)
+    ])
@@ -0,0 +1,66 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from core.models import PatientBalance, Payment
+from core.services.balances import compute_patient_balances, refresh_patient_balances
+from accounts.models import User
+
+from .helpers import create_patient
+
+
+class PatientBalanceTests(TestCase):
+    def setUp(self):
+        self.patient = create_patient()
+
+    def assert_balance_in_sync(self):
+        balance = PatientBalance.objects.get(patient=self.patient)
+        self.assertEqual(
+            (balance.total_amount, balance.total_paid, balance.overdue_amount),
+            compute_patient_balances([self.patient.pk])[self.patient.pk],
+        )
+
+    def test_snapshot_follows_payment_changes(self):
+        first = Payment.objects.create(patient=self.patient, amount=100000, invoice_number='INV-A')
+        second = Payment.objects.create(patient=self.patient, amount=50000, invoice_number='INV-B')
+        self.assert_balance_in_sync()
+
+        first.paid_amount = 40000
+        first.status = 'partial'
+        first.save()
+        second.status = 'overdue'
+        second.save()
+        self.assert_balance_in_sync()
+        self.assertEqual(PatientBalance.objects.get(patient=self.patient).overdue_amount, 50000)
+
+        second.delete()
+        self.assert_balance_in_sync()
+
+    def test_refresh_without_conflict_target_updates_and_inserts(self):
+        # MySQL: bulk_create(update_conflicts=True) tidak mendukung unique_fields
+        other = create_patient(name='Ani')
+        Payment.objects.create(patient=self.patient, amount=100000, invoice_number='INV-M1')
+        Payment.objects.create(patient=other, amount=30000, invoice_number='INV-M2')
+        PatientBalance.objects.filter(patient=self.patient).update(total_amount=1)
+        PatientBalance.objects.filter(patient=other).delete()
+
+        with mock.patch.object(connection.features, 'supports_update_conflicts_with_target', False):
+            refresh_patient_balances([self.patient.pk, other.pk])
+
+        self.assert_balance_in_sync()
+        self.assertEqual(PatientBalance.objects.get(patient=other).total_amount, 30000)
+        self.assertEqual(PatientBalance.objects.count(), 2)
+
+    def test_bills_page_reads_totals_from_snapshot(self):
+        user = User.objects.create_user(
+            username='pasien', password='rahasia123', role='patient', patient_profile=self.patient
+        )
+        Payment.objects.create(patient=self.patient, amount=75000, paid_amount=25000, invoice_number='INV-C')
+        self.client.force_login(user)
+
+        response = self.client.get(reverse('patient_bills'))
+
+        self.assertEqual(response.context['total_amount'], 75000)
+        self.assertEqual(response.context['pending_amount'], 50000)
@@ -0,0 +1,140 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, time, timedelta
+from threading import Barrier
+
+from django.db import connection
+from django.forms.models import model_to_dict
+from django.test import TestCase, TransactionTestCase
+
+from core.admin import MedicalRecordAdminForm
+from core.models import MedicalRecord, Patient, Schedule
+from core.services.booking import SlotUnavailableError, release_appointment, reserve_appointment
+
+from .helpers import create_doctor, create_patient
+
+
+class ReserveAppointmentTests(TestCase):
+    def setUp(self):
+        self.doctor = create_doctor()
+        self.examination_date = date.today() + timedelta(days=1)
+
+    def test_second_booking_for_same_slot_is_rejected(self):
+        reserve_appointment(create_patient(), self.doctor, self.examination_date, time(9))
+
+        with self.assertRaises(SlotUnavailableError):
+            reserve_appointment(create_patient(name='Ani'), self.doctor, self.examination_date, time(9))
+
+        self.assertEqual(MedicalRecord.objects.count(), 1)
+
+    def test_released_slot_can_be_booked_again(self):
+        record = reserve_appointment(create_patient(), self.doctor, self.examination_date, time(9))
+        release_appointment(record)
+
+        reserve_appointment(create_patient(name='Ani'), self.doctor, self.examination_date, time(9))
+
+        self.assertEqual(Schedule.objects.get().status, 'booked')
+
+    def test_old_cancelled_record_does_not_release_rebooked_slot(self):
+        cancelled = reserve_appointment(create_patient(), self.doctor, self.examination_date, time(9))
+        cancelled.status = 'cancelled'
+        cancelled.save()
+        self.assertEqual(Schedule.objects.get().status, 'available')
+
+        reserve_appointment(create_patient(name='Ani'), self.doctor, self.examination_date, time(9))
+        cancelled.notes = 'Koreksi catatan'
+        cancelled.save()
+        cancelled.delete()
+
+        self.assertEqual(Schedule.objects.get().status, 'booked')
+        with self.assertRaises(SlotUnavailableError):
+            reserve_appointment(create_patient(name='Budi'), self.doctor, self.examination_date, time(9))
+
+    def test_deleting_active_record_releases_slot(self):
+        reserve_appointment(create_patient(), self.doctor, self.examination_date, time(9)).delete()
+
+        self.assertEqual(Schedule.objects.get().status, 'available')
+
+    def test_rescheduling_moves_the_booked_slot(self):
+        record = reserve_appointment(create_patient(), self.doctor, self.examination_date, time(9))
+
+        record.examination_time = time(10)
+        record.save()
+
+        self.assertEqual(
+            dict(Schedule.objects.values_list('examination_time', 'status')),
+            {time(9): 'available', time(10): 'booked'},
+        )
+        reserve_appointment(create_patient(name='Ani'), self.doctor, self.examination_date, time(9))
+        with self.assertRaises(SlotUnavailableError):
+            reserve_appointment(create_patient(name='Budi'), self.doctor, self.examination_date, time(10))
+
+    def test_rescheduling_onto_booked_slot_is_rejected(self):
+        record = reserve_appointment(create_patient(), self.doctor, self.examination_date, time(9))
+        reserve_appointment(create_patient(name='Ani'), self.doctor, self.examination_date, time(10))
+
+        record.examination_time = time(10)
+        with self.assertRaises(SlotUnavailableError):
+            record.save()
+
+        self.assertEqual(MedicalRecord.objects.get(pk=record.pk).examination_time, time(9))
+        self.assertEqual(set(Schedule.objects.values_list('status', flat=True)), {'booked'})
+
+    def test_admin_form_rejects_move_onto_booked_slot(self):
+        record = reserve_appointment(create_patient(), self.doctor, self.examination_date, time(9))
+        reserve_appointment(create_patient(name='Ani'), self.doctor, self.examination_date, time(10))
+        data = model_to_dict(record, exclude=['id'])
+
+        form = MedicalRecordAdminForm({**data, 'examination_time': '10:00'}, instance=record)
+
+        self.assertIn('examination_time', form.errors)
+        self.assertTrue(MedicalRecordAdminForm({**data, 'examination_time': '11:00'}, instance=record).is_valid())
+
+    def test_unavailable_schedule_cannot_be_booked(self):
+        Schedule.objects.create(
+            doctor=self.doctor,
+            examination_date=self.examination_date,
+            examination_time=time(9),
+            status='unavailable',
+        )
+
+        with self.assertRaises(SlotUnavailableError):
+            reserve_appointment(create_patient(), self.doctor, self.examination_date, time(9))
+
+
+class ConcurrentBookingStressTests(TransactionTestCase):
+    workers = 200
+
+    def setUp(self):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest("SQLite in-memory tidak mendukung koneksi paralel")
+
+    def test_parallel_bookings_produce_no_duplicates(self):
+        doctor = create_doctor()
+        patients = Patient.objects.bulk_create([
+            Patient(name=f'Pasien {i}', date_of_birth=date(1990, 1, 1), gender='Perempuan')
+            for i in range(self.workers)
+        ])
+        examination_date = date.today() + timedelta(days=1)
+        barrier = Barrier(self.workers)
+
+        def book(patient):
+            barrier.wait()
+            try:
+                reserve_appointment(patient, doctor, examination_date, time(9))
+                return 'booked'
+            except SlotUnavailableError:
+                return 'rejected'
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = list(executor.map(book, patients))
+
+        self.assertEqual(results.count('booked'), 1)
+        self.assertEqual(results.count('rejected'), self.workers - 1)
+        self.assertEqual(
+            MedicalRecord.objects.filter(
+                doctor=doctor, examination_date=examination_date, examination_time=time(9)
+            ).count(),
+            1,
+        )
@@ -0,0 +1,47 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from core.cache import get_cache_stats, get_or_compute, invalidate_tags, reset_cache_stats
+from core.models import Doctor
+from core.services.roster import get_doctor_roster
+
+from .helpers import create_doctor
+
+
+class CacheAsideTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        reset_cache_stats()
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return self.calls
+
+    def test_value_is_cached_until_tag_is_invalidated(self):
+        self.assertEqual(get_or_compute('test:a', self.compute, 60, tags=['t1', 't2']), 1)
+        self.assertEqual(get_or_compute('test:a', self.compute, 60, tags=['t1', 't2']), 1)
+
+        invalidate_tags('t2')
+
+        self.assertEqual(get_or_compute('test:a', self.compute, 60, tags=['t1', 't2']), 2)
+        stats = get_cache_stats()['test']
+        self.assertEqual((stats['hits'], stats['misses']), (1, 2))
+
+    def test_doctor_signals_invalidate_cached_reads(self):
+        doctor = create_doctor()
+        get_doctor_roster()
+        get_doctor_roster()
+        Doctor.objects.filter(pk=doctor.pk).update(name='Tanpa Signal')
+        self.assertEqual(get_doctor_roster()[0]['name'], 'Budi')
+
+        doctor.name = 'Budi Santoso'
+        with self.captureOnCommitCallbacks() as callbacks:
+            doctor.save()
+        # Versi tag baru di-bump setelah commit, bukan di dalam transaksi penulis
+        self.assertEqual(get_doctor_roster()[0]['name'], 'Budi')
+        for callback in callbacks:
+            callback()
+
+        self.assertEqual(get_doctor_roster()[0]['name'], 'Budi Santoso')
+        self.assertGreaterEqual(get_cache_stats()['doctor_roster']['hits'], 2)
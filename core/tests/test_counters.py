@@ -0,0 +1,56 @@
+from datetime import date
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from core.models import DashboardCounter, Room
+from core.services.counters import get_dashboard_counters
+from core.services.occupancy import admit_patient, discharge_patient
+
+from .helpers import create_doctor, create_patient
+
+
+class DashboardCounterTests(TestCase):
+    def setUp(self):
+        # Bangun counter dari tabel sumber (masih kosong)
+        get_dashboard_counters()
+
+    def counters(self):
+        return dict(DashboardCounter.objects.values_list('name', 'value'))
+
+    def test_signals_keep_counters_in_sync(self):
+        doctor = create_doctor()
+        patient = create_patient()
+        visitor = create_patient(name='Ani')
+        room = Room.objects.create(name='ICU 1', room_type='ICU', capacity=2, daily_rate=1000000)
+        stay = admit_patient(patient, room, date(2025, 1, 1), 'Observasi')
+        self.assertEqual(
+            self.counters(), {'patients': 2, 'doctors': 1, 'rooms': 1, 'active_inpatients': 1}
+        )
+
+        discharge_patient(stay, date(2025, 1, 3))
+        self.assertEqual(self.counters()['active_inpatients'], 0)
+
+        stay.delete()
+        doctor.delete()
+        visitor.delete()
+        self.assertEqual(
+            self.counters(), {'patients': 1, 'doctors': 0, 'rooms': 1, 'active_inpatients': 0}
+        )
+
+    def test_check_reports_drift_and_rebuild_repairs_it(self):
+        create_patient()
+        create_patient(name='Ani')
+        DashboardCounter.objects.filter(name='patients').update(value=5)
+
+        out = StringIO()
+        with self.assertRaisesMessage(CommandError, 'patients'):
+            call_command('rebuild_counters', '--check', stdout=out)
+        self.assertIn('patients: tersimpan=5, aktual=2', out.getvalue())
+        self.assertEqual(self.counters()['patients'], 5)
+
+        call_command('rebuild_counters', stdout=StringIO())
+
+        self.assertEqual(self.counters()['patients'], 2)
+        call_command('rebuild_counters', '--check', stdout=StringIO())
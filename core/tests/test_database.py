@@ -0,0 +1,98 @@
+import json
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.conf import settings
+from django.db import connection, router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+
+from core.middleware import PIN_PRIMARY_COOKIE, ReplicaRoutingMiddleware
+from core.models import Patient
+from core.routers import use_primary, use_replica
+
+from .helpers import create_patient
+
+
+class ConnectionBenchmarkTests(TestCase):
+    def test_persistent_connections_are_reused_per_thread(self):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest("SQLite in-memory tidak mendukung koneksi paralel")
+        out = StringIO()
+        original = connection.settings_dict['CONN_MAX_AGE']
+        connection.settings_dict['CONN_MAX_AGE'] = 60
+        try:
+            call_command('benchmark_connections', requests=5, concurrency=2, json=True, stdout=out)
+        finally:
+            connection.settings_dict['CONN_MAX_AGE'] = original
+
+        results = json.loads(out.getvalue())
+        self.assertEqual(results['fresh']['connections_opened'], 10)
+        self.assertEqual(results['configured']['connections_opened'], 2)
+
+
+@override_settings(DATABASE_REPLICAS=['replica_1'])
+class PrimaryReplicaRouterTests(SimpleTestCase):
+    def run_request(self, method='get', cookies=None, write=False):
+        routed = {}
+
+        def view(request):
+            routed['before_write'] = router.db_for_read(Patient)
+            if write:
+                router.db_for_write(Patient)
+                routed['after_write'] = router.db_for_read(Patient)
+            return HttpResponse()
+
+        request = getattr(RequestFactory(), method)('/')
+        request.COOKIES.update(cookies or {})
+        response = ReplicaRoutingMiddleware(view)(request)
+        return routed, response
+
+    def test_reads_outside_request_use_primary(self):
+        self.assertEqual(router.db_for_read(Patient), 'default')
+        with use_replica():
+            self.assertEqual(router.db_for_read(Patient), 'replica_1')
+            with use_primary():
+                self.assertEqual(router.db_for_read(Patient), 'default')
+        self.assertEqual(router.db_for_write(Patient), 'default')
+
+    def test_safe_request_reads_from_replica(self):
+        routed, response = self.run_request()
+
+        self.assertEqual(routed['before_write'], 'replica_1')
+        self.assertNotIn(PIN_PRIMARY_COOKIE, response.cookies)
+
+    def test_post_stays_on_primary_and_pins_next_request(self):
+        routed, response = self.run_request('post')
+        self.assertEqual(routed['before_write'], 'default')
+        self.assertIn(PIN_PRIMARY_COOKIE, response.cookies)
+
+        routed, _ = self.run_request(cookies={PIN_PRIMARY_COOKIE: '1'})
+        self.assertEqual(routed['before_write'], 'default')
+
+    def test_write_during_get_switches_to_primary(self):
+        routed, response = self.run_request(write=True)
+
+        self.assertEqual(routed, {'before_write': 'replica_1', 'after_write': 'default'})
+        self.assertIn(PIN_PRIMARY_COOKIE, response.cookies)
+
+
+@skipUnless(
+    settings.DATABASE_REPLICAS
+    and not settings.DATABASES[settings.DATABASE_REPLICAS[0]].get('TEST', {}).get('MIRROR'),
+    'Butuh replica SQLite terpisah, contoh: DB_ENGINE=sqlite DB_REPLICAS=replica.sqlite3',
+)
+class PrimaryReplicaDatabaseTests(TransactionTestCase):
+    databases = '__all__'
+
+    def test_reads_hit_replica_database_and_writes_hit_primary(self):
+        create_patient(name='Hanya Di Primary')
+
+        with use_replica():
+            self.assertFalse(Patient.objects.filter(name='Hanya Di Primary').exists())
+            create_patient(name='Tulis Lewat Replica Context')
+            # Setelah menulis, baca berikutnya kembali ke primary
+            self.assertTrue(Patient.objects.filter(name='Tulis Lewat Replica Context').exists())
+        self.assertEqual(Patient.objects.using('replica_1').count(), 0)
+        self.assertEqual(Patient.objects.count(), 2)
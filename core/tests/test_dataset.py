@@ -0,0 +1,34 @@
+from django.db.models import Count
+from django.test import TestCase
+
+from core.models import MedicalRecord, PatientBalance, Payment, Schedule
+from core.services.counters import rebuild_counters
+from core.services.dataset import generate_dataset
+from accounts.models import User
+
+
+class DatasetGeneratorTests(TestCase):
+    def test_generates_requested_scale_with_synced_aggregates(self):
+        scale = {
+            'suppliers': 2, 'medicines': 5, 'rooms': 3, 'doctors': 4, 'patients': 30,
+            'records': 60, 'prescriptions': 40, 'payments': 25, 'inpatients': 10,
+        }
+        counts = generate_dataset(scale, batch_size=7)
+
+        self.assertEqual(counts, scale)
+        self.assertTrue(all(stored == actual for _, stored, actual in rebuild_counters(check_only=True)))
+        self.assertEqual(PatientBalance.objects.count(), Payment.objects.values('patient').distinct().count())
+        self.assertTrue(User.objects.filter(username='bench_doctor', role='doctor').exists())
+
+        # Slot unik dan setiap appointment aktif memegang slot 'booked'-nya
+        slots = MedicalRecord.objects.values('doctor_id', 'examination_date', 'examination_time')
+        self.assertFalse(slots.annotate(total=Count('id')).filter(total__gt=1).exists())
+        active = set(
+            MedicalRecord.objects.filter(status__in=('pending', 'confirmed'))
+            .values_list('doctor_id', 'examination_date', 'examination_time')
+        )
+        self.assertTrue(active)
+        self.assertEqual(
+            set(Schedule.objects.filter(status='booked').values_list('doctor_id', 'examination_date', 'examination_time')),
+            active,
+        )
@@ -0,0 +1,56 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from core.management.commands.explain_queries import find_full_scans, view_queries
+
+from .helpers import create_doctor, create_patient
+
+
+class ExplainQueriesCommandTests(TestCase):
+    def test_explains_every_view_query_on_test_database(self):
+        create_doctor()
+        create_patient()
+        out = StringIO()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'explain.json')
+
+            call_command('explain_queries', output=path, stdout=out)
+
+            with open(path) as fh:
+                results = json.load(fh)
+        self.assertEqual(set(results), set(view_queries(1, 1)))
+        for name in results:
+            self.assertIn(f'{name}: ', out.getvalue())
+
+
+class FindFullScansTests(SimpleTestCase):
+    def test_mysql_json_plan(self):
+        plan = json.dumps({'query_block': {
+            'ordering_operation': {'nested_loop': [
+                {'table': {'table_name': 'core_medicalrecord', 'access_type': 'ALL', 'rows_examined_per_scan': 5000}},
+                {'table': {'table_name': 'core_patient', 'access_type': 'eq_ref', 'key': 'PRIMARY'}},
+            ]},
+        }})
+
+        self.assertEqual(find_full_scans(plan, 'mysql'), ['core_medicalrecord'])
+
+    def test_postgresql_json_plan(self):
+        plan = json.dumps([{'Plan': {
+            'Node Type': 'Limit',
+            'Plans': [
+                {'Node Type': 'Seq Scan', 'Relation Name': 'core_payment'},
+                {'Node Type': 'Index Scan', 'Relation Name': 'core_patient', 'Index Name': 'core_patient_pkey'},
+            ],
+        }}])
+
+        self.assertEqual(find_full_scans(plan, 'postgresql'), ['core_payment'])
+
+    def test_sqlite_text_plan(self):
+        plan = '2 0 0 SCAN core_inpatient\n5 0 0 SCAN core_schedule USING INDEX schedule_idx'
+
+        self.assertEqual(find_full_scans(plan, 'sqlite'), ['core_inpatient'])
@@ -0,0 +1,56 @@
+from datetime import date, datetime
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import Patient, Payment
+from core.services.exports import EXPORTS, filter_dates, stream_csv
+from accounts.models import User
+
+from .helpers import create_patient
+
+
+class CsvExportTests(TestCase):
+    def setUp(self):
+        self.patient = create_patient(name='Siti, S.Pd')
+        for number in range(5):
+            Payment.objects.create(
+                patient=self.patient, amount=1000 * (number + 1), invoice_number=f'INV-E{number}',
+                created_at=timezone.make_aware(datetime(2026, 3, 1 + number, 23, 30)),
+            )
+
+    def test_rows_are_streamed_in_keyset_pages(self):
+        with self.assertNumQueries(3):
+            lines = list(stream_csv(EXPORTS['payments'], chunk_size=2, bom=False))
+
+        self.assertEqual(len(lines), 6)
+        self.assertTrue(lines[0].startswith('ID,No. Invoice,Pasien'))
+        self.assertIn('INV-E0,"Siti, S.Pd",Konsultasi Medis,1000.00', lines[1])
+        # Waktu lokal (Asia/Jakarta), bukan UTC
+        self.assertIn('2026-03-01 23:30:00', lines[1])
+
+        queryset = filter_dates(EXPORTS['payments'], Payment.objects.all(), date(2026, 3, 2), date(2026, 3, 3))
+        self.assertEqual(sorted(queryset.values_list('invoice_number', flat=True)), ['INV-E1', 'INV-E2'])
+
+    def test_admin_action_returns_streaming_csv(self):
+        self.client.force_login(User.objects.create_superuser('keuangan', 'keuangan@example.com', 'rahasia123'))
+
+        response = self.client.post(reverse('admin:core_payment_changelist'), {
+            'action': 'export_csv',
+            '_selected_action': list(Payment.objects.filter(amount__gte=4000).values_list('pk', flat=True)),
+        })
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        content = b''.join(response.streaming_content).decode('utf-8-sig')
+        self.assertEqual([line.split(',')[1] for line in content.splitlines()[1:]], ['INV-E3', 'INV-E4'])
+
+    def test_formula_cells_are_escaped(self):
+        Payment.objects.filter(invoice_number='INV-E0').update(service_name='=HYPERLINK("http://x","klik")')
+        Patient.objects.filter(pk=self.patient.pk).update(name='@SUM(A1)')
+
+        lines = list(stream_csv(EXPORTS['payments'], bom=False))
+
+        self.assertIn(',\'@SUM(A1),"\'=HYPERLINK(""http://x"",""klik"")",', lines[1])
+        self.assertIn(",'@SUM(A1),Konsultasi Medis,2000.00", lines[2])
@@ -0,0 +1,101 @@
+from datetime import date
+from importlib import import_module
+
+from django.apps import apps
+from django.test import TestCase
+
+from core.models import Inpatient, InpatientStay, Payment, Room
+from core.services.inpatient_billing import accrue_inpatient_charges, create_missing_stays
+from core.services.occupancy import admit_patient, discharge_patient, transfer_patient
+from core.services.invoices import allocate_invoice_numbers
+
+from .helpers import create_patient
+
+
+class InpatientBillingTests(TestCase):
+    def setUp(self):
+        self.ward = Room.objects.create(name='Kelas 1A', room_type='Kelas 1', capacity=4, daily_rate=300000)
+        self.icu = Room.objects.create(name='ICU 1', room_type='ICU', capacity=2, daily_rate=1000000)
+        self.patient = create_patient()
+
+    def test_nightly_accrual_bills_all_active_stays_in_bulk(self):
+        stays = [admit_patient(self.patient, self.ward, date(2025, 1, 1), 'Tifus') for _ in range(3)]
+        transfer_patient(stays[0], self.icu, date(2025, 1, 3))
+        allocate_invoice_numbers(1)  # baris sequence invoice sudah ada
+
+        # Jumlah query tetap, tidak bergantung jumlah pasien rawat inap
+        with self.assertNumQueries(16):
+            result = accrue_inpatient_charges(as_of=date(2025, 1, 5))
+
+        self.assertEqual(result, {'inpatients': 3, 'payments_created': 3})
+        stays[0].refresh_from_db()
+        # 2 malam kelas 1 + 2 malam ICU
+        self.assertEqual(stays[0].cost, 2 * 300000 + 2 * 1000000)
+        self.assertEqual(stays[0].payment.amount, stays[0].cost)
+        self.assertEqual(stays[0].accrued_through, date(2025, 1, 5))
+        self.assertEqual(self.patient.balance.total_amount, 2600000 + 2 * 4 * 300000)
+
+    def test_discharge_finalizes_bill_and_marks_paid_bill_partial_when_it_grows(self):
+        stay = admit_patient(self.patient, self.ward, date(2025, 1, 1), 'Tifus')
+        accrue_inpatient_charges(as_of=date(2025, 1, 3))
+        stay.refresh_from_db()
+        Payment.objects.filter(pk=stay.payment_id).update(paid_amount=600000, status='paid')
+
+        discharge_patient(stay, date(2025, 1, 6))
+
+        stay.refresh_from_db()
+        self.assertEqual(stay.cost, 5 * 300000)
+        self.assertEqual((stay.payment.amount, stay.payment.status), (1500000, 'partial'))
+        self.assertEqual(InpatientStay.objects.get(inpatient=stay).end_date, date(2025, 1, 6))
+        # Sudah final: accrual berikutnya tidak menyentuhnya lagi
+        self.assertEqual(accrue_inpatient_charges(as_of=date(2025, 2, 1))['inpatients'], 0)
+
+    def test_corrected_dates_move_segments_and_refinalize_bill(self):
+        stay = admit_patient(self.patient, self.ward, date(2025, 1, 1), 'Tifus')
+        transfer_patient(stay, self.icu, date(2025, 1, 2))
+        discharge_patient(stay, date(2025, 1, 3))
+        stay.refresh_from_db()
+        self.assertEqual(stay.cost, 300000 + 1000000)
+
+        # Koreksi lewat admin: masuk sehari lebih awal, pulang seminggu lebih lambat
+        stay.admission_date = date(2024, 12, 31)
+        stay.discharge_date = date(2025, 1, 10)
+        stay.save()
+
+        stay.refresh_from_db()
+        self.assertEqual(
+            list(InpatientStay.objects.filter(inpatient=stay).values_list('start_date', 'end_date')),
+            [(date(2024, 12, 31), date(2025, 1, 2)), (date(2025, 1, 2), date(2025, 1, 10))],
+        )
+        self.assertEqual(stay.cost, 2 * 300000 + 8 * 1000000)
+        self.assertEqual((stay.payment.amount, stay.accrued_through), (stay.cost, date(2025, 1, 10)))
+
+    def test_legacy_discharged_stays_are_not_billed_again(self):
+        # Data sebelum migrasi 0014: cost diisi manual, tanpa Payment dan accrued_through
+        Inpatient.objects.bulk_create([
+            Inpatient(
+                patient=self.patient, room=self.ward, admission_date=date(2024, 6, 1),
+                discharge_date=date(2024, 6, 4), diagnosis='Tifus', cost=750000,
+            ),
+            Inpatient(patient=self.patient, room=self.icu, admission_date=date(2025, 1, 1), diagnosis='Sepsis'),
+        ])
+        create_missing_stays()
+        import_module('core.migrations.0019_inpatient_legacy_accrual').mark_legacy_stays_accrued(apps, None)
+
+        result = accrue_inpatient_charges(as_of=date(2025, 1, 3))
+
+        # Hanya rawat inap yang masih aktif ditagih
+        self.assertEqual(result, {'inpatients': 1, 'payments_created': 1})
+        legacy = Inpatient.objects.get(discharge_date=date(2024, 6, 4))
+        self.assertEqual((legacy.cost, legacy.payment_id), (750000, None))
+        self.assertEqual(Payment.objects.get().amount, 2 * 1000000)
+
+    def test_long_icu_stay_fits_cost_field(self):
+        icu = Room.objects.create(name='ICU 2', room_type='ICU', capacity=1, daily_rate=3000000)
+        stay = admit_patient(self.patient, icu, date(2025, 1, 1), 'Sepsis')
+
+        discharge_patient(stay, date(2025, 2, 4))
+
+        stay.refresh_from_db()
+        self.assertEqual(stay.cost, 34 * 3000000)
+        self.assertEqual(stay.payment.amount, 102000000)
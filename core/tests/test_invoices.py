@@ -0,0 +1,57 @@
+from unittest import mock
+
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+
+from core.models import InvoiceSequence, Payment
+from core.services.invoices import allocate_invoice_numbers, assign_invoice_numbers
+
+from .helpers import create_patient
+
+
+class InvoiceNumberTests(TestCase):
+    def test_same_patient_same_second_gets_distinct_numbers(self):
+        patient = create_patient()
+        first = Payment.objects.create(patient=patient, amount=1000)
+        second = Payment.objects.create(patient=patient, amount=1000)
+
+        self.assertNotEqual(first.invoice_number, second.invoice_number)
+
+    def test_blocks_are_contiguous_and_disjoint(self):
+        first = allocate_invoice_numbers(3, year=2030)
+        second = allocate_invoice_numbers(2, year=2030)
+
+        self.assertEqual(first, ['INV-2030-00000001', 'INV-2030-00000002', 'INV-2030-00000003'])
+        self.assertEqual(second, ['INV-2030-00000004', 'INV-2030-00000005'])
+
+    def test_bulk_create_with_assigned_numbers(self):
+        payments = [Payment(amount=1000) for _ in range(50)] + [Payment(amount=1000, invoice_number='INV-MANUAL')]
+        allocate_invoice_numbers(1)
+        # SAVEPOINT, UPDATE, SELECT, RELEASE -- tidak tergantung jumlah invoice
+        with self.assertNumQueries(4):
+            assign_invoice_numbers(payments)
+        Payment.objects.bulk_create(payments)
+
+        self.assertEqual(Payment.objects.values('invoice_number').distinct().count(), 51)
+
+
+class InvoiceBlockConnectionTests(TransactionTestCase):
+    def setUp(self):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest("SQLite in-memory tidak mendukung koneksi paralel")
+
+    def test_block_inside_transaction_is_committed_on_own_connection(self):
+        # MySQL/PostgreSQL: kunci baris sequence tidak ikut transaksi pemanggil
+        with mock.patch.object(connection.features, 'has_select_for_update', True):
+            with self.assertRaises(RuntimeError):
+                with transaction.atomic():
+                    with self.assertNumQueries(0):
+                        first = allocate_invoice_numbers(2, year=2031)
+                    raise RuntimeError('transaksi pemanggil dibatalkan')
+            with transaction.atomic():
+                second = allocate_invoice_numbers(1, year=2031)
+
+        self.assertEqual(first, ['INV-2031-00000001', 'INV-2031-00000002'])
+        # Blok yang dibatalkan tetap terpakai (celah nomor diperbolehkan)
+        self.assertEqual(second, ['INV-2031-00000003'])
+        self.assertEqual(InvoiceSequence.objects.get(name='INV-2031').last_value, 3)
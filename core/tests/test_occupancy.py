@@ -0,0 +1,80 @@
+from datetime import date
+
+from django.test import TestCase
+
+from core.models import Room
+from core.services.counters import rebuild_counters
+from core.services.occupancy import (
+    RoomFullError, admit_patient, discharge_patient, free_beds_by_room_type, occupancy_timeline,
+)
+
+from .helpers import create_patient
+
+
+class RoomOccupancyTests(TestCase):
+    def setUp(self):
+        self.icu = Room.objects.create(name='ICU 1', room_type='ICU', capacity=2, daily_rate=1000000)
+        self.vip = Room.objects.create(name='VIP 1', room_type='VIP', capacity=1, daily_rate=750000)
+        self.patient = create_patient()
+
+    def admit(self, room, admission_date=date(2025, 1, 1)):
+        return admit_patient(self.patient, room, admission_date, 'Observasi')
+
+    def test_admission_and_discharge_update_counters(self):
+        first = self.admit(self.icu)
+        self.admit(self.icu)
+        with self.assertRaises(RoomFullError):
+            self.admit(self.icu)
+
+        discharge_patient(first, date(2025, 1, 3))
+
+        self.icu.refresh_from_db()
+        self.assertEqual(self.icu.occupied_beds, 1)
+        with self.assertNumQueries(1):
+            beds = free_beds_by_room_type()
+        self.assertEqual(beds['ICU'], {'capacity': 2, 'occupied': 1, 'free': 1})
+        self.assertEqual(beds['VIP']['free'], 1)
+
+    def test_transfer_and_delete_move_beds(self):
+        stay = self.admit(self.icu)
+        stay.room = self.vip
+        stay.save()
+        self.assertEqual(
+            dict(Room.objects.values_list('name', 'occupied_beds')), {'ICU 1': 0, 'VIP 1': 1}
+        )
+
+        stay.delete()
+
+        self.assertEqual(Room.objects.get(pk=self.vip.pk).occupied_beds, 0)
+        self.assertFalse([name for name, _, _ in rebuild_counters(check_only=True) if name.startswith('occupied_beds:')])
+
+    def test_timeline_counts_nights_until_discharge(self):
+        short = self.admit(self.icu, date(2025, 1, 2))
+        discharge_patient(short, date(2025, 1, 4))
+        self.admit(self.icu, date(2024, 12, 30))
+        self.admit(self.vip, date(2025, 1, 3))
+
+        timeline = occupancy_timeline(date(2025, 1, 1), date(2025, 1, 5), room_type='ICU')
+
+        self.assertEqual([day['occupied'] for day in timeline], [1, 2, 2, 1, 1])
+        self.assertEqual(timeline[0]['free'], 1)
+
+    def test_timeline_correction_is_a_range_query(self):
+        self.admit(self.icu, date(2024, 12, 30))
+
+        with self.assertNumQueries(4) as queries:
+            occupancy_timeline(date(2025, 1, 1), date(2025, 1, 5))
+
+        # Query koreksi start_date dibatasi di WHERE (range scan), bukan hanya FILTER aggregate
+        where = queries[1]['sql'].split(' WHERE ', 1)[1]
+        self.assertIn('"discharge_date" IS NULL', where)
+        self.assertIn('"admission_date" <=', where)
+
+    def test_rebuild_counters_repairs_room_drift(self):
+        self.admit(self.icu)
+        Room.objects.filter(pk=self.icu.pk).update(occupied_beds=0)
+
+        report = rebuild_counters()
+
+        self.assertIn(('occupied_beds:ICU 1', 0, 1), report)
+        self.assertEqual(Room.objects.get(pk=self.icu.pk).occupied_beds, 1)
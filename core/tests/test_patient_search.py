@@ -0,0 +1,51 @@
+from datetime import date
+
+from django.test import TestCase
+from django.urls import reverse
+
+from core.models import MedicalRecord
+from core.services.patient_search import matching_patients, search_patients
+from accounts.models import User
+
+from .helpers import create_doctor, create_patient
+
+
+class PatientSearchTests(TestCase):
+    def setUp(self):
+        self.budi = create_patient(name='Budi Santoso', phone='0812-3456-7890', bpjs_status='0001234567')
+        self.budiman = create_patient(name='Budiman Hakim', phone='0813000111')
+        self.siti = create_patient(name='Siti Budiarti', phone='0856000222')
+
+    def test_prefix_terms_are_ranked_exact_first(self):
+        results = list(search_patients('budi'))
+
+        self.assertEqual(results[0], self.budi)
+        self.assertCountEqual(results, [self.budi, self.budiman, self.siti])
+
+    def test_all_terms_must_match(self):
+        self.assertEqual(list(search_patients('budi san')), [self.budi])
+        self.assertFalse(search_patients('budi hakimx').exists())
+
+    def test_phone_and_bpjs_numbers(self):
+        self.assertEqual(list(matching_patients('0812 3456')), [self.budi])
+        self.assertEqual(list(matching_patients('000123')), [self.budi])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.budi.name = 'Agus Salim'
+        self.budi.save()
+        self.assertFalse(matching_patients('santoso').exists())
+        self.assertEqual(list(matching_patients('salim')), [self.budi])
+
+        self.budi.delete()
+        self.assertFalse(matching_patients('salim').exists())
+
+    def test_doctor_patient_list_keeps_q_parameter(self):
+        doctor = create_doctor()
+        user = User.objects.create_user(username='dokter', password='rahasia123', role='doctor', doctor_profile=doctor)
+        for patient in (self.budi, self.siti):
+            MedicalRecord.objects.create(patient=patient, doctor=doctor, examination_date=date(2030, 1, 1))
+        self.client.force_login(user)
+
+        response = self.client.get(reverse('doctor:patient_list'), {'q': 'santoso'})
+
+        self.assertEqual(list(response.context['patients']), [self.budi])
@@ -0,0 +1,51 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.services.query_stats import collect_stats, fingerprint, registry, reset_stats
+from accounts.models import User
+
+
+class QueryInstrumentationTests(TestCase):
+    def setUp(self):
+        reset_stats()
+        self.admin = User.objects.create_user(username='admin', password='rahasia123', role='admin')
+
+    def test_fingerprint_groups_same_query_with_different_params(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM t WHERE id = 5 AND name = \'a\''),
+            fingerprint('SELECT * FROM t WHERE id = 7 AND name = \'b\''),
+        )
+        self.assertEqual(fingerprint('WHERE id IN (%s, %s, %s)'), 'WHERE id IN (...)')
+
+    @override_settings(DEBUG=True)
+    def test_debug_headers_and_aggregated_stats(self):
+        self.client.force_login(self.admin)
+
+        response = self.client.get(reverse('admin_dashboard'))
+        self.assertGreater(int(response['X-Query-Count']), 0)
+        self.assertIn('X-Render-Time-Ms', response)
+
+        stats = self.client.get(reverse('query_stats')).json()['views']
+        self.assertEqual(stats['admin_dashboard']['requests'], 1)
+
+    def test_forked_workers_flush_under_their_own_pid(self):
+        # gunicorn --preload: key proses dihitung saat flush, bukan saat import di master
+        queries = SimpleNamespace(count=3, sql_seconds=0.002, duplicates={})
+        for pid in (101, 102):
+            with mock.patch('core.services.query_stats.os.getpid', return_value=pid):
+                registry.record('worker_view', queries, 1.0)
+                registry.flush()
+            registry.reset()
+
+        self.assertEqual(collect_stats()['worker_view']['requests'], 2)
+
+    def test_stats_endpoint_requires_admin(self):
+        user = User.objects.create_user(username='pasien', password='rahasia123', role='patient')
+        self.client.force_login(user)
+
+        response = self.client.get(reverse('query_stats'))
+        self.assertEqual(response.status_code, 403)
+        self.assertNotIn('X-Query-Count', response)
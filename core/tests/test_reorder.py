@@ -0,0 +1,66 @@
+from datetime import date, timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from core.models import Medicine, MedicineUsageDaily, Prescription, PurchaseOrder, Supplier
+from core.services.reorder import compute_reorders, generate_purchase_orders
+from core.services.rollups import refresh_medicine_usage
+
+from .helpers import create_medicine, create_prescriptions
+
+
+class ReorderForecastTests(TestCase):
+    def setUp(self):
+        self.today = date.today()
+        self.supplier = Supplier.objects.create(
+            name='PT Farma', address='Jakarta', phone='021', email='farma@example.com', lead_time_days=5
+        )
+        self.medicine = create_medicine(stock=10)
+        Medicine.objects.filter(pk=self.medicine.pk).update(supplier=self.supplier)
+
+    def dispensed(self, days_ago, quantity, dispensed_at):
+        prescription = create_prescriptions(self.medicine, 1, quantity=quantity)[0]
+        Prescription.objects.filter(pk=prescription.pk).update(
+            prescription_date=self.today - timedelta(days=days_ago), dispensed_at=dispensed_at, updated_at=dispensed_at
+        )
+
+    def test_usage_rollup_only_recomputes_changed_days(self):
+        yesterday = timezone.now() - timedelta(days=1)
+        self.dispensed(3, 4, yesterday)
+        self.dispensed(3, 2, yesterday)
+        self.dispensed(2, 5, yesterday)
+        self.assertEqual(refresh_medicine_usage(), {'days': 2, 'buckets': 2})
+
+        self.dispensed(3, 1, timezone.now())
+        self.assertEqual(refresh_medicine_usage(), {'days': 1, 'buckets': 1})
+
+        usage = dict(MedicineUsageDaily.objects.values_list('date', 'quantity'))
+        self.assertEqual(usage, {self.today - timedelta(days=3): 7, self.today - timedelta(days=2): 5})
+
+    def test_reorder_point_from_rolling_windows_creates_one_draft_per_supplier(self):
+        MedicineUsageDaily.objects.bulk_create([
+            MedicineUsageDaily(medicine=self.medicine, date=self.today - timedelta(days=day), quantity=2, prescriptions=1)
+            for day in range(1, 91)
+        ])
+        create_medicine('Tanpa Supplier')
+        MedicineUsageDaily.objects.create(
+            medicine=Medicine.objects.get(name='Tanpa Supplier'), date=self.today - timedelta(days=1), quantity=9
+        )
+
+        reorders, without_supplier = compute_reorders(self.today)
+        # 2/hari x lead time 5 hari, tanpa variasi: ROP 10, stok 10 -> pesan 10 + 2 x 30 - 10
+        self.assertEqual(
+            [(row['reorder_point'], row['quantity']) for row in reorders], [(10, 60)]
+        )
+        self.assertEqual(without_supplier, 1)
+
+        generate_purchase_orders(self.today)
+        generate_purchase_orders(self.today)
+        order = PurchaseOrder.objects.get()
+        self.assertEqual((order.status, order.lines.get().quantity), ('draft', 60))
+
+        # PO yang sudah dikirim dihitung sebagai stok dalam pesanan
+        PurchaseOrder.objects.update(status='sent')
+        self.assertEqual(generate_purchase_orders(self.today)['lines'], 0)
+        self.assertEqual(PurchaseOrder.objects.count(), 1)
@@ -0,0 +1,76 @@
+from datetime import date, datetime, time, timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from core.models import MedicalRecord, MedicineUsageDaily, Payment, RevenueDaily, VisitDaily
+from core.services.reports import annual_report, monthly_report
+from core.services.rollups import refresh_revenue, refresh_rollups, refresh_visits
+
+from .helpers import create_doctor, create_patient, create_medicine
+
+
+class RollupReportTests(TestCase):
+    def setUp(self):
+        self.patient = create_patient()
+        self.doctor = create_doctor()
+        self.day = date(2026, 3, 10)
+        self.yesterday = timezone.now() - timedelta(days=1)
+
+    def payment(self, invoice_number, amount, **kwargs):
+        payment = Payment.objects.create(
+            patient=self.patient, amount=amount, invoice_number=invoice_number,
+            created_at=timezone.make_aware(datetime.combine(self.day, time(10))), **kwargs
+        )
+        Payment.objects.filter(pk=payment.pk).update(updated_at=self.yesterday)
+        return payment
+
+    def visit(self, examination_date, status='completed'):
+        record = MedicalRecord.objects.create(
+            patient=self.patient, doctor=self.doctor, examination_date=examination_date, status=status
+        )
+        MedicalRecord.objects.filter(pk=record.pk).update(updated_at=self.yesterday)
+        return record
+
+    def test_refresh_only_recomputes_buckets_changed_since_watermark(self):
+        first = self.payment('INV-R1', 100000)
+        self.payment('INV-R2', 50000, method='transfer')
+        self.visit(self.day)
+        self.visit(self.day + timedelta(days=1), status='cancelled')
+        refresh_rollups()
+
+        self.assertEqual(refresh_revenue(), {'days': 0, 'buckets': 0})
+        first.status, first.paid_amount = 'paid', 100000
+        first.save()
+        self.assertEqual(refresh_revenue(), {'days': 1, 'buckets': 1})
+        self.assertEqual(refresh_visits(), {'days': 0, 'buckets': 0})
+
+        self.assertEqual(
+            sorted(RevenueDaily.objects.values_list('date', 'method', 'status', 'payments', 'paid_amount')),
+            [(self.day, 'cash', 'paid', 1, 100000), (self.day, 'transfer', 'pending', 1, 0)],
+        )
+        self.assertEqual(
+            sorted(VisitDaily.objects.values_list('date', 'visits', 'completed', 'cancelled')),
+            [(self.day, 1, 1, 0), (self.day + timedelta(days=1), 1, 0, 1)],
+        )
+
+    def test_reports_are_read_from_rollups(self):
+        medicine = create_medicine()
+        RevenueDaily.objects.bulk_create([
+            RevenueDaily(date=self.day, method='cash', status='paid', payments=2, amount=300000, paid_amount=300000),
+            RevenueDaily(date=self.day, method='bpjs', status='cancelled', payments=1, amount=90000),
+            RevenueDaily(date=date(2026, 5, 1), method='debit', status='pending', payments=1, amount=70000),
+        ])
+        VisitDaily.objects.create(doctor=self.doctor, date=self.day, visits=4, completed=3, cancelled=1)
+        MedicineUsageDaily.objects.create(medicine=medicine, date=self.day, prescribed=5, quantity=8, prescriptions=4)
+
+        with self.assertNumQueries(7):
+            report = monthly_report(2026, 3)
+        self.assertEqual(report['revenue']['total'], {'payments': 2, 'amount': 300000, 'paid_amount': 300000})
+        self.assertEqual([row['status'] for row in report['revenue']['by_status']], ['cancelled', 'paid'])
+        self.assertEqual(report['visits']['by_doctor'][0]['visits'], 4)
+        self.assertEqual(report['prescriptions']['total'], {'prescribed': 5, 'dispensed': 4, 'quantity': 8})
+
+        months = annual_report(2026)['months']
+        self.assertEqual([(row['month'], row['amount']) for row in months if row['amount']], [(3, 300000), (5, 70000)])
+        self.assertEqual(months[2]['visits'], 4)
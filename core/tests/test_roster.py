@@ -0,0 +1,51 @@
+from datetime import date, time, timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.models import DoctorAvailability
+from core.services.roster import get_doctor_roster
+from accounts.forms import AppointmentBookingForm
+
+from .helpers import create_doctor
+
+
+class DoctorRosterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.doctor = create_doctor(name='Andi Wijaya')
+
+    def test_roster_is_cached_and_versioned(self):
+        self.assertEqual(get_doctor_roster()[0]['available_days'], ())
+        with self.assertNumQueries(0):
+            get_doctor_roster()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            DoctorAvailability.objects.create(doctor=self.doctor, day_of_week=1, start_time=time(8), end_time=time(12))
+        self.assertEqual(get_doctor_roster()[0]['available_days'], (1,))
+
+        self.doctor.is_available = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.doctor.save()
+        self.assertFalse(get_doctor_roster()[0]['is_available'])
+
+    def test_booking_form_validates_doctor_without_doctor_query(self):
+        data = {
+            'doctor': self.doctor.pk,
+            'examination_date': date.today() + timedelta(days=1),
+            'examination_time': '09:00',
+        }
+        AppointmentBookingForm(data).is_valid()  # isi cache roster & slot
+        with CaptureQueriesContext(connection) as queries:
+            form = AppointmentBookingForm(data)
+            self.assertTrue(form.is_valid(), form.errors)
+
+        self.assertEqual(form.cleaned_data['doctor'].pk, self.doctor.pk)
+        self.assertFalse([query for query in queries if 'FROM "core_doctor"' in query['sql']])
+
+    def test_unknown_doctor_is_rejected(self):
+        form = AppointmentBookingForm({'doctor': 999, 'examination_date': date.today() + timedelta(days=1), 'examination_time': '09:00'})
+
+        self.assertIn('doctor', form.errors)
@@ -0,0 +1,61 @@
+from datetime import date, time, timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from core.models import Doctor, DoctorAvailability, DoctorLeave, MedicalRecord
+from core.services.slots import get_free_slots, is_slot_free
+
+from .helpers import create_doctor, create_patient
+
+
+class SlotEngineTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.doctor = create_doctor()
+        self.monday = date(2030, 1, 7)
+        for day, start, end, is_active in [(0, 8, 10, True), (1, 8, 10, False), (2, 13, 14, True)]:
+            DoctorAvailability.objects.create(
+                doctor=self.doctor, day_of_week=day, start_time=time(start), end_time=time(end), is_active=is_active
+            )
+        DoctorLeave.objects.create(doctor=self.doctor, start_date=self.monday + timedelta(days=9), end_date=self.monday + timedelta(days=9))
+
+    def book(self, examination_time, **kwargs):
+        return MedicalRecord.objects.create(
+            patient=create_patient(), doctor=self.doctor, examination_date=self.monday,
+            examination_time=examination_time, **kwargs
+        )
+
+    def test_free_slots_follow_availability_leave_and_bookings(self):
+        self.book(time(8, 30))
+        self.book(time(9), confirmation_status='rejected')
+        self.book(time(9, 30), status='cancelled')
+
+        slots = get_free_slots(self.doctor.pk, self.monday, self.monday + timedelta(days=9))
+
+        self.assertEqual(slots[self.monday], (time(8), time(9), time(9, 30)))
+        self.assertEqual(slots[self.monday + timedelta(days=1)], ())  # jadwal Selasa tidak aktif
+        self.assertEqual(slots[self.monday + timedelta(days=2)], (time(13), time(13, 30)))
+        self.assertEqual(slots[self.monday + timedelta(days=3)], ())  # tidak ada jadwal Kamis
+        self.assertEqual(len(slots[self.monday + timedelta(days=7)]), 4)
+        self.assertEqual(slots[self.monday + timedelta(days=9)], ())  # cuti
+        self.assertEqual(len(slots), 10)
+
+    def test_doctor_without_weekly_schedule_uses_working_hours(self):
+        doctor = create_doctor(name='Sari', working_hours_start=time(8), working_hours_end=time(9))
+        self.assertEqual(get_free_slots(doctor.pk, self.monday, self.monday), {self.monday: (time(8), time(8, 30))})
+
+        Doctor.objects.filter(pk=doctor.pk).update(is_available=False)
+        cache.clear()
+        self.assertEqual(get_free_slots(doctor.pk, self.monday, self.monday), {self.monday: ()})
+
+    def test_is_slot_free_is_cached_and_follows_bookings(self):
+        self.assertTrue(is_slot_free(self.doctor.pk, self.monday, time(8)))
+        self.assertFalse(is_slot_free(self.doctor.pk, self.monday, time(8, 15)))  # bukan awal slot
+        self.assertFalse(is_slot_free(self.doctor.pk, self.monday, time(10)))  # di luar jadwal
+        with self.assertNumQueries(0):
+            is_slot_free(self.doctor.pk, self.monday, time(9))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.book(time(8))
+        self.assertFalse(is_slot_free(self.doctor.pk, self.monday, time(8)))
@@ -0,0 +1,186 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from io import StringIO
+from threading import Barrier
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import Sum
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+
+from core.models import Medicine, MedicineLot, Prescription, StockMovement
+from core.services.counters import rebuild_counters
+from core.services.stock import (
+    InsufficientStockError, adjust_stock, dispense_prescription, dispense_prescriptions, expiring_lots, expiring_summary,
+    receive_stock, reconcile_stock,
+)
+from accounts.models import User
+
+from .helpers import create_medicine, create_prescriptions
+
+
+class StockLedgerTests(TestCase):
+    def setUp(self):
+        self.paracetamol = create_medicine('Paracetamol', stock=100)
+        self.amoxicillin = create_medicine('Amoxicillin', stock=30)
+
+    def stock(self, medicine):
+        return Medicine.objects.get(pk=medicine.pk).stock
+
+    def test_batch_dispense_uses_fixed_number_of_statements(self):
+        batch = create_prescriptions(self.paracetamol, 5, quantity=10) + create_prescriptions(self.amoxicillin, 3, quantity=10)
+
+        with self.assertNumQueries(9):
+            dispensed = dispense_prescriptions(Prescription.objects.all())
+
+        self.assertEqual(dispensed, 8)
+        self.assertEqual((self.stock(self.paracetamol), self.stock(self.amoxicillin)), (50, 0))
+        self.assertEqual(StockMovement.objects.filter(kind='dispense').count(), 8)
+        # Resep yang sudah diserahkan tidak mengurangi stok dua kali
+        self.assertFalse(dispense_prescription(batch[0]))
+        self.assertEqual(self.stock(self.paracetamol), 50)
+
+    def test_shortage_rolls_back_whole_batch(self):
+        create_prescriptions(self.paracetamol, 2, quantity=10)
+        create_prescriptions(self.amoxicillin, 1, quantity=31)
+
+        with self.assertRaisesMessage(InsufficientStockError, 'Amoxicillin'):
+            dispense_prescriptions(Prescription.objects.all())
+
+        self.assertEqual((self.stock(self.paracetamol), self.stock(self.amoxicillin)), (100, 30))
+        self.assertFalse(Prescription.objects.filter(dispensed_at__isnull=False).exists())
+        self.assertFalse(StockMovement.objects.filter(kind='dispense').exists())
+
+    def test_adjustments_go_through_ledger_and_drift_is_repaired(self):
+        adjust_stock(self.paracetamol, -4, 'Rusak')
+        with self.assertRaises(InsufficientStockError):
+            adjust_stock(self.amoxicillin, -31)
+        Medicine.objects.filter(pk=self.paracetamol.pk).update(stock=0)
+
+        # Counter dashboard tidak menyentuh stok
+        rebuild_counters()
+        self.assertEqual(self.stock(self.paracetamol), 0)
+
+        out = StringIO()
+        with self.assertRaisesMessage(CommandError, '1 stok obat/lot'):
+            call_command('reconcile_stock', '--dry-run', stdout=out)
+        self.assertIn('Paracetamol: tersimpan=0, buku stok=96', out.getvalue())
+        self.assertEqual(self.stock(self.paracetamol), 0)
+
+        call_command('reconcile_stock', stdout=StringIO())
+
+        self.assertEqual(self.stock(self.paracetamol), 96)
+        self.assertEqual(self.stock(self.amoxicillin), 30)
+        self.assertEqual(reconcile_stock(dry_run=True), [])
+
+    def test_negative_ledger_balance_is_stored_as_zero_for_medicine_and_lot(self):
+        lot = MedicineLot.objects.get(medicine=self.amoxicillin)
+        # Mutasi tanpa F() update (misalnya impor data) membuat buku stok negatif
+        StockMovement.objects.create(medicine=self.amoxicillin, lot=lot, kind='adjustment', quantity=-35)
+
+        self.assertEqual(reconcile_stock(), [
+            ('Amoxicillin', 30, -5), (f'Amoxicillin lot - ({lot.expiry_date})', 30, -5),
+        ])
+
+        self.assertEqual(self.stock(self.amoxicillin), 0)
+        self.assertEqual(MedicineLot.objects.get(pk=lot.pk).quantity, 0)
+
+
+    def test_admin_adjustment_rejected_under_lock_reports_error(self):
+        self.client.force_login(User.objects.create_superuser('apoteker', 'apoteker@example.com', 'rahasia123'))
+        # Stok di form masih 50, tetapi lot hanya berisi 30 saat dikunci
+        Medicine.objects.filter(pk=self.amoxicillin.pk).update(stock=50)
+        url = reverse('admin:core_stockmovement_add')
+
+        response = self.client.post(url, {
+            'medicine': self.amoxicillin.pk, 'kind': 'adjustment', 'quantity': -40, 'note': 'Opname',
+        }, follow=True)
+
+        self.assertEqual(response.redirect_chain, [(url, 302)])
+        self.assertEqual(
+            [str(message) for message in response.context['messages']],
+            ['Stok obat tidak mencukupi: Amoxicillin'],
+        )
+        self.assertFalse(StockMovement.objects.filter(kind='adjustment').exists())
+
+
+class MedicineLotTests(TestCase):
+    def setUp(self):
+        self.today = date.today()
+        self.medicine = create_medicine()
+        self.receive(20, 'B-LATE', 200)
+        self.receive(10, 'B-SOON', 20)
+        self.receive(5, 'B-EXPIRED', -3)
+
+    def receive(self, quantity, lot_number, days):
+        return receive_stock(self.medicine, quantity, lot_number=lot_number, expiry_date=self.today + timedelta(days=days))
+
+    def lots(self):
+        return dict(MedicineLot.objects.filter(medicine=self.medicine).values_list('lot_number', 'quantity'))
+
+    def test_dispense_takes_nearest_unexpired_lot_first(self):
+        dispense_prescriptions(create_prescriptions(self.medicine, 3, quantity=4))
+
+        self.assertEqual(self.lots(), {'B-LATE': 18, 'B-SOON': 0, 'B-EXPIRED': 5})
+        medicine = Medicine.objects.get(pk=self.medicine.pk)
+        self.assertEqual(medicine.stock, 23)
+        # Kedaluwarsa terdekat yang masih berstok (termasuk lot kedaluwarsa yang belum dimusnahkan)
+        self.assertEqual(medicine.expiry_date, self.today - timedelta(days=3))
+        # Resep ketiga terbagi ke dua lot
+        self.assertEqual(StockMovement.objects.filter(kind='dispense').count(), 4)
+
+    def test_expired_lots_are_not_dispensed_but_can_be_written_off(self):
+        with self.assertRaises(InsufficientStockError):
+            dispense_prescriptions(create_prescriptions(self.medicine, 1, quantity=31))
+
+        expired = MedicineLot.objects.get(lot_number='B-EXPIRED')
+        adjust_stock(self.medicine, -5, 'Dimusnahkan', lot=expired)
+
+        self.assertEqual(self.lots()['B-EXPIRED'], 0)
+        self.assertEqual(Medicine.objects.get(pk=self.medicine.pk).expiry_date, self.today + timedelta(days=20))
+        self.assertEqual(reconcile_stock(dry_run=True), [])
+
+    def test_expiring_report_uses_lot_expiry_range(self):
+        create_medicine('Amoxicillin', stock=0)
+        self.assertEqual([lot.lot_number for lot in expiring_lots(30)], ['B-EXPIRED', 'B-SOON'])
+        self.assertEqual([lot.lot_number for lot in expiring_lots(30, include_expired=False)], ['B-SOON'])
+        with self.assertNumQueries(1):
+            summary = expiring_summary(30)
+        self.assertEqual((summary['lots'], summary['units'], summary['expired_units']), (2, 15, 5))
+        self.assertEqual(summary['value'], 15 * 1000)
+
+        admin_user = User.objects.create_superuser('apoteker', 'apoteker@example.com', 'rahasia123')
+        self.client.force_login(admin_user)
+        response = self.client.get(reverse('admin:core_medicine_changelist'), {'expires_within': 'expired'})
+        self.assertEqual(list(response.context['cl'].result_list), [self.medicine])
+
+
+class ConcurrentDispenseTests(TransactionTestCase):
+    workers = 40
+
+    def setUp(self):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest("SQLite in-memory tidak mendukung koneksi paralel")
+
+    def test_parallel_dispensing_never_loses_or_oversells_stock(self):
+        medicine = create_medicine(stock=25)
+        prescriptions = create_prescriptions(medicine, self.workers)
+        barrier = Barrier(self.workers)
+
+        def dispense(prescription):
+            barrier.wait()
+            try:
+                return 'dispensed' if dispense_prescription(prescription) else 'skipped'
+            except InsufficientStockError:
+                return 'short'
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = list(executor.map(dispense, prescriptions))
+
+        self.assertEqual(results.count('dispensed'), 25)
+        self.assertEqual(results.count('short'), self.workers - 25)
+        self.assertEqual(Medicine.objects.get(pk=medicine.pk).stock, 0)
+        self.assertEqual(StockMovement.objects.filter(medicine=medicine).aggregate(total=Sum('quantity'))['total'], 0)
@@ -3,6 +3,8 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from core.models import Doctor, MedicalRecord, Prescription, Inpatient, Schedule, Patient
+from core.services.patient_search import matching_patients, search_patients
+from core.services.roster import available_doctors, get_roster_doctor
 from datetime import datetime
 
 def home(request):
@@ -28,17 +30,18 @@ def patient_dashboard(request):
     if request.method == 'POST':
         doctor_id = request.POST.get('doctor')
         date = request.POST.get('date')
-        if doctor_id and date:
-            doctor = Doctor.objects.get(id=doctor_id)
+        doctor = get_roster_doctor(int(doctor_id)) if doctor_id and doctor_id.isdigit() else None
+        if doctor and date:
             MedicalRecord.objects.create(
                 patient=patient,
-                doctor=doctor,
+                doctor_id=doctor['id'],
                 examination_date=date,
                 diagnosis="",
                 treatment=""
             )
             messages.success(request, 'Janji temu berhasil dibuat! Dokter akan menghubungi Anda.')
             return redirect('patient_dashboard')
+        messages.error(request, 'Pilih dokter dan tanggal janji temu.')
     
     # Statistik
     total_records = MedicalRecord.objects.filter(patient=patient).count()
@@ -60,8 +63,8 @@ def patient_dashboard(request):
         medical_record__patient=patient
     ).select_related('medical_record', 'medicine').order_by('-prescription_date')[:5]
     
-    # Dokter tersedia
-    doctors = Doctor.objects.all()
+    # Beberapa dokter tersedia untuk sidebar (pilihan lengkap lewat autocomplete)
+    featured_doctors = available_doctors(limit=5)
     
     context = {
         'patient': patient,
@@ -70,7 +73,7 @@ def patient_dashboard(request):
         'inpatient_status': inpatient_status,
         'medical_records': medical_records,
         'prescriptions': prescriptions,
-        'doctors': doctors,
+        'featured_doctors': featured_doctors,
     }
     return render(request, 'dashboards/patient.html', context)
 
@@ -100,7 +103,7 @@ def doctor_patient_list(request):
     # Search functionality
     search_query = request.GET.get('q', '')
     if search_query:
-        patients = patients.filter(name__icontains=search_query)
+        patients = search_patients(search_query, patients)
     
     context = {
         'doctor': doctor,
@@ -197,7 +200,7 @@ def doctor_patient_appointments(request):
     # Search pasien
     search_query = request.GET.get('q', '')
     if search_query:
-        appointments = appointments.filter(patient__name__icontains=search_query)
+        appointments = appointments.filter(patient__in=matching_patients(search_query))
     
     context = {
         'doctor': doctor,